@@ -3,6 +3,13 @@ set -o errexit
 
 pip install -r requirements.txt
 
-python manage.py collectstatic --no-input
+# Compilation hors ligne de Tailwind (remplace le Play CDN)
+python manage.py tailwind install
+python manage.py tailwind build
+
+python manage.py migrate
 
-python manage.py migrate
\ No newline at end of file
+# Polices, icônes (réduites aux classes utilisées) et Swiper vendorisés, CSS critique
+python manage.py build_assets
+
+python manage.py collectstatic --no-input
@@ -0,0 +1,173 @@
+# portfolio/access_log.py
+"""
+Journal d'accès compact et rejeu du trafic enregistré.
+
+``AccessLogMiddleware`` écrit une ligne JSON par requête dynamique dans
+``logs/access.log``, via le logger ``portfolio.access`` (donc la file et la
+rotation de ``portfolio/logs.py``) ::
+
+    {"t":1760000000.123,"m":"GET","p":"/projet/x/","q":"","s":200,"ms":12.4,"r":"portfolio:projet_detail","b":8123}
+
+``python manage.py replay_access_log`` relit ces fichiers (``.gz`` compris)
+et renvoie les requêtes vers une instance locale au rythme d'origine,
+accéléré ou au plus vite, puis compare les latences par route. La latence
+enregistrée est mesurée côté serveur, celle du rejeu côté client : l'écart
+inclut donc l'aller-retour réseau local (de l'ordre de la milliseconde).
+Seules les méthodes sans effet de bord sont rejouées : le corps des POST
+n'est pas journalisé.
+"""
+import gzip
+import http.client
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+access_logger = logging.getLogger('portfolio.access')
+
+REPLAYABLE_METHODS = {'GET', 'HEAD'}
+
+
+def log_request(request, response, elapsed):
+    match = getattr(request, 'resolver_match', None)
+    entry = {
+        't': round(time.time() - elapsed, 3),
+        'm': request.method,
+        'p': request.path,
+        'q': request.META.get('QUERY_STRING', ''),
+        's': response.status_code,
+        'ms': round(elapsed * 1000, 2),
+        'r': match.view_name if match else None,
+        'b': None if response.streaming else len(response.content),
+    }
+    access_logger.info(json.dumps(entry, separators=(',', ':'), ensure_ascii=False))
+
+
+# Lecture ---------------------------------------------------------------------
+
+def read_entries(paths):
+    """Entrées des fichiers ``paths`` (texte ou gzip), triées par date"""
+    entries = []
+    for path in paths:
+        opener = gzip.open if str(path).endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as fh:
+            for line in fh:
+                # Tolère un préfixe de formateur avant l'objet JSON
+                start = line.find('{')
+                if start < 0:
+                    continue
+                try:
+                    entries.append(json.loads(line[start:]))
+                except ValueError:
+                    continue
+    entries.sort(key=lambda e: e['t'])
+    return entries
+
+
+# Rejeu -----------------------------------------------------------------------
+
+class _Client:
+    """Une connexion keep-alive par thread"""
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.host_header = parts.netloc
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+            conn = self.local.conn = cls(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def request(self, method, target):
+        conn = self._connection()
+        start = time.perf_counter()
+        try:
+            conn.request(method, target, headers={'Host': self.host_header, 'Accept-Encoding': 'br, gzip'})
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            self.local.conn = None
+            status = None
+        return status, (time.perf_counter() - start) * 1000
+
+
+def replay(entries, base_url, speed=1.0, concurrency=16, on_progress=None):
+    """
+    Rejoue ``entries`` vers ``base_url``.
+
+    ``speed`` : 1 = rythme d'origine, 10 = dix fois plus vite, 0 = sans attente.
+    Retourne une liste de ``(entrée, statut, latence_ms)``.
+    """
+    client = _Client(base_url)
+    results = []
+    lock = threading.Lock()
+
+    def send(entry):
+        target = entry['p'] + (f"?{entry['q']}" if entry.get('q') else '')
+        status, latency = client.request(entry['m'], target)
+        with lock:
+            results.append((entry, status, latency))
+            if on_progress and len(results) % 500 == 0:
+                on_progress(len(results))
+
+    replayable = [e for e in entries if e['m'] in REPLAYABLE_METHODS]
+    if not replayable:
+        return results
+    origin = replayable[0]['t']
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for entry in replayable:
+            if speed > 0:
+                delay = (entry['t'] - origin) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            pool.submit(send, entry)
+    return results
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(round(q * (len(values) - 1))))], 2)
+
+
+def summarize(results):
+    """Latences enregistrées et rejouées par route"""
+    routes = {}
+    for entry, status, latency in results:
+        route = entry.get('r') or 'unmatched'
+        row = routes.setdefault(route, {'recorded': [], 'replayed': [], 'errors': 0, 'status_changed': 0})
+        row['recorded'].append(entry['ms'])
+        if status is None or status >= 500:
+            row['errors'] += 1
+        if status is not None:
+            row['replayed'].append(latency)
+        if status != entry['s']:
+            row['status_changed'] += 1
+
+    summary = {}
+    for route, row in sorted(routes.items(), key=lambda item: -len(item[1]['recorded'])):
+        recorded_p50, replayed_p50 = _percentile(row['recorded'], 0.5), _percentile(row['replayed'], 0.5)
+        summary[route] = {
+            'requests': len(row['recorded']),
+            'errors': row['errors'],
+            'status_changed': row['status_changed'],
+            'recorded_p50_ms': recorded_p50,
+            'recorded_p95_ms': _percentile(row['recorded'], 0.95),
+            'replayed_p50_ms': replayed_p50,
+            'replayed_p95_ms': _percentile(row['replayed'], 0.95),
+            'delta_p50_ms': round(replayed_p50 - recorded_p50, 2) if replayed_p50 is not None else None,
+        }
+    return summary
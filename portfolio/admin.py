@@ -3,10 +3,12 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
+from . import dashboard
+from .caching import bump_content_version, bump_model_version
 from .models import (
     Profile, Project, Skill, News, Partner, 
     SocialGallery, Feed, Newsletter, ContactMessage,
-    SocialLink, ContactInfo, SiteSettings
+    SocialLink, ContactInfo, SiteSettings, ClicsJournaliers
 )
 
 @admin.register(Profile)
@@ -41,7 +43,7 @@ class ProfileAdmin(admin.ModelAdmin):
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
-    list_display = ['titre', 'statut', 'featured', 'ordre_affichage', 'image_preview', 'created_at']
+    list_display = ['titre', 'statut', 'featured', 'ordre_affichage', 'vues', 'image_preview', 'created_at']
     list_filter = ['statut', 'featured', 'created_at']
     list_editable = ['statut', 'featured', 'ordre_affichage']
     search_fields = ['titre', 'description_courte']
@@ -77,14 +79,21 @@ class ProjectAdmin(admin.ModelAdmin):
     
     def marquer_featured(self, request, queryset):
         queryset.update(featured=True)
+        self._invalidate()
         self.message_user(request, f"{queryset.count()} projets marqués comme mis en avant.")
     marquer_featured.short_description = "Marquer comme mis en avant"
     
     def retirer_featured(self, request, queryset):
         queryset.update(featured=False)
+        self._invalidate()
         self.message_user(request, f"{queryset.count()} projets retirés des mis en avant.")
     retirer_featured.short_description = "Retirer des mis en avant"
 
+    # ``update`` n'envoie pas ``post_save`` : mêmes invalidations que ``signals.invalidate_page_cache``
+    def _invalidate(self):
+        bump_content_version()
+        bump_model_version(Project._meta.label_lower)
+
 
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
@@ -164,7 +173,7 @@ class PartnerAdmin(admin.ModelAdmin):
 
 @admin.register(SocialGallery)
 class SocialGalleryAdmin(admin.ModelAdmin):
-    list_display = ['titre', 'image_preview', 'ordre_affichage', 'created_at']
+    list_display = ['titre', 'image_preview', 'ordre_affichage', 'vues', 'created_at']
     list_editable = ['ordre_affichage']
     search_fields = ['titre', 'description_courte']
     readonly_fields = ['created_at', 'image_preview']
@@ -223,15 +232,27 @@ class NewsletterAdmin(admin.ModelAdmin):
     actions = ['activer_emails', 'desactiver_emails']
     
     def activer_emails(self, request, queryset):
-        queryset.update(actif=True)
+        changed = queryset.filter(actif=False).update(actif=True)
+        dashboard.adjust(abonnes_actifs=changed)
         self.message_user(request, f"{queryset.count()} emails activés.")
     activer_emails.short_description = "Activer les emails sélectionnés"
     
     def desactiver_emails(self, request, queryset):
-        queryset.update(actif=False)
+        changed = queryset.filter(actif=True).update(actif=False)
+        dashboard.adjust(abonnes_actifs=-changed)
+        dashboard.bump_day(desinscriptions=changed)
         self.message_user(request, f"{queryset.count()} emails désactivés.")
     desactiver_emails.short_description = "Désactiver les emails sélectionnés"
 
+    # Pas de signal post_delete sur Newsletter : compteurs ajustés ici
+    def delete_model(self, request, obj):
+        dashboard.subscribers_removed(Newsletter.objects.filter(pk=obj.pk))
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        dashboard.subscribers_removed(queryset)
+        super().delete_queryset(request, queryset)
+
 
 @admin.register(ContactMessage)
 class ContactMessageAdmin(admin.ModelAdmin):
@@ -258,15 +279,26 @@ class ContactMessageAdmin(admin.ModelAdmin):
     actions = ['marquer_lu', 'marquer_non_lu']
     
     def marquer_lu(self, request, queryset):
-        queryset.update(lu=True)
+        changed = queryset.filter(lu=False).update(lu=True)
+        dashboard.adjust(messages_non_lus=-changed)
         self.message_user(request, f"{queryset.count()} messages marqués comme lus.")
     marquer_lu.short_description = "Marquer comme lu"
     
     def marquer_non_lu(self, request, queryset):
-        queryset.update(lu=False)
+        changed = queryset.filter(lu=True).update(lu=False)
+        dashboard.adjust(messages_non_lus=changed)
         self.message_user(request, f"{queryset.count()} messages marqués comme non lus.")
     marquer_non_lu.short_description = "Marquer comme non lu"
 
+    # Pas de signal post_delete sur ContactMessage : compteurs ajustés ici
+    def delete_model(self, request, obj):
+        dashboard.messages_removed(ContactMessage.objects.filter(pk=obj.pk))
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        dashboard.messages_removed(queryset)
+        super().delete_queryset(request, queryset)
+
 
 @admin.register(SocialLink)
 class SocialLinkAdmin(admin.ModelAdmin):
@@ -294,6 +326,22 @@ class SocialLinkAdmin(admin.ModelAdmin):
     icone_preview.short_description = "Icône"
 
 
+@admin.register(ClicsJournaliers)
+class ClicsJournaliersAdmin(admin.ModelAdmin):
+    """Clics sortants par jour, agrégés par ``rollup_clicks`` (lecture seule)"""
+    list_display = ['jour', 'cible', 'libelle', 'clics']
+    list_filter = ['cible', 'jour']
+    search_fields = ['libelle']
+    date_hierarchy = 'jour'
+    ordering = ['-jour', '-clics']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(ContactInfo)
 class ContactInfoAdmin(admin.ModelAdmin):
     list_display = ['telephone', 'email', 'whatsapp', 'cv_preview', 'afficher_sidebar', 'updated_at']
@@ -0,0 +1,249 @@
+# portfolio/archive.py
+"""
+Archivage des messages de contact.
+
+Les messages anciens (ou déjà lus) sont déplacés hors de la table
+``ContactMessage`` vers des segments JSONL compressés (gzip), partitionnés
+par date d'envoi :
+
+    <CONTACT_ARCHIVE_DIR>/2025/06/2025-06-29.jsonl.gz
+
+Chaque lot archivé est ajouté au segment sous forme d'un nouveau membre gzip,
+ce qui évite de réécrire les fichiers existants. Un petit index SQLite
+(``index.sqlite3``) associe chaque id archivé à son segment pour permettre
+une recherche et une restauration rapides sans décompresser toute l'archive.
+"""
+import gzip
+import json
+import os
+import sqlite3
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import dashboard
+from .models import ContactMessage
+
+ARCHIVE_FIELDS = ['id', 'nom', 'email', 'sujet', 'message', 'date_envoi', 'lu']
+
+
+def get_archive_dir():
+    """Dossier racine des archives de messages"""
+    return Path(getattr(settings, 'CONTACT_ARCHIVE_DIR', settings.BASE_DIR / 'archives' / 'contact'))
+
+
+def index_date(value):
+    """Date de l'index : ISO 8601 en UTC, comparable comme chaîne"""
+    return value.astimezone(dt_timezone.utc).isoformat()
+
+
+def segment_path(date_envoi, root=None):
+    """Chemin du segment correspondant à une date d'envoi"""
+    root = root or get_archive_dir()
+    day = timezone.localtime(date_envoi).date()
+    return root / f"{day:%Y}" / f"{day:%m}" / f"{day:%Y-%m-%d}.jsonl.gz"
+
+
+class ArchiveIndex:
+    """Index SQLite id -> segment des messages archivés"""
+
+    def __init__(self, root=None):
+        self.root = Path(root or get_archive_dir())
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.root / 'index.sqlite3')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS messages ('
+            ' id INTEGER PRIMARY KEY,'
+            ' email TEXT NOT NULL,'
+            ' date_envoi TEXT NOT NULL,'
+            ' segment TEXT NOT NULL)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS messages_email ON messages (email)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS messages_date ON messages (date_envoi)')
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, rows):
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO messages (id, email, date_envoi, segment) VALUES (?, ?, ?, ?)',
+                rows
+            )
+
+    def remove(self, ids):
+        with self.conn:
+            self.conn.executemany('DELETE FROM messages WHERE id = ?', [(i,) for i in ids])
+
+    def find(self, ids=None, email=None, date_from=None, date_to=None, limit=None):
+        """Retourne les entrées (id, segment) correspondant aux critères"""
+        clauses, params = [], []
+        if ids:
+            clauses.append(f"id IN ({','.join('?' * len(ids))})")
+            params.extend(ids)
+        if email:
+            clauses.append('email = ?')
+            params.append(email.strip().lower())
+        # Bornes ramenées en UTC comme les dates stockées (sinon décalées du fuseau local)
+        if date_from:
+            clauses.append('date_envoi >= ?')
+            params.append(index_date(date_from))
+        if date_to:
+            clauses.append('date_envoi < ?')
+            params.append(index_date(date_to))
+        sql = 'SELECT id, segment FROM messages'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY date_envoi DESC'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        return self.conn.execute(sql, params).fetchall()
+
+    def count_by_day(self, date_from):
+        """Nombre de messages archivés par jour d'envoi (heure locale) depuis ``date_from``"""
+        counts = Counter()
+        rows = self.conn.execute('SELECT date_envoi FROM messages WHERE date_envoi >= ?', [index_date(date_from)])
+        for (value,) in rows:
+            counts[timezone.localtime(datetime.fromisoformat(value)).date()] += 1
+        return counts
+
+
+def archived_per_day(date_from, root=None):
+    """``ArchiveIndex.count_by_day`` sans créer l'archive si elle n'existe pas encore"""
+    root = Path(root or get_archive_dir())
+    if not (root / 'index.sqlite3').exists():
+        return Counter()
+    with ArchiveIndex(root) as index:
+        return index.count_by_day(date_from)
+
+
+def _serialize(msg):
+    return {
+        'id': msg['id'],
+        'nom': msg['nom'],
+        'email': msg['email'],
+        'sujet': msg['sujet'],
+        'message': msg['message'],
+        'date_envoi': msg['date_envoi'].isoformat(),
+        'lu': msg['lu'],
+    }
+
+
+def _write_segments(records, root):
+    """Ajoute les enregistrements à leurs segments, un membre gzip par segment"""
+    by_segment = defaultdict(list)
+    for record in records:
+        by_segment[segment_path(record['date_envoi'], root)].append(record)
+
+    index_rows = []
+    for path, items in by_segment.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = ''.join(json.dumps(_serialize(item), ensure_ascii=False) + '\n' for item in items)
+        with open(path, 'ab') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='ab', compresslevel=6) as gz:
+                gz.write(payload.encode('utf-8'))
+            raw.flush()
+            os.fsync(raw.fileno())
+        relative = str(path.relative_to(root))
+        index_rows.extend(
+            (item['id'], item['email'].lower(), index_date(item['date_envoi']), relative)
+            for item in items
+        )
+    return index_rows
+
+
+def retention_queryset(days=None, include_read=True):
+    """Messages éligibles à l'archivage selon la politique de rétention"""
+    if days is None:
+        days = getattr(settings, 'CONTACT_RETENTION_DAYS', 180)
+    condition = Q(date_envoi__lt=timezone.now() - timedelta(days=days))
+    if include_read:
+        condition |= Q(lu=True)
+    return ContactMessage.objects.filter(condition)
+
+
+def archive_messages(days=None, include_read=True, batch_size=500, dry_run=False, root=None):
+    """
+    Archive puis supprime les messages éligibles par lots.
+
+    Le segment est écrit et synchronisé sur disque avant la suppression des
+    lignes : une interruption ne peut donc produire qu'un doublon dans
+    l'archive (dédupliqué par l'index), jamais une perte.
+    """
+    root = Path(root or get_archive_dir())
+    queryset = retention_queryset(days, include_read)
+    if dry_run:
+        return queryset.count()
+
+    total = 0
+    last_id = 0
+    with ArchiveIndex(root) as index:
+        while True:
+            batch = list(
+                queryset.filter(id__gt=last_id).order_by('id').values(*ARCHIVE_FIELDS)[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1]['id']
+            index.add(_write_segments(batch, root))
+            with transaction.atomic():
+                ContactMessage.objects.filter(id__in=[m['id'] for m in batch]).delete()
+                dashboard.adjust(messages=-len(batch), messages_non_lus=-sum(1 for m in batch if not m['lu']))
+            total += len(batch)
+    return total
+
+
+def read_archived(entries, root=None):
+    """Lit les messages archivés correspondant aux entrées de l'index"""
+    root = Path(root or get_archive_dir())
+    wanted = defaultdict(set)
+    for msg_id, segment in entries:
+        wanted[segment].add(msg_id)
+
+    found = {}
+    for segment, ids in wanted.items():
+        with gzip.open(root / segment, 'rt', encoding='utf-8') as fh:
+            for line in fh:
+                record = json.loads(line)
+                if record['id'] in ids:
+                    # La dernière occurrence l'emporte (réarchivage après restauration)
+                    found[record['id']] = record
+    return [found[msg_id] for msg_id, _ in entries if msg_id in found]
+
+
+def restore_messages(records, root=None):
+    """Réinsère des messages archivés dans la table et les retire de l'index"""
+    existing = set(
+        ContactMessage.objects.filter(id__in=[r['id'] for r in records]).values_list('id', flat=True)
+    )
+    pending = [r for r in records if r['id'] not in existing]
+    objs = [
+        ContactMessage(
+            id=r['id'], nom=r['nom'], email=r['email'], sujet=r['sujet'],
+            message=r['message'], lu=r['lu'],
+        )
+        for r in pending
+    ]
+    with transaction.atomic():
+        created = ContactMessage.objects.bulk_create(objs)
+        # auto_now_add écrase date_envoi à l'insertion : on remet la date d'origine
+        for obj, record in zip(created, pending):
+            obj.date_envoi = parse_datetime(record['date_envoi'])
+        ContactMessage.objects.bulk_update(created, ['date_envoi'])
+        dashboard.adjust(messages=len(created), messages_non_lus=sum(1 for obj in created if not obj.lu))
+
+    with ArchiveIndex(root) as index:
+        index.remove([r['id'] for r in records])
+    return len(created)
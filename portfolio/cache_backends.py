@@ -0,0 +1,250 @@
+# portfolio/cache_backends.py
+"""
+Backend de cache partagé entre les workers d'une même machine.
+
+``LocMemCache`` garde un cache distinct par processus : avec
+``WEB_CONCURRENCY=4`` chaque worker a son propre cache froid et une
+invalidation n'atteint qu'un seul processus. ``SQLiteCache`` stocke les
+entrées dans un fichier SQLite local (WAL + lectures memory-mapped), visible
+par tous les workers sans service externe.
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'portfolio.cache_backends.SQLiteCache',
+            'LOCATION': '/chemin/vers/cache.sqlite3',
+            'OPTIONS': {
+                'MAX_ENTRIES': 5000,          # éviction LRU au-delà
+                'MAX_BYTES': 64 * 1024 ** 2,  # taille cumulée des valeurs
+                'MMAP_SIZE': 128 * 1024 ** 2,
+            },
+        }
+    }
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed);
+CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires);
+"""
+
+
+class SQLiteCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._path = os.path.abspath(location)
+        self._max_bytes = int(options.get('MAX_BYTES', 64 * 1024 ** 2))
+        self._mmap_size = int(options.get('MMAP_SIZE', 128 * 1024 ** 2))
+        self._busy_timeout = int(options.get('BUSY_TIMEOUT', 5000))
+        # Précision de l'horodatage LRU : évite une écriture à chaque lecture
+        self._access_resolution = float(options.get('ACCESS_RESOLUTION', 30))
+        # Vérifie la taille du cache toutes les N écritures
+        self._cull_every = int(options.get('CULL_EVERY', 50))
+        self._local = threading.local()
+        self._writes = 0
+
+    # Connexion -----------------------------------------------------------
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        # Une connexion ne doit pas survivre à un fork (préchargement gunicorn)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=self._busy_timeout / 1000, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA mmap_size={self._mmap_size}')
+            conn.execute(f'PRAGMA busy_timeout={self._busy_timeout}')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _dumps(self, value):
+        return pickle.dumps(value, self.pickle_protocol)
+
+    # API Django ----------------------------------------------------------
+
+    def get(self, key, default=None, version=None):
+        return self.get_many([key], version).get(key, default)
+
+    def get_many(self, keys, version=None):
+        if not keys:
+            return {}
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        now = time.time()
+        conn = self._connection()
+        rows = conn.execute(
+            f"SELECT key, value, accessed FROM cache WHERE key IN ({','.join('?' * len(key_map))})"
+            " AND (expires IS NULL OR expires > ?)",
+            [*key_map, now],
+        ).fetchall()
+
+        stale = [(now, key) for key, _, accessed in rows if now - accessed > self._access_resolution]
+        if stale:
+            conn.executemany('UPDATE cache SET accessed = ? WHERE key = ?', stale)
+        return {key_map[key]: pickle.loads(value) for key, value, _ in rows}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set_many({key: value}, timeout, version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_backend_timeout(timeout)
+        now = time.time()
+        rows = []
+        for key, value in data.items():
+            blob = self._dumps(value)
+            rows.append((self.make_and_validate_key(key, version=version), blob, expires, now, len(blob)))
+        conn = self._connection()
+        with _immediate(conn):
+            conn.executemany(
+                'INSERT OR REPLACE INTO cache (key, value, expires, accessed, size) VALUES (?, ?, ?, ?, ?)',
+                rows,
+            )
+        self._maybe_cull(len(rows))
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        blob = self._dumps(value)
+        now = time.time()
+        conn = self._connection()
+        # Upsert atomique : ne remplace que si la clé existante est expirée
+        cursor = conn.execute(
+            'INSERT INTO cache (key, value, expires, accessed, size) VALUES (?, ?, ?, ?, ?)'
+            ' ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires,'
+            ' accessed = excluded.accessed, size = excluded.size'
+            ' WHERE cache.expires IS NOT NULL AND cache.expires <= ?',
+            (key, blob, self.get_backend_timeout(timeout), now, len(blob), now),
+        )
+        added = cursor.rowcount == 1
+        if added:
+            self._maybe_cull(1)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute(
+            'UPDATE cache SET expires = ?, accessed = ? WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self.get_backend_timeout(timeout), time.time(), key, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        with _immediate(conn):
+            row = conn.execute(
+                'SELECT value FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)',
+                (key, time.time()),
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Key '{key}' not found.")
+            new_value = pickle.loads(row[0]) + delta
+            blob = self._dumps(new_value)
+            conn.execute('UPDATE cache SET value = ?, size = ? WHERE key = ?', (blob, len(blob), key))
+        return new_value
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT 1 FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time()),
+        ).fetchone()
+        return row is not None
+
+    def delete(self, key, version=None):
+        return self._delete([self.make_and_validate_key(key, version=version)]) > 0
+
+    def delete_many(self, keys, version=None):
+        """Suppression atomique : tous les workers voient les clés disparaître ensemble"""
+        self._delete([self.make_and_validate_key(key, version=version) for key in keys])
+
+    def delete_prefix(self, prefix, version=None):
+        """Invalide atomiquement toutes les clés commençant par ``prefix``"""
+        key = self.make_key(prefix, version=version)
+        escaped = key.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        conn = self._connection()
+        with _immediate(conn):
+            cursor = conn.execute("DELETE FROM cache WHERE key LIKE ? ESCAPE '\\'", (escaped + '%',))
+        return cursor.rowcount
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache')
+
+    def close(self, **kwargs):
+        # Connexion conservée entre les requêtes : c'est tout l'intérêt du cache
+        pass
+
+    # Interne -------------------------------------------------------------
+
+    def _delete(self, keys):
+        if not keys:
+            return 0
+        conn = self._connection()
+        with _immediate(conn):
+            cursor = conn.executemany('DELETE FROM cache WHERE key = ?', [(k,) for k in keys])
+        return cursor.rowcount
+
+    def _maybe_cull(self, count):
+        self._writes += count
+        if self._writes < self._cull_every:
+            return
+        self._writes = 0
+        self._cull()
+
+    def _cull(self):
+        """Purge les entrées expirées puis évince les moins récemment lues"""
+        conn = self._connection()
+        with _immediate(conn):
+            conn.execute('DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?', (time.time(),))
+            entries, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+            if entries <= self._max_entries and total <= self._max_bytes:
+                return
+            if self._cull_frequency == 0:
+                conn.execute('DELETE FROM cache')
+                return
+            # Comme les backends Django : retire 1/CULL_FREQUENCY des entrées,
+            # puis continue tant que le plafond en octets est dépassé.
+            to_remove = max(entries // self._cull_frequency, entries - self._max_entries)
+            conn.execute(
+                'DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed LIMIT ?)',
+                (to_remove,),
+            )
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()[0]
+            while total > self._max_bytes:
+                removed = conn.execute(
+                    'DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed LIMIT 100)'
+                ).rowcount
+                if not removed:
+                    break
+                total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()[0]
+
+
+class _immediate:
+    """Transaction ``BEGIN IMMEDIATE`` : prend le verrou d'écriture d'emblée"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, *exc):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
@@ -0,0 +1,226 @@
+# portfolio/caching.py
+"""
+Cache des pages et des réponses API avec « single-flight » et
+« stale-while-revalidate ».
+
+Chaque entrée porte la version du contenu au moment du rendu. Une sauvegarde
+dans l'admin incrémente cette version (voir ``signals.py``) : les entrées
+deviennent périmées mais restent servies pendant qu'un seul appelant, muni
+d'un verrou avec bail dans le cache partagé, régénère la page. Les autres
+requêtes, dans tous les workers, reçoivent la copie périmée au lieu de
+reconstruire la même page en parallèle.
+
+Les fragments communs à toutes les pages (en-tête, barre de contact, pied
+de page) sont mis en cache séparément par la balise ``{% fragment %}`` :
+leur clé dépend de la version des seuls modèles qu'ils affichent.
+"""
+import hashlib
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils.http import urlencode
+
+VERSION_KEY = 'caching:content-version'
+MODEL_VERSION_KEY = 'caching:model-version:{}'
+STATS_KEY = 'caching:stats:{}'
+STATS_EVENTS = ('hit', 'miss', 'stale')
+FRAGMENT_EVENTS = ('hit', 'miss', 'hit_us', 'miss_us')
+
+# Seuls paramètres lus par les vues en cache : ``?utm_source=`` ou un
+# paramètre aléatoire ne crée ni nouvelle entrée ni nouveau rendu
+CACHE_QUERY_PARAMS = ('apres', 'page', 'q', 'tri')
+
+# Jeton CSRF propre à chaque visiteur : rendu avec un marqueur puis substitué
+CSRF_PLACEHOLDER = '__CSRF_TOKEN_PLACEHOLDER__'
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+_last_flush = time.monotonic()
+_export = threading.local()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def content_version():
+    """Version courante du contenu, partagée par tous les workers"""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Clé évincée ou absente : une nouvelle version rend tout périmé (sûr)
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_content_version():
+    """Marque toutes les entrées comme périmées sans les supprimer"""
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def model_versions(labels):
+    """Versions des modèles ``labels`` (``'app.modele'``), dans le même ordre"""
+    keys = [MODEL_VERSION_KEY.format(label) for label in labels]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key, 0) for key in keys]
+
+
+def bump_model_version(label):
+    """Périme les fragments qui affichent le modèle ``label``"""
+    cache.set(MODEL_VERSION_KEY.format(label), time.time_ns(), None)
+
+
+def _record(event, amount=1):
+    global _last_flush
+    with _stats_lock:
+        _stats[event] += amount
+        if time.monotonic() - _last_flush < _setting('PAGE_CACHE_STATS_FLUSH', 5):
+            return
+        pending = dict(_stats)
+        _stats.clear()
+        _last_flush = time.monotonic()
+    _flush_stats(pending)
+
+
+def _flush_stats(pending):
+    for event, count in pending.items():
+        key = STATS_KEY.format(event)
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            if not cache.add(key, count, None):
+                cache.incr(key, count)
+
+
+def stats():
+    """Compteurs hit/miss/stale agrégés sur tous les workers"""
+    with _stats_lock:
+        pending = dict(_stats)
+        _stats.clear()
+    _flush_stats(pending)
+    return {event: cache.get(STATS_KEY.format(event), 0) for event in STATS_EVENTS}
+
+
+def record_fragment(name, hit, elapsed_ns):
+    """Compte un rendu du fragment ``name`` et sa durée"""
+    event = 'hit' if hit else 'miss'
+    _record(f'fragment:{name}:{event}')
+    _record(f'fragment:{name}:{event}_us', elapsed_ns // 1000)
+
+
+def fragment_stats(names):
+    """Hits, misses et durées cumulées (µs) par fragment, tous workers confondus"""
+    stats()
+    keys = [STATS_KEY.format(f'fragment:{name}:{event}') for name in names for event in FRAGMENT_EVENTS]
+    values = cache.get_many(keys)
+    return {
+        name: {
+            event: values.get(STATS_KEY.format(f'fragment:{name}:{event}'), 0)
+            for event in FRAGMENT_EVENTS
+        }
+        for name in names
+    }
+
+
+@contextmanager
+def exporting():
+    """
+    Rendu pour l'export statique (``static_site.py``) : le cache n'est ni lu
+    ni écrit, pour ne jamais exporter une copie périmée, et le jeton CSRF
+    reste sous forme de marqueur, substitué au moment de servir le fichier.
+    """
+    _export.active = True
+    try:
+        yield
+    finally:
+        _export.active = False
+
+
+def _exporting():
+    return getattr(_export, 'active', False)
+
+
+def get_or_build(key, builder, timeout=None, stale_timeout=None, lease=None):
+    """
+    Retourne la valeur en cache pour ``key`` ou la construit avec ``builder``.
+
+    - entrée fraîche : servie directement (hit) ;
+    - entrée périmée : servie telle quelle (stale) pendant que l'appelant qui
+      obtient le verrou la régénère ;
+    - pas d'entrée (miss) : un seul appelant construit, les autres attendent
+      au plus ``PAGE_CACHE_WAIT`` secondes avant de construire eux-mêmes
+      (un constructeur lent ou tombé n'immobilise pas tous les workers
+      pendant tout le bail).
+    """
+    if _exporting():
+        return builder()
+    timeout = _setting('PAGE_CACHE_TIMEOUT', 300) if timeout is None else timeout
+    stale_timeout = _setting('PAGE_CACHE_STALE_TIMEOUT', 3600) if stale_timeout is None else stale_timeout
+    lease = _setting('PAGE_CACHE_LEASE', 30) if lease is None else lease
+
+    version = content_version()
+    lock_key = f'{key}:lock'
+    entry = cache.get(key)
+
+    if entry is not None:
+        entry_version, fresh_until, value = entry
+        if entry_version == version and time.time() < fresh_until:
+            _record('hit')
+            return value
+        if not cache.add(lock_key, 1, lease):
+            _record('stale')
+            return value
+    elif not cache.add(lock_key, 1, lease):
+        # Un autre worker construit déjà la valeur : on l'attend, brièvement
+        deadline = time.monotonic() + min(lease, _setting('PAGE_CACHE_WAIT', 2))
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(key)
+            if entry is not None and entry[0] == version:
+                _record('hit')
+                return entry[2]
+            if not cache.has_key(lock_key):
+                break
+        _record('miss')
+        return builder()
+
+    _record('miss')
+    try:
+        value = builder()
+        cache.set(key, (version, time.time() + timeout, value), timeout + stale_timeout)
+    finally:
+        cache.delete(lock_key)
+    return value
+
+
+def request_cache_key(prefix, request):
+    """Clé dépendant de l'hôte, du chemin et des seuls ``CACHE_QUERY_PARAMS``"""
+    # Valeur lue par les vues (``GET.get`` : la dernière), dans l'ordre fixe de la liste
+    params = [(name, request.GET[name]) for name in CACHE_QUERY_PARAMS if name in request.GET]
+    url = f'{request.scheme}://{request.get_host()}{request.path}?{urlencode(params)}'
+    digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return f'page:{prefix}:{digest}'
+
+
+def render_cached(request, prefix, template_name, build_context, **kwargs):
+    """Rend ``template_name`` via le cache et retourne le HTML pour ``request``"""
+    def builder():
+        context = build_context()
+        context['csrf_token'] = CSRF_PLACEHOLDER
+        return render_to_string(template_name, context, request=request)
+
+    html = get_or_build(request_cache_key(prefix, request), builder, **kwargs)
+    if _exporting():
+        return html
+    return html.replace(CSRF_PLACEHOLDER, str(get_token(request)))
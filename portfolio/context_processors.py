@@ -0,0 +1,22 @@
+# portfolio/context_processors.py
+from django.utils.encoding import escape_uri_path
+from django.utils.functional import SimpleLazyObject
+
+from .models import ContactInfo, SiteSettings, SocialLink
+
+
+def site_content(request):
+    """
+    Contenu affiché par base.html sur toutes les pages.
+
+    Évalué paresseusement : tant que les fragments sont en cache, aucune
+    requête SQL n'est exécutée.
+    """
+    return {
+        # Sans la chaîne de requête : les pages en cache sont partagées entre
+        # URL qui ne diffèrent que par des paramètres ignorés (utm_*...)
+        'page_url': f'{request.scheme}://{request.get_host()}{escape_uri_path(request.path)}',
+        'contact_info': SimpleLazyObject(ContactInfo.objects.first),
+        'social_links': SocialLink.objects.filter(actif=True).order_by('ordre_affichage'),
+        'site_settings': SimpleLazyObject(SiteSettings.objects.first),
+    }
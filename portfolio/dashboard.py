@@ -0,0 +1,206 @@
+# portfolio/dashboard.py
+"""
+Tableau de bord de l'accueil de l'admin : messages non lus, abonnés,
+inscriptions par jour et volume de chaque contenu.
+
+Rien n'est compté à l'affichage. Les valeurs viennent de deux petites
+tables tenues à jour à chaque écriture :
+
+- ``Compteur`` : une ligne par total (``messages_non_lus``, ``abonnes``,
+  ``contenu:portfolio.project``...), incrémentée par les signaux de
+  ``signals.py`` et par les chemins qui écrivent en masse (actions de
+  l'admin, archivage des messages) ;
+- ``StatistiquesJour`` : une ligne par jour (inscriptions, désinscriptions,
+  messages reçus).
+
+L'affichage lit donc une vingtaine de lignes quelle que soit la taille de
+``ContactMessage`` et ``Newsletter``, et le résultat est gardé
+``DASHBOARD_CACHE_TIMEOUT`` secondes dans le cache partagé (effacé à chaque
+modification validée).
+
+``rebuild()`` recompte tout depuis les tables, messages archivés compris
+pour les jours affichés (premier affichage, puis
+``manage.py rebuild_dashboard`` pour corriger une dérive après un import en
+``bulk_create`` ou une suppression en SQL direct).
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+
+from .models import (
+    ContactMessage, Compteur, Feed, News, Newsletter, Partner, Project, Skill,
+    SocialGallery, StatistiquesJour,
+)
+
+CACHE_KEY = 'dashboard:stats'
+
+# Contenus dont le volume est affiché
+CONTENT_MODELS = (Project, SocialGallery, News, Feed, Partner, Skill)
+
+TOTALS = ('messages', 'messages_non_lus', 'abonnes', 'abonnes_actifs')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def content_counter(model):
+    return f'contenu:{model._meta.label_lower}'
+
+
+def _invalidate():
+    transaction.on_commit(lambda: cache.delete(CACHE_KEY))
+
+
+# Mises à jour ------------------------------------------------------------------
+
+def adjust(**deltas):
+    """
+    Ajoute ``deltas`` aux compteurs (``adjust(messages=1, messages_non_lus=1)``).
+
+    Un compteur absent n'est pas créé : tant que ``rebuild()`` n'a pas tourné,
+    le premier affichage recomptera tout.
+    """
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    for name, delta in deltas.items():
+        Compteur.objects.filter(nom=name).update(valeur=F('valeur') + delta)
+    if deltas:
+        _invalidate()
+
+
+def adjust_content(model, delta):
+    adjust(**{content_counter(model): delta})
+
+
+def bump_day(day=None, **deltas):
+    """Ajoute ``deltas`` à la ligne du jour ``day`` (défaut : aujourd'hui, heure locale)"""
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    day = day or timezone.localdate()
+    updates = {name: F(name) + delta for name, delta in deltas.items()}
+    if not StatistiquesJour.objects.filter(jour=day).update(**updates):
+        StatistiquesJour.objects.bulk_create([StatistiquesJour(jour=day)], ignore_conflicts=True)
+        StatistiquesJour.objects.filter(jour=day).update(**updates)
+    _invalidate()
+
+
+def messages_removed(queryset):
+    """À appeler avant une suppression en masse de ``ContactMessage``"""
+    counts = queryset.aggregate(total=Count('pk'), non_lus=Count('pk', filter=Q(lu=False)))
+    adjust(messages=-counts['total'], messages_non_lus=-counts['non_lus'])
+
+
+def subscribers_removed(queryset):
+    """À appeler avant une suppression en masse de ``Newsletter``"""
+    counts = queryset.aggregate(total=Count('pk'), actifs=Count('pk', filter=Q(actif=True)))
+    adjust(abonnes=-counts['total'], abonnes_actifs=-counts['actifs'])
+
+
+# Recomptage ---------------------------------------------------------------------
+
+def rebuild(days=None):
+    """Recompte tous les compteurs et les ``days`` derniers jours depuis les tables"""
+    days = days or _setting('DASHBOARD_DAYS', 14)
+    values = {
+        **ContactMessage.objects.aggregate(
+            messages=Count('pk'), messages_non_lus=Count('pk', filter=Q(lu=False)),
+        ),
+        **Newsletter.objects.aggregate(
+            abonnes=Count('pk'), abonnes_actifs=Count('pk', filter=Q(actif=True)),
+        ),
+        **{content_counter(model): model.objects.count() for model in CONTENT_MODELS},
+    }
+    since = timezone.localdate() - timedelta(days=days - 1)
+    start = timezone.make_aware(datetime.combine(since, time.min))
+    daily = {since + timedelta(days=n): {'inscriptions': 0, 'messages': 0} for n in range(days)}
+    for field, model, date_field in (
+        ('inscriptions', Newsletter, 'date_inscription'),
+        ('messages', ContactMessage, 'date_envoi'),
+    ):
+        rows = (
+            model.objects.filter(**{f'{date_field}__gte': start})
+            .annotate(jour=TruncDate(date_field)).values('jour').annotate(n=Count('pk')).order_by()
+        )
+        for row in rows:
+            if row['jour'] in daily:
+                daily[row['jour']][field] = row['n']
+    # Les messages archivés ont quitté la table mais restent reçus ce jour-là
+    from .archive import archived_per_day  # archive.py importe ce module
+    for day, count in archived_per_day(start).items():
+        if day in daily:
+            daily[day]['messages'] += count
+
+    with transaction.atomic():
+        Compteur.objects.bulk_create(
+            [Compteur(nom=name, valeur=value) for name, value in values.items()],
+            update_conflicts=True, unique_fields=['nom'], update_fields=['valeur'],
+        )
+        for day, counts in daily.items():
+            # Les désinscriptions n'ont pas de date en base : on garde celles déjà comptées
+            StatistiquesJour.objects.update_or_create(jour=day, defaults=counts)
+    _invalidate()
+    return values
+
+
+# Lecture ------------------------------------------------------------------------
+
+def _changelist(model):
+    try:
+        return reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+    except NoReverseMatch:
+        return None
+
+
+def _compute():
+    counters = dict(Compteur.objects.values_list('nom', 'valeur'))
+    if not counters:
+        counters = rebuild()
+    days = _setting('DASHBOARD_DAYS', 14)
+    today = timezone.localdate()
+    since = today - timedelta(days=days - 1)
+    rows = {row.jour: row for row in StatistiquesJour.objects.filter(jour__gte=since)}
+    daily = []
+    for offset in range(days):
+        day = today - timedelta(days=offset)
+        row = rows.get(day)
+        daily.append({
+            'jour': day,
+            'inscriptions': row.inscriptions if row else 0,
+            'desinscriptions': row.desinscriptions if row else 0,
+            'messages': row.messages if row else 0,
+        })
+    peak = max([d['inscriptions'] for d in daily] + [1])
+    for d in daily:
+        d['barre'] = round(100 * d['inscriptions'] / peak)
+    return {
+        **{name: counters.get(name, 0) for name in TOTALS},
+        'contenus': [
+            {
+                'nom': str(model._meta.verbose_name_plural),
+                'total': counters.get(content_counter(model), 0),
+                'url': _changelist(model),
+            }
+            for model in CONTENT_MODELS
+        ],
+        'jours': daily,
+        'inscriptions_periode': sum(d['inscriptions'] for d in daily),
+        'messages_url': _changelist(ContactMessage),
+        'abonnes_url': _changelist(Newsletter),
+        'calcule_le': timezone.now(),
+    }
+
+
+def stats():
+    """Données du tableau de bord, depuis le cache partagé si possible"""
+    data = cache.get(CACHE_KEY)
+    if data is None:
+        data = _compute()
+        cache.set(CACHE_KEY, data, _setting('DASHBOARD_CACHE_TIMEOUT', 60))
+    return data
@@ -0,0 +1,291 @@
+# portfolio/index_advisor.py
+"""
+Conseiller d'index : appelle chaque route avec le client de test, capture
+le SQL exécuté et passe chaque SELECT à ``EXPLAIN QUERY PLAN`` (SQLite) ou
+``EXPLAIN`` (PostgreSQL).
+
+Sont signalés les parcours complets de table (``SCAN t`` / ``Seq Scan``) et
+les tris en B-tree temporaire (``USE TEMP B-TREE FOR ORDER BY`` / ``Sort``).
+Pour chaque requête signalée, l'index proposé reprend les colonnes filtrées
+par égalité puis celles de l'``ORDER BY`` (avec leur sens), s'il n'existe
+pas déjà. Les index retenus sont ensuite déclarés dans ``Meta.indexes`` et
+livrés par migration.
+
+Tout s'exécute dans une transaction annulée à la fin : inscriptions,
+messages et utilisateur d'admin de test ne laissent aucune trace. Le cache
+des pages est contourné (``caching.exporting``) pour que les vues
+interrogent réellement la base.
+"""
+import hashlib
+import json
+import re
+import uuid
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from urllib.parse import urlencode
+
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from . import loadbench, outbound, sections
+from .caching import exporting
+from .models import News, Newsletter, Project, SocialGallery
+
+FROM_RE = re.compile(r'\bFROM "(\w+)"')
+WHERE_RE = re.compile(r'\bWHERE (.*?)(?: GROUP BY | ORDER BY | LIMIT |$)', re.S)
+ORDER_RE = re.compile(r'\bORDER BY (.*?)(?: LIMIT | OFFSET |$)', re.S)
+ORDER_ITEM_RE = re.compile(r'"(\w+)"\."(\w+)" (ASC|DESC)')
+
+# Colonne filtrée par égalité (ou booléen seul) : ``"t"."c" = %s``, ``"t"."c" IN``, ``"t"."c")``
+EQUALITY_TEMPLATE = r'"{table}"\."(\w+)"(?=\s*=|\s+IN\b|\s+IS\b|\s*\)|\s+AND\b|\s+OR\b|\s*$)'
+
+
+@dataclass
+class Query:
+    route: str
+    alias: str
+    sql: str
+    params: tuple
+    plan: list = field(default_factory=list)
+    flags: list = field(default_factory=list)
+    proposal: tuple = None
+
+
+# Requêtes d'exemple ----------------------------------------------------------
+
+def example_requests():
+    """Route -> (méthode, chemin, corps, type de contenu) à partir du contenu de la base"""
+    project = Project.objects.order_by('-pk').first()
+    gallery = SocialGallery.objects.order_by('-pk').first()
+    subscriber = Newsletter.objects.order_by('-pk').first()
+    unique = uuid.uuid4().hex[:12]
+    examples = {
+        'index': ('GET', '/', None, None),
+        'tous_projets': ('GET', reverse('portfolio:tous_projets') + '?page=2', None, None),
+        'toute_galerie': ('GET', reverse('portfolio:toute_galerie') + '?page=2', None, None),
+        'search': ('GET', reverse('portfolio:search') + '?q=projet', None, None),
+        'api_projects': ('GET', reverse('portfolio:api_projects'), None, None),
+        'api_gallery': ('GET', reverse('portfolio:api_gallery'), None, None),
+        'api_feed': ('GET', reverse('portfolio:api_feed'), None, None),
+        'section': ('GET', sections.url('feed'), None, None),
+        'newsletter_subscribe': (
+            'POST', reverse('portfolio:newsletter_subscribe'),
+            json.dumps({'email': f'conseil-{unique}@exemple.cg'}), 'application/json',
+        ),
+        'contact_message': (
+            'POST', reverse('portfolio:contact_message'),
+            urlencode({'nom': 'Conseil', 'email': f'conseil-{unique}@exemple.cg',
+                       'sujet': 'Index', 'message': "Requête du conseiller d'index"}),
+            'application/x-www-form-urlencoded',
+        ),
+    }
+    if project:
+        examples['projet_detail'] = ('GET', project.get_absolute_url(), None, None)
+    if gallery:
+        examples['galerie_detail'] = ('GET', gallery.get_absolute_url(), None, None)
+        # Lot « Voir plus » : lecture paginée par clé
+        examples['section'] = ('GET', f"{sections.url('galerie')}?apres={sections.encode_cursor(gallery)}", None, None)
+    news = News.objects.order_by('-pk').first()
+    if news:
+        examples['outbound'] = ('GET', outbound.link_for(news), None, None)
+    if subscriber:
+        examples['newsletter_unsubscribe'] = (
+            'GET', reverse('portfolio:newsletter_unsubscribe', args=[subscriber.token_desabonnement]), None, None,
+        )
+    return examples
+
+
+def admin_requests():
+    """Liste de chaque modèle enregistré dans l'admin"""
+    return {
+        f'admin:{model._meta.model_name}': (
+            'GET', reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist'), None, None,
+        )
+        for model in admin.site._registry
+    }
+
+
+# Capture ---------------------------------------------------------------------
+
+def capture(host, include_admin=True):
+    """Exécute chaque route et retourne ``(requêtes capturées, routes sans exemple)``"""
+    examples = example_requests()
+    routes = {
+        name: examples[name] for name in loadbench.route_names()
+        if name in examples
+    }
+    missing = [
+        name for name in loadbench.route_names()
+        if name not in examples and name not in loadbench.EXCLUDED_ROUTES
+    ]
+    queries = []
+    current = {'route': None}
+
+    def record(execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith('SELECT'):
+            alias = context['connection'].alias
+            queries.append(Query(current['route'], alias, sql, tuple(params or ())))
+        return execute(sql, params, many, context)
+
+    overrides = override_settings(
+        THROTTLE_ENABLED=False,
+        STATIC_SITE_ENABLED=False,
+        EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    )
+    with overrides, ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(transaction.atomic(using=alias))
+        client = Client(raise_request_exception=False, HTTP_HOST=host)
+        if include_admin:
+            user = get_user_model().objects.create_superuser(
+                f'conseil-{uuid.uuid4().hex[:8]}', 'conseil@exemple.cg', uuid.uuid4().hex,
+            )
+            client.force_login(user)
+            routes.update(admin_requests())
+        try:
+            with ExitStack() as wrappers, exporting():
+                for alias in connections:
+                    wrappers.enter_context(connections[alias].execute_wrapper(record))
+                for route, (method, path, body, content_type) in routes.items():
+                    current['route'] = route
+                    if method == 'POST':
+                        client.post(path, body, content_type=content_type)
+                    else:
+                        client.get(path)
+            for query in queries:
+                explain(query)
+        finally:
+            for alias in connections:
+                transaction.set_rollback(True, using=alias)
+    return queries, missing
+
+
+# Analyse ---------------------------------------------------------------------
+
+def explain(query):
+    conn = connections[query.alias]
+    prefix = 'EXPLAIN QUERY PLAN ' if conn.vendor == 'sqlite' else 'EXPLAIN '
+    with conn.cursor() as cursor:
+        cursor.execute(prefix + query.sql, query.params)
+        rows = cursor.fetchall()
+    if conn.vendor == 'sqlite':
+        query.plan = [row[-1] for row in rows]
+        for line in query.plan:
+            if re.match(r'SCAN \w+$', line):
+                query.flags.append(f'parcours complet ({line.split()[1]})')
+            elif 'USE TEMP B-TREE' in line:
+                query.flags.append('tri temporaire')
+    else:
+        query.plan = [row[0] for row in rows]
+        for line in query.plan:
+            match = re.search(r'Seq Scan on (\w+)', line)
+            if match:
+                query.flags.append(f'parcours complet ({match.group(1)})')
+            elif re.search(r'->\s*Sort\b|^Sort\b', line.strip()):
+                query.flags.append('tri')
+    if not (WHERE_RE.search(query.sql) or ORDER_RE.search(query.sql)):
+        query.flags = []  # COUNT(*) ou table entière : aucun index n'évite de tout lire
+    if query.flags:
+        query.proposal = propose(query.sql)
+
+
+def propose(sql):
+    """``(table, colonnes)`` de l'index proposé pour ``sql``, ou ``None``"""
+    table_match = FROM_RE.search(sql)
+    if not table_match:
+        return None
+    table = table_match.group(1)
+    model = _model_for_table(table)
+    # La clé primaire est déjà indexée ; en fin d'ORDER BY (admin) ou dans un
+    # ``NOT (id = %s)`` elle n'apporte rien à un index composite
+    pk = model._meta.pk.column if model else None
+    columns = []
+    where = WHERE_RE.search(sql)
+    if where:
+        for column in re.findall(EQUALITY_TEMPLATE.format(table=table), where.group(1)):
+            if column != pk and column not in columns:
+                columns.append(column)
+    order = ORDER_RE.search(sql)
+    if order:
+        for item_table, column, direction in ORDER_ITEM_RE.findall(order.group(1)):
+            if item_table != table:
+                break  # tri sur une table jointe : un index de ``table`` n'aide plus
+            if column == pk:
+                break
+            if column not in columns:
+                columns.append(f'-{column}' if direction == 'DESC' else column)
+    if not columns:
+        return None
+    return table, tuple(columns)
+
+
+def _model_for_table(table):
+    return next((m for m in apps.get_models() if m._meta.db_table == table), None)
+
+
+def existing_indexes(model):
+    """Colonnes (avec sens) des index déjà présents sur ``model``"""
+    found = [(model._meta.pk.column,)]
+    for f in model._meta.concrete_fields:
+        if f.db_index or f.unique:
+            found.append((f.column,))
+    for fields in model._meta.unique_together:
+        found.append(tuple(model._meta.get_field(name).column for name in fields))
+    for index in model._meta.indexes:
+        found.append(tuple(
+            ('-' if name.startswith('-') else '') + model._meta.get_field(name.lstrip('-')).column
+            for name in index.fields
+        ))
+    return found
+
+
+def is_covered(model, columns):
+    return any(existing[:len(columns)] == columns for existing in existing_indexes(model))
+
+
+def index_name(model, fields):
+    """Nom d'index de 30 caractères au plus, stable pour les mêmes champs"""
+    stem = '_'.join([model._meta.model_name[:8]] + [f.lstrip('-')[:6].rstrip('_') for f in fields])
+    digest = hashlib.sha1(','.join(fields).encode()).hexdigest()[:4]
+    return f"{stem[:21].rstrip('_')}_{digest}_idx"
+
+
+def recommendations(queries, min_rows=500):
+    """Index à créer, regroupés : ``[{model, fields, name, routes, rows, retenu}]``"""
+    grouped = {}
+    for query in queries:
+        if not query.proposal:
+            continue
+        table, columns = query.proposal
+        model = _model_for_table(table)
+        if model is None or is_covered(model, columns):
+            continue
+        entry = grouped.setdefault((table, columns), {'model': model, 'columns': columns, 'routes': set()})
+        entry['routes'].add(query.route)
+
+    result = []
+    for entry in grouped.values():
+        model = entry['model']
+        by_column = {f.column: f.name for f in model._meta.concrete_fields}
+        fields = [('-' if c.startswith('-') else '') + by_column[c.lstrip('-')] for c in entry['columns']]
+        rows = model._base_manager.using('default').count()
+        result.append({
+            'model': model,
+            'fields': fields,
+            'name': index_name(model, fields),
+            'routes': sorted(entry['routes']),
+            'rows': rows,
+            'retenu': rows >= min_rows,
+        })
+    # Un index (a, b) rend (a) inutile : on ne garde que le plus long préfixe
+    result = [
+        r for r in result
+        if not any(o is not r and o['model'] is r['model'] and o['fields'][:len(r['fields'])] == r['fields']
+                   and len(o['fields']) > len(r['fields']) for o in result)
+    ]
+    return sorted(result, key=lambda r: (r['model']._meta.model_name, r['fields']))
@@ -0,0 +1,421 @@
+# portfolio/loadbench.py
+"""
+Banc de charge HTTP reproductible (``python manage.py bench_http``).
+
+1. une base SQLite est remplie par ``seed_data`` (volume ``--scale``, graine
+   fixe) puis conservée dans ``cache/bench/`` pour les exécutions suivantes ;
+2. l'application est démarrée comme sur Render : gunicorn + UvicornWorker,
+   ``DEBUG=False``, sur cette base et un cache vide ;
+3. chaque route de ``portfolio/urls.py`` reçoit ``--requests`` requêtes
+   réparties sur ``--concurrency`` connexions keep-alive ;
+4. les percentiles, le débit et les erreurs sont écrits en JSON et comparés
+   à une référence (``bench/baseline.json``).
+
+Les routes de diagnostic (``EXCLUDED_ROUTES``) ne sont pas mesurées ; une
+route sans méthode dans ``Scenarios`` est signalée pour ne pas être oubliée.
+"""
+import http.client
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from . import outbound, sections
+
+SCALES = {
+    'small': {},
+    'medium': {'projects': 10000, 'subscribers': 100000, 'messages': 50000, 'news': 2000, 'gallery': 2000},
+    'large': {'projects': 50000, 'subscribers': 1000000, 'messages': 500000, 'news': 10000, 'gallery': 10000},
+}
+
+EXCLUDED_ROUTES = {'metrics', 'template_profiles', 'request_profiles', 'request_profile_detail'}
+
+SEARCH_TERMS = ('plateforme', 'jeunesse', 'Congo', 'données', 'santé', 'xyz-introuvable')
+
+OVERLAY_SETTINGS = """\
+from portfolio_project.settings import *  # noqa
+
+DEBUG = False
+ALLOWED_HOSTS = ['127.0.0.1', 'localhost']
+DATABASES = {{'default': {{'ENGINE': 'django.db.backends.sqlite3', 'NAME': {db!r}}}}}
+CACHES['default']['LOCATION'] = {cache!r}
+METRICS_LOCATION = {metrics!r}
+THROTTLE_ENABLED = False
+TEMPLATE_PROFILER_ENABLED = False
+REQUEST_PROFILER_SAMPLE_RATE = 0
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+LOGGING = {{
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {{'null': {{'class': 'logging.NullHandler'}}}},
+    'root': {{'handlers': ['null'], 'level': 'ERROR'}},
+}}
+"""
+
+
+# Préparation -----------------------------------------------------------------
+
+def bench_dir():
+    return Path(settings.BASE_DIR) / 'cache' / 'bench'
+
+
+def write_overlay(workdir, db_path):
+    """Module de settings pour le serveur et les commandes du banc"""
+    path = Path(workdir) / 'bench_settings.py'
+    path.write_text(OVERLAY_SETTINGS.format(
+        db=str(db_path),
+        cache=str(Path(workdir) / 'cache.sqlite3'),
+        metrics=str(Path(workdir) / 'metrics.sqlite3'),
+    ), encoding='utf-8')
+    return path
+
+
+def bench_env(workdir):
+    env = os.environ.copy()
+    env['DJANGO_SETTINGS_MODULE'] = 'bench_settings'
+    env['PYTHONPATH'] = os.pathsep.join([str(workdir), str(settings.BASE_DIR), env.get('PYTHONPATH', '')])
+    return env
+
+
+def manage(workdir, *args):
+    subprocess.run(
+        [sys.executable, 'manage.py', *args],
+        cwd=settings.BASE_DIR, env=bench_env(workdir), check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def prepare_database(scale, seed, reseed=False, source=None, stdout=None):
+    """Chemin d'une base remplie pour ``scale`` (réutilisée si elle existe)"""
+    directory = bench_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    if source:
+        db_path = directory / f'copy-{Path(source).stem}.sqlite3'
+        shutil.copyfile(source, db_path)
+        with tempfile.TemporaryDirectory() as workdir:
+            write_overlay(workdir, db_path)
+            manage(workdir, 'migrate', '--noinput')
+        return db_path
+
+    db_path = directory / f'db-{scale}-{seed}.sqlite3'
+    if db_path.exists() and not reseed:
+        return db_path
+    tmp_path = db_path.with_suffix('.tmp')
+    tmp_path.unlink(missing_ok=True)
+    if stdout:
+        stdout.write(f"Génération de la base « {scale} » (graine {seed})...")
+    with tempfile.TemporaryDirectory() as workdir:
+        write_overlay(workdir, tmp_path)
+        manage(workdir, 'migrate', '--noinput')
+        counts = [f'--{name}={count}' for name, count in SCALES[scale].items()]
+        manage(workdir, 'seed_data', '--force', f'--seed={seed}', *counts)
+    os.replace(tmp_path, db_path)
+    return db_path
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Server:
+    """gunicorn + UvicornWorker, comme ``startCommand`` dans render.yaml"""
+
+    def __init__(self, workdir, workers=4):
+        self.workdir = workdir
+        self.workers = workers
+        self.port = free_port()
+        self.process = None
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [
+                sys.executable, '-m', 'gunicorn', 'portfolio_project.asgi:application',
+                '-k', 'uvicorn.workers.UvicornWorker',
+                '--workers', str(self.workers),
+                '--bind', f'127.0.0.1:{self.port}',
+                '--log-level', 'warning',
+                '--error-logfile', str(bench_dir() / 'server.log'),
+            ],
+            cwd=settings.BASE_DIR, env=bench_env(self.workdir), stdout=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("Le serveur gunicorn s'est arrêté au démarrage")
+            try:
+                conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=2)
+                conn.request('GET', '/api/feed/')
+                conn.getresponse().read()
+                conn.close()
+                return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__()
+        raise RuntimeError("Le serveur n'a pas répondu dans les 60 s")
+
+    def __exit__(self, *exc):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+# Scénarios -------------------------------------------------------------------
+
+class Scenarios:
+    """Fabrique les requêtes de chaque route à partir du contenu de la base"""
+
+    def __init__(self, db_path, seed):
+        self.rng = random.Random(seed)
+        with sqlite3.connect(db_path) as conn:
+            self.project_slugs = [r[0] for r in conn.execute('SELECT slug FROM portfolio_project LIMIT 1000')]
+            self.gallery_slugs = [r[0] for r in conn.execute('SELECT slug FROM portfolio_socialgallery LIMIT 1000')]
+            self.tokens = [
+                str(uuid.UUID(r[0])) for r in
+                conn.execute('SELECT token_desabonnement FROM portfolio_newsletter LIMIT 1000')
+            ]
+            self.news_ids = [r[0] for r in conn.execute('SELECT id FROM portfolio_news LIMIT 1000')]
+        self.counter = 0
+        self.lock = threading.Lock()
+
+    def _unique(self):
+        with self.lock:
+            self.counter += 1
+            return self.counter
+
+    # Chaque scénario retourne (méthode, chemin, corps, en-têtes)
+    def index(self):
+        return 'GET', '/', None, {}
+
+    def section(self):
+        name = self.rng.choice(list(sections.SECTIONS))
+        return 'GET', f'/sections/{name}/', None, {}
+
+    def projet_detail(self):
+        return 'GET', f'/projet/{self.rng.choice(self.project_slugs)}/', None, {}
+
+    def galerie_detail(self):
+        return 'GET', f'/galerie/{self.rng.choice(self.gallery_slugs)}/', None, {}
+
+    def tous_projets(self):
+        return 'GET', f'/projets/?page={self.rng.randint(1, 20)}', None, {}
+
+    def toute_galerie(self):
+        return 'GET', f'/galerie/?page={self.rng.randint(1, 20)}', None, {}
+
+    def search(self):
+        return 'GET', '/search/?' + urlencode({'q': self.rng.choice(SEARCH_TERMS)}), None, {}
+
+    def newsletter_unsubscribe(self):
+        return 'GET', f'/newsletter/unsubscribe/{self.rng.choice(self.tokens)}/', None, {}
+
+    def api_projects(self):
+        return 'GET', '/api/projects/', None, {}
+
+    def outbound(self):
+        token = outbound.sign('n', self.rng.choice(self.news_ids))
+        return 'GET', f'/go/{token}/', None, {}
+
+    def api_gallery(self):
+        return 'GET', '/api/gallery/', None, {}
+
+    def api_feed(self):
+        return 'GET', '/api/feed/', None, {}
+
+    def newsletter_subscribe(self):
+        body = json.dumps({'email': f'bench-{uuid.uuid4().hex[:12]}-{self._unique()}@exemple.cg'})
+        return 'POST', '/newsletter/', body, {'Content-Type': 'application/json'}
+
+    def contact_message(self):
+        n = self._unique()
+        body = urlencode({
+            'nom': f'Bench {n}', 'email': f'bench{n}@exemple.cg',
+            'sujet': f'Test de charge {n}', 'message': f'Message {uuid.uuid4().hex}',
+        })
+        return 'POST', '/contact/', body, {'Content-Type': 'application/x-www-form-urlencoded'}
+
+
+def route_names():
+    """Noms des routes de ``portfolio/urls.py``"""
+    names = []
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                if pattern.namespace == 'portfolio':
+                    walk(pattern.url_patterns)
+            elif isinstance(pattern, URLPattern) and pattern.name:
+                names.append(pattern.name)
+
+    walk(get_resolver().url_patterns)
+    return names
+
+
+# Charge ----------------------------------------------------------------------
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 3)
+
+
+def _csrf(port):
+    """Cookie et jeton CSRF pour les POST (comme le JavaScript du site)"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    conn.request('GET', '/')
+    response = conn.getresponse()
+    response.read()
+    conn.close()
+    for header, value in response.getheaders():
+        if header.lower() == 'set-cookie' and value.startswith('csrftoken='):
+            return value.split(';', 1)[0].split('=', 1)[1]
+    return ''
+
+
+def run_route(port, scenario, requests, concurrency, csrf_token=''):
+    """Envoie ``requests`` requêtes via ``concurrency`` connexions keep-alive"""
+    latencies, statuses, errors = [], {}, [0]
+    lock = threading.Lock()
+    remaining = [requests]
+
+    def worker():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            method, path, body, headers = scenario()
+            headers = {'Accept-Encoding': 'br, gzip', **headers}
+            if method == 'POST':
+                headers.update({'X-CSRFToken': csrf_token, 'Cookie': f'csrftoken={csrf_token}'})
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                status = None
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                if status is None or status >= 500:
+                    errors[0] += 1
+                if status is not None:
+                    latencies.append(elapsed)
+                key = str(status) if status is not None else 'error'
+                statuses[key] = statuses.get(key, 0) + 1
+        conn.close()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': requests,
+        'errors': errors[0],
+        'statuses': statuses,
+        'rps': round(requests / wall, 1) if wall else None,
+        'mean_ms': round(sum(latencies) / len(latencies), 3) if latencies else None,
+        'p50_ms': _percentile(latencies, 0.50),
+        'p95_ms': _percentile(latencies, 0.95),
+        'p99_ms': _percentile(latencies, 0.99),
+        'max_ms': round(latencies[-1], 3) if latencies else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(db_path, routes, requests=200, concurrency=8, workers=4, warmup=20, seed=42, stdout=None):
+    scenarios = Scenarios(db_path, seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        write_overlay(workdir, db_path)
+        with Server(workdir, workers=workers) as server:
+            csrf_token = _csrf(server.port)
+            for name in routes:
+                scenario = getattr(scenarios, name)
+                method = scenario()[0]
+                if warmup:
+                    run_route(server.port, scenario, warmup, concurrency, csrf_token)
+                result = run_route(server.port, scenario, requests, concurrency, csrf_token)
+                results[name] = {'method': method, **result}
+                if stdout:
+                    stdout.write(
+                        f"{name:<24} {method:<4} {result['rps'] or 0:>8.1f} req/s "
+                        f"p50 {result['p50_ms'] or 0:>8.2f}  p95 {result['p95_ms'] or 0:>8.2f}  "
+                        f"p99 {result['p99_ms'] or 0:>8.2f} ms  erreurs {result['errors']}"
+                    )
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'workers': workers,
+            'concurrency': concurrency,
+            'requests': requests,
+            'database': Path(db_path).name,
+        },
+        'routes': results,
+    }
+
+
+# Comparaison -----------------------------------------------------------------
+
+def compare(current, baseline, threshold=0.2, floor_ms=2.0):
+    """
+    Routes dont le p95 a augmenté de plus de ``threshold`` (et d'au moins
+    ``floor_ms``, pour ignorer le bruit des routes très rapides), ou dont
+    le nombre d'erreurs a augmenté.
+    """
+    rows = []
+    for name, result in current['routes'].items():
+        reference = baseline.get('routes', {}).get(name)
+        if not reference or result['p95_ms'] is None or not reference.get('p95_ms'):
+            continue
+        ratio = result['p95_ms'] / reference['p95_ms']
+        slower = ratio > 1 + threshold and result['p95_ms'] - reference['p95_ms'] > floor_ms
+        more_errors = result['errors'] > reference.get('errors', 0)
+        rows.append({
+            'route': name,
+            'baseline_p95_ms': reference['p95_ms'],
+            'p95_ms': result['p95_ms'],
+            'ratio': round(ratio, 3),
+            'regression': slower or more_errors,
+        })
+    return rows
@@ -0,0 +1,185 @@
+# portfolio/logs.py
+"""
+Handlers de logging utilisés par ``settings.LOGGING``.
+
+- ``QueuedHandler`` : les requêtes ne font que déposer l'enregistrement dans
+  une file bornée ; un thread par processus (``QueueListener``) l'écrit
+  ensuite sur la console et dans le fichier. File pleine, l'enregistrement
+  est abandonné et compté plutôt que de bloquer la requête.
+- ``SafeRotatingFileHandler`` : rotation par taille sûre avec plusieurs
+  workers (verrou fichier, réouverture quand un autre processus a tourné
+  le fichier) et compression gzip des archives.
+- ``JSONFormatter`` : une ligne JSON par enregistrement (``LOG_FORMAT=json``).
+"""
+import atexit
+import copy
+import fcntl
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+
+class JSONFormatter(logging.Formatter):
+    """Enregistrements au format JSON lines"""
+
+    def format(self, record):
+        data = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'process': record.process,
+            'thread': record.thread,
+        }
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data['exc_info'] = record.exc_text
+        status = getattr(record, 'status_code', None)
+        if status is not None:
+            data['status_code'] = status
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def _gzip_rotator(source, dest):
+    with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+class SafeRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    ``RotatingFileHandler`` partagé entre processus.
+
+    La taille est lue sur le disque (tous les workers écrivent dans le même
+    fichier). Les écritures prennent un verrou ``flock`` partagé et la
+    rotation un verrou exclusif : aucune ligne n'est écrite dans l'ancien
+    fichier pendant qu'il est compressé, et les autres workers rouvrent le
+    nouveau fichier dès qu'ils constatent le changement d'inode.
+    """
+
+    def __init__(self, filename, compress=True, **kwargs):
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        super().__init__(filename, **kwargs)
+        self.lock_path = self.baseFilename + '.lock'
+        if compress:
+            self.namer = lambda name: name + '.gz'
+            self.rotator = _gzip_rotator
+
+    @contextmanager
+    def _flock(self, operation):
+        with open(self.lock_path, 'a') as lock:
+            fcntl.flock(lock, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _stream_is_current(self):
+        if self.stream is None:
+            return True
+        try:
+            on_disk = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            return False
+        opened = os.fstat(self.stream.fileno())
+        return (on_disk.st_dev, on_disk.st_ino) == (opened.st_dev, opened.st_ino)
+
+    def _reopen(self):
+        if self.stream is not None:
+            self.stream.close()
+        self.stream = self._open()
+
+    def shouldRollover(self, record):
+        if self.maxBytes <= 0:
+            return False
+        try:
+            size = os.stat(self.baseFilename).st_size
+        except FileNotFoundError:
+            return False
+        return size + len(self.format(record)) + 1 >= self.maxBytes
+
+    def doRollover(self):
+        with self._flock(fcntl.LOCK_EX):
+            super().doRollover()
+
+    def _rollover(self, record):
+        with self._flock(fcntl.LOCK_EX):
+            # Un autre worker a pu tourner le fichier pendant l'attente
+            if not self._stream_is_current():
+                self._reopen()
+            elif self.shouldRollover(record):
+                super().doRollover()
+
+    def emit(self, record):
+        try:
+            if self.shouldRollover(record):
+                self._rollover(record)
+            with self._flock(fcntl.LOCK_SH):
+                if not self._stream_is_current():
+                    self._reopen()
+                logging.FileHandler.emit(self, record)
+        except Exception:
+            self.handleError(record)
+
+
+class QueuedHandler(logging.Handler):
+    """
+    Délègue l'écriture à ``handlers`` depuis un thread d'arrière-plan.
+
+    Dans ``LOGGING``, les handlers cibles sont référencés par
+    ``'cfg://handlers.<nom>'`` ; ``dictConfig`` configurant les handlers par
+    ordre alphabétique, le nom de ce handler doit venir après les leurs.
+    """
+
+    def __init__(self, handlers, maxsize=10000):
+        super().__init__()
+        # Accès par index : c'est lui qui résout les 'cfg://' de dictConfig
+        self.targets = [handlers[i] for i in range(len(handlers))]
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._pid = None
+        self._start()
+        atexit.register(self._stop)
+
+    def _start(self):
+        self.queue = queue.Queue(self.maxsize)
+        self.listener = logging.handlers.QueueListener(self.queue, *self.targets, respect_handler_level=True)
+        self.listener.start()
+        self._pid = os.getpid()
+
+    def _stop(self):
+        if self._pid == os.getpid() and self.listener._thread is not None:
+            self.listener.stop()
+
+    def prepare(self, record):
+        """Fige message et traceback : les arguments ne traversent pas la file"""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            # Thread perdu au fork (gunicorn --preload) : on en relance un
+            self._start()
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except queue.Full:
+            self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self._stop()
+        super().close()
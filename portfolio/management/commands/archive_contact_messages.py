@@ -0,0 +1,36 @@
+# portfolio/management/commands/archive_contact_messages.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from portfolio.archive import archive_messages, get_archive_dir
+
+
+class Command(BaseCommand):
+    help = "Archive les messages de contact anciens ou lus dans des segments JSONL compressés"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int,
+            default=getattr(settings, 'CONTACT_RETENTION_DAYS', 180),
+            help="Archiver les messages plus anciens que N jours"
+        )
+        parser.add_argument(
+            '--keep-read', action='store_true',
+            help="Ne pas archiver les messages lus plus récents que --days"
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help="Taille des lots de suppression")
+        parser.add_argument('--dry-run', action='store_true', help="Afficher le nombre de messages sans rien modifier")
+
+    def handle(self, *args, **options):
+        count = archive_messages(
+            days=options['days'],
+            include_read=not options['keep_read'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+        if options['dry_run']:
+            self.stdout.write(f"{count} messages seraient archivés.")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"{count} messages archivés dans {get_archive_dir()}."
+            ))
@@ -0,0 +1,57 @@
+# portfolio/management/commands/bench_cache.py
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+
+from portfolio.cache_backends import SQLiteCache
+
+
+def _measure(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        fn()
+        timings.append(time.perf_counter_ns() - start)
+    timings.sort()
+    return {
+        'mean': statistics.fmean(timings) / 1000,
+        'p50': timings[len(timings) // 2] / 1000,
+        'p99': timings[int(len(timings) * 0.99)] / 1000,
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare la latence des hits entre LocMemCache et SQLiteCache"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000)
+        parser.add_argument('--keys', type=int, default=500)
+        parser.add_argument('--value-size', type=int, default=20000, help="Taille d'une valeur en octets (page HTML)")
+
+    def handle(self, *args, **options):
+        iterations, nkeys = options['iterations'], options['keys']
+        value = 'x' * options['value_size']
+
+        with tempfile.TemporaryDirectory() as tmp:
+            backends = {
+                'locmem': LocMemCache('bench', {'OPTIONS': {'MAX_ENTRIES': nkeys * 2}}),
+                'sqlite': SQLiteCache(str(Path(tmp) / 'bench.sqlite3'), {'OPTIONS': {'MAX_ENTRIES': nkeys * 2}}),
+            }
+            self.stdout.write(f"{'backend':<8} {'op':<6} {'mean µs':>10} {'p50 µs':>10} {'p99 µs':>10}")
+            for name, cache in backends.items():
+                for i in range(nkeys):
+                    cache.set(f'page:{i}', value, None)
+                counter = iter(range(10 ** 9))
+                results = {
+                    'hit': _measure(lambda: cache.get(f'page:{next(counter) % nkeys}'), iterations),
+                    'miss': _measure(lambda: cache.get('absent'), iterations),
+                    'set': _measure(lambda: cache.set(f'page:{next(counter) % nkeys}', value), iterations // 10),
+                }
+                for op, stats in results.items():
+                    self.stdout.write(
+                        f"{name:<8} {op:<6} {stats['mean']:>10.1f} {stats['p50']:>10.1f} {stats['p99']:>10.1f}"
+                    )
@@ -0,0 +1,60 @@
+# portfolio/management/commands/bench_compression.py
+import gzip
+import time
+
+import brotli
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+
+from portfolio.middleware import Encoder, minify_html
+from portfolio.models import Project, SocialGallery
+
+
+def _timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+class Command(BaseCommand):
+    help = "Mesure les octets économisés et le coût CPU de la minification et de la compression"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        paths = ['/', '/api/projects/']
+        projet = Project.objects.first()
+        galerie = SocialGallery.objects.first()
+        if projet:
+            paths.append(projet.get_absolute_url())
+        if galerie:
+            paths.append(galerie.get_absolute_url())
+
+        middleware = [m for m in settings.MIDDLEWARE if m != 'portfolio.middleware.CompressionMiddleware']
+        with override_settings(MIDDLEWARE=middleware, ALLOWED_HOSTS=['*']):
+            client = Client()
+            pages = {path: client.get(path) for path in paths}
+
+        self.stdout.write(
+            f"{'page':<40} {'brut':>8} {'minifié':>8} {'ms':>6} {'gzip':>8} {'ms':>6} {'br':>8} {'ms':>6} {'gain':>6}"
+        )
+        for path, response in pages.items():
+            raw = response.content
+            body = raw
+            minify_ms = 0.0
+            if response['Content-Type'].startswith('text/html'):
+                body, minify_ms = _timed(lambda: minify_html(raw.decode('utf-8')).encode('utf-8'), repeat)
+            gz, gzip_ms = _timed(lambda: Encoder('gzip').compress_all(body), repeat)
+            br, br_ms = _timed(lambda: Encoder('br').compress_all(body), repeat)
+
+            # Contrôle d'intégrité : la décompression restitue le corps minifié
+            assert gzip.decompress(gz) == body and brotli.decompress(br) == body
+
+            self.stdout.write(
+                f"{path[:40]:<40} {len(raw):>8} {len(body):>8} {minify_ms:>6.2f} "
+                f"{len(gz):>8} {gzip_ms:>6.2f} {len(br):>8} {br_ms:>6.2f} {1 - len(br) / len(raw):>6.1%}"
+            )
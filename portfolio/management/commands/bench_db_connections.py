@@ -0,0 +1,101 @@
+# portfolio/management/commands/bench_db_connections.py
+import threading
+import time
+
+import dj_database_url
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from portfolio.models import Project
+
+
+def _percentile(values, q):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Latence d'une « requête » (connexion, deux requêtes SQL, libération) "
+        "avec une connexion ouverte à chaque fois puis avec le pool psycopg"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default=settings.DATABASE_URL, help="Base PostgreSQL (défaut : DATABASE_URL)")
+        parser.add_argument('--requests', type=int, default=500, help="Requêtes par thread")
+        parser.add_argument('--threads', type=int, default=8, help="Requêtes simultanées, comme les threads d'un worker")
+        parser.add_argument('--migrate', action='store_true', help="Appliquer les migrations sur la base avant de mesurer")
+
+    def _run(self, alias, threads, requests):
+        timings = {'total': [], 'connect': []}
+        lock = threading.Lock()
+
+        def worker():
+            local = {'total': [], 'connect': []}
+            for i in range(requests):
+                conn = connections[alias]
+                start = time.perf_counter()
+                conn.ensure_connection()
+                connected = time.perf_counter()
+                offset = (i % 20) * 9
+                list(Project.objects.using(alias).order_by('ordre_affichage')[offset:offset + 9])
+                Project.objects.using(alias).count()
+                # Fin de requête : fermeture, ou retour au pool
+                conn.close()
+                local['total'].append((time.perf_counter() - start) * 1000)
+                local['connect'].append((connected - start) * 1000)
+            with lock:
+                for key in timings:
+                    timings[key] += local[key]
+
+        started = time.perf_counter()
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        timings['elapsed'] = time.perf_counter() - started
+        return timings
+
+    def handle(self, *args, **options):
+        if not options['url']:
+            raise CommandError("Indiquez --url ou DATABASE_URL (PostgreSQL : le pool n'existe pas pour SQLite)")
+        base = dj_database_url.parse(options['url'], conn_max_age=0)
+        if base['ENGINE'] != 'django.db.backends.postgresql':
+            raise CommandError("Le pool de connexions Django n'est disponible que pour PostgreSQL")
+
+        pool_options = dict(settings.DATABASES['default'].get('OPTIONS', {}).get('pool') or {
+            'min_size': settings.DB_POOL_MIN_SIZE,
+            'max_size': settings.DB_POOL_MAX_SIZE,
+            'max_lifetime': settings.DB_POOL_MAX_LIFETIME,
+            'timeout': settings.DB_POOL_TIMEOUT,
+        })
+        pool_options['max_size'] = max(pool_options.get('max_size', 0), options['threads'])
+        configs = {
+            'sans pool': {**base, 'OPTIONS': {}},
+            'pool': {**base, 'OPTIONS': {'pool': pool_options}},
+        }
+
+        self.stdout.write(f"{options['threads']} threads x {options['requests']} requêtes\n")
+        self.stdout.write(
+            f"{'configuration':<12} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}"
+            f" {'connexion p50':>14} {'connexion p99':>14}"
+        )
+        for name, db in configs.items():
+            alias = f"bench_{name.replace(' ', '_')}"
+            connections.settings[alias] = {**connections.settings['default'], **db}
+            if options['migrate'] and name == 'sans pool':
+                call_command('migrate', database=alias, verbosity=0)
+            self._run(alias, options['threads'], 10)  # échauffement (ouverture du pool)
+            timings = self._run(alias, options['threads'], options['requests'])
+            if name == 'pool':
+                connections[alias].close_pool()
+            self.stdout.write(
+                f"{name:<12} {len(timings['total']) / timings['elapsed']:>8.0f}"
+                f" {_percentile(timings['total'], 0.5):>8.2f} {_percentile(timings['total'], 0.99):>8.2f}"
+                f" {_percentile(timings['connect'], 0.5):>14.2f} {_percentile(timings['connect'], 0.99):>14.2f}"
+            )
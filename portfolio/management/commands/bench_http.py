@@ -0,0 +1,80 @@
+# portfolio/management/commands/bench_http.py
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio import loadbench
+
+
+class Command(BaseCommand):
+    help = "Banc de charge HTTP de toutes les routes publiques sous gunicorn + uvicorn"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(loadbench.SCALES), default='small', help="Volume de données générées")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--reseed', action='store_true', help="Régénérer la base même si elle existe")
+        parser.add_argument('--database', help="Utiliser une copie de cette base SQLite au lieu de données générées")
+        parser.add_argument('--requests', type=int, default=200, help="Requêtes mesurées par route")
+        parser.add_argument('--warmup', type=int, default=20, help="Requêtes d'échauffement par route")
+        parser.add_argument('--concurrency', type=int, default=8, help="Connexions simultanées")
+        parser.add_argument('--workers', type=int, default=4, help="Workers gunicorn (WEB_CONCURRENCY)")
+        parser.add_argument('--routes', nargs='*', help="Limiter aux routes nommées")
+        parser.add_argument('--output', help="Fichier JSON de résultats (défaut : bench/results/<date>-<commit>.json)")
+        parser.add_argument('--baseline', default=str(Path(settings.BASE_DIR) / 'bench' / 'baseline.json'))
+        parser.add_argument('--save-baseline', action='store_true', help="Enregistrer ces résultats comme référence")
+        parser.add_argument('--threshold', type=float, default=0.2, help="Hausse tolérée du p95 (0.2 = +20 %%)")
+        parser.add_argument('--fail-on-regression', action='store_true', help="Code de sortie non nul en cas de régression")
+
+    def handle(self, *args, **options):
+        available = loadbench.route_names()
+        for name in available:
+            if name not in loadbench.EXCLUDED_ROUTES and not hasattr(loadbench.Scenarios, name):
+                self.stderr.write(self.style.WARNING(f"Route sans scénario de charge : {name}"))
+        routes = [n for n in available if hasattr(loadbench.Scenarios, n) and n not in loadbench.EXCLUDED_ROUTES]
+        if options['routes']:
+            unknown = set(options['routes']) - set(routes)
+            if unknown:
+                raise CommandError(f"Routes inconnues : {', '.join(sorted(unknown))}")
+            routes = [n for n in routes if n in options['routes']]
+
+        db_path = loadbench.prepare_database(
+            options['scale'], options['seed'], reseed=options['reseed'],
+            source=options['database'], stdout=self.stdout,
+        )
+        report = loadbench.run(
+            db_path, routes,
+            requests=options['requests'], concurrency=options['concurrency'],
+            workers=options['workers'], warmup=options['warmup'], seed=options['seed'],
+            stdout=self.stdout,
+        )
+        report['meta']['scale'] = options['scale'] if not options['database'] else None
+
+        output = Path(options['output'] or Path(settings.BASE_DIR) / 'bench' / 'results' / (
+            f"{report['meta']['date'].replace(':', '')}-{report['meta']['commit'] or 'local'}.json"
+        ))
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+        self.stdout.write(f"Résultats : {output}")
+
+        baseline_path = Path(options['baseline'])
+        if options['save_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f"Référence enregistrée : {baseline_path}"))
+            return
+        if not baseline_path.exists():
+            return
+
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+        rows = loadbench.compare(report, baseline, threshold=options['threshold'])
+        self.stdout.write(f"\nComparaison avec {baseline_path.name} (commit {baseline['meta'].get('commit')}) :")
+        for row in rows:
+            flag = self.style.ERROR('RÉGRESSION') if row['regression'] else 'ok'
+            self.stdout.write(
+                f"{row['route']:<24} p95 {row['baseline_p95_ms']:>8.2f} -> {row['p95_ms']:>8.2f} ms "
+                f"(x{row['ratio']:.2f}) {flag}"
+            )
+        if options['fail_on_regression'] and any(row['regression'] for row in rows):
+            raise CommandError("Régression de performance détectée")
@@ -0,0 +1,181 @@
+# portfolio/management/commands/bench_sqlite.py
+import multiprocessing
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.db.utils import OperationalError
+
+from portfolio.models import ContactMessage, Newsletter, Project
+
+# Connexion de la vérification des migrations de la base copiée
+ALIAS = 'bench_sqlite'
+
+# Nom -> (journal, pragmas appliqués, moteur)
+CONFIGS = {
+    'defaut': ('DELETE', {}, 'django.db.backends.sqlite3'),
+    'wal': ('WAL', None, 'django.db.backends.sqlite3'),
+    'wal+ecrivain': ('WAL', None, 'portfolio.sqlite'),
+}
+
+
+def _percentile(values, q):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def _read(i):
+    # Page de listing : une page de projets et le total
+    list(Project.objects.order_by('ordre_affichage')[(i % 50) * 9:(i % 50) * 9 + 9])
+    Project.objects.count()
+
+
+def _write(i, pid):
+    if i % 2:
+        # Formulaire de contact : un INSERT en autocommit
+        ContactMessage.objects.create(
+            nom='Bench', email=f'bench{pid}-{i}@exemple.cg', sujet='Bench', message='x' * 200,
+        )
+    else:
+        # Inscription newsletter : lecture puis écriture dans une transaction
+        with transaction.atomic():
+            email = f'bench{pid}-{i}@exemple.cg'
+            if not Newsletter.objects.filter(email=email).exists():
+                Newsletter.objects.create(email=email)
+
+
+def _pending_migrations(db_settings):
+    """Migrations non appliquées sur la base ``db_settings``"""
+    connections.settings[ALIAS] = db_settings
+    try:
+        executor = MigrationExecutor(connections[ALIAS])
+        return executor.migration_plan(executor.loader.graph.leaf_nodes())
+    finally:
+        connections[ALIAS].close()
+        del connections[ALIAS]
+
+
+def _worker(db_settings, pragmas, threads, duration, write_ratio, results):
+    """Processus « worker gunicorn » : ``threads`` threads pendant ``duration`` s"""
+    settings.SQLITE_PRAGMAS = pragmas
+    # Processus fils : ``default`` pointe sur la copie, signaux compris
+    # (compteurs du tableau de bord), sur la même connexion que l'écriture
+    connections.settings[DEFAULT_DB_ALIAS] = db_settings
+    pid = multiprocessing.current_process().pid
+    out = {'reads': [], 'writes': [], 'errors': 0, 'fatal': None}
+    lock = threading.Lock()
+    stop = threading.Event()
+    deadline = time.monotonic() + duration
+
+    def run(thread):
+        local = {'reads': [], 'writes': [], 'errors': 0}
+        i = thread * 10 ** 6
+        every = max(1, round(1 / write_ratio)) if write_ratio else 0
+        while time.monotonic() < deadline and not stop.is_set():
+            i += 1
+            kind = 'writes' if every and i % every == 0 else 'reads'
+            start = time.perf_counter()
+            try:
+                _write(i, pid) if kind == 'writes' else _read(i)
+            except OperationalError as exc:
+                if 'locked' not in str(exc):
+                    # Schéma absent, disque plein... : le banc n'a plus de sens
+                    with lock:
+                        out['fatal'] = out['fatal'] or f'{type(exc).__name__}: {exc}'
+                    stop.set()
+                    break
+                local['errors'] += 1
+                continue
+            local[kind].append((time.perf_counter() - start) * 1000)
+        connections[DEFAULT_DB_ALIAS].close()
+        with lock:
+            for key in ('reads', 'writes'):
+                out[key] += local[key]
+            out['errors'] += local['errors']
+
+    pool = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    results.put(out)
+
+
+class Command(BaseCommand):
+    help = "Débit lectures/écritures concurrentes sur SQLite : défaut, WAL + pragmas, WAL + écrivain unique"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=4, help="Processus, comme WEB_CONCURRENCY")
+        parser.add_argument('--threads', type=int, default=4, help="Threads par processus")
+        parser.add_argument('--duration', type=float, default=10, help="Secondes par configuration")
+        parser.add_argument('--write-ratio', type=float, default=0.1, help="Part des opérations qui écrivent")
+        parser.add_argument('--database', default=str(settings.DATABASES['default']['NAME']), help="Base copiée pour le test")
+        parser.add_argument('--configs', nargs='*', choices=list(CONFIGS), default=list(CONFIGS))
+
+    def handle(self, *args, **options):
+        context = multiprocessing.get_context('fork')
+        pending = _pending_migrations({**connections.settings['default'], 'NAME': options['database']})
+        if pending:
+            raise CommandError(
+                f"{len(pending)} migration(s) non appliquée(s) sur {options['database']} : "
+                "lancez `python manage.py migrate` avant le banc."
+            )
+        connections.close_all()
+        self.stdout.write(
+            f"{options['processes']} processus x {options['threads']} threads, "
+            f"{options['write_ratio']:.0%} d'écritures, {options['duration']:.0f} s par configuration\n"
+        )
+        self.stdout.write(
+            f"{'configuration':<14} {'lect./s':>9} {'écr./s':>8} {'p50 lect.':>10} {'p99 lect.':>10}"
+            f" {'p50 écr.':>9} {'p99 écr.':>9} {'erreurs':>8}"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in options['configs']:
+                journal, pragmas, engine = CONFIGS[name]
+                db_path = Path(tmp) / f'{name}.sqlite3'
+                shutil.copyfile(options['database'], db_path)
+                with sqlite3.connect(db_path) as conn:
+                    conn.execute(f'PRAGMA journal_mode={journal}')
+
+                db_settings = {
+                    **connections.settings['default'],
+                    'ENGINE': engine,
+                    'NAME': str(db_path),
+                    'OPTIONS': {} if journal == 'DELETE' else settings.DATABASES['default'].get('OPTIONS', {}),
+                }
+                results = context.Queue()
+                procs = [
+                    context.Process(target=_worker, args=(
+                        db_settings, settings.SQLITE_PRAGMAS if pragmas is None else pragmas,
+                        options['threads'], options['duration'], options['write_ratio'], results,
+                    ))
+                    for _ in range(options['processes'])
+                ]
+                for proc in procs:
+                    proc.start()
+                outs = [results.get() for _ in procs]
+                for proc in procs:
+                    proc.join()
+
+                reads = [v for out in outs for v in out['reads']]
+                writes = [v for out in outs for v in out['writes']]
+                fatal = next((out['fatal'] for out in outs if out['fatal']), None)
+                if fatal:
+                    raise CommandError(f"{name} : {fatal}")
+                errors = sum(out['errors'] for out in outs)
+                duration = options['duration']
+                self.stdout.write(
+                    f"{name:<14} {len(reads) / duration:>9.0f} {len(writes) / duration:>8.0f}"
+                    f" {_percentile(reads, 0.5):>10.2f} {_percentile(reads, 0.99):>10.2f}"
+                    f" {_percentile(writes, 0.5):>9.2f} {_percentile(writes, 0.99):>9.2f} {errors:>8}"
+                )
+        self.stdout.write("\nLatences en ms ; erreurs = « database is locked » après busy_timeout.")
@@ -0,0 +1,26 @@
+# portfolio/management/commands/cache_stats.py
+from django.core.management.base import BaseCommand
+
+from portfolio.caching import fragment_stats, stats
+from portfolio.templatetags.portfolio_tags import FRAGMENTS
+
+
+class Command(BaseCommand):
+    help = "Affiche les compteurs du cache des pages et des fragments (tous workers confondus)"
+
+    def handle(self, *args, **options):
+        counters = stats()
+        total = sum(counters.values())
+        for event, count in counters.items():
+            ratio = f"{count / total:.1%}" if total else "-"
+            self.stdout.write(f"{event:<6} {count:>10} {ratio:>8}")
+
+        self.stdout.write('')
+        self.stdout.write(f"{'fragment':<10} {'hits':>8} {'misses':>8} {'hit ms':>8} {'rendu ms':>9}")
+        for name, values in fragment_stats(list(FRAGMENTS)).items():
+            # Durée moyenne d'un hit (lecture du cache) et d'un miss (rendu complet)
+            hit_ms = values['hit_us'] / values['hit'] / 1000 if values['hit'] else 0
+            miss_ms = values['miss_us'] / values['miss'] / 1000 if values['miss'] else 0
+            self.stdout.write(
+                f"{name:<10} {values['hit']:>8} {values['miss']:>8} {hit_ms:>8.2f} {miss_ms:>9.2f}"
+            )
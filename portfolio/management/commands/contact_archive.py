@@ -0,0 +1,52 @@
+# portfolio/management/commands/contact_archive.py
+import json
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from portfolio.archive import ArchiveIndex, read_archived, restore_messages
+
+
+def _parse_date(value):
+    try:
+        return timezone.make_aware(datetime.strptime(value, '%Y-%m-%d'))
+    except ValueError:
+        raise CommandError(f"Date invalide : {value} (format attendu AAAA-MM-JJ)")
+
+
+class Command(BaseCommand):
+    help = "Recherche ou restaure des messages de contact archivés"
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['search', 'restore'])
+        parser.add_argument('--id', type=int, action='append', dest='ids', help="Id du message (répétable)")
+        parser.add_argument('--email', help="Adresse email de l'expéditeur")
+        parser.add_argument('--from', dest='date_from', help="Date d'envoi minimale (AAAA-MM-JJ)")
+        parser.add_argument('--to', dest='date_to', help="Date d'envoi maximale exclue (AAAA-MM-JJ)")
+        parser.add_argument('--limit', type=int, default=100)
+
+    def handle(self, *args, **options):
+        if options['action'] == 'restore' and not any(
+            options[key] for key in ('ids', 'email', 'date_from', 'date_to')
+        ):
+            raise CommandError("La restauration exige au moins un critère (--id, --email, --from, --to).")
+
+        with ArchiveIndex() as index:
+            entries = index.find(
+                ids=options['ids'],
+                email=options['email'],
+                date_from=_parse_date(options['date_from']) if options['date_from'] else None,
+                date_to=_parse_date(options['date_to']) if options['date_to'] else None,
+                limit=options['limit'],
+            )
+        records = read_archived(entries)
+
+        if options['action'] == 'search':
+            for record in records:
+                self.stdout.write(json.dumps(record, ensure_ascii=False))
+            self.stderr.write(f"{len(records)} messages trouvés.")
+            return
+
+        restored = restore_messages(records)
+        self.stdout.write(self.style.SUCCESS(f"{restored} messages restaurés."))
@@ -0,0 +1,31 @@
+# portfolio/management/commands/export_static.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from portfolio import static_site
+
+
+class Command(BaseCommand):
+    help = "Exporte les pages publiques et les API en fichiers servis par StaticSiteMiddleware"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--incremental', action='store_true', help="Ne régénérer que les pages touchées depuis le dernier export")
+        parser.add_argument('--root', help="Répertoire de sortie (défaut : STATIC_SITE_ROOT)")
+        parser.add_argument('--url', help="URL publique du site, pour les liens absolus (défaut : STATIC_SITE_URL)")
+
+    def handle(self, *args, **options):
+        result = static_site.export(
+            root=options['root'], base_url=options['url'],
+            incremental=options['incremental'], stdout=self.stderr,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['rendered']} pages rendues, {result['removed']} supprimées"
+            f" en {result['seconds']:.1f} s -> {options['root'] or settings.STATIC_SITE_ROOT}"
+        ))
+        if result['failed']:
+            self.stdout.write(self.style.WARNING(
+                f"{len(result['failed'])} pages laissées dynamiques (erreur de rendu) : "
+                + ', '.join(result['failed'][:10]) + (' ...' if len(result['failed']) > 10 else '')
+            ))
+        if not settings.STATIC_SITE_ENABLED:
+            self.stdout.write("STATIC_SITE_ENABLED est faux : les pages exportées ne sont pas servies.")
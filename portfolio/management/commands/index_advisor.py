@@ -0,0 +1,59 @@
+# portfolio/management/commands/index_advisor.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from portfolio import index_advisor
+
+
+class Command(BaseCommand):
+    help = (
+        "Exécute chaque vue (et les listes de l'admin), passe leurs requêtes à EXPLAIN "
+        "et propose les index composites qui évitent parcours complets et tris temporaires"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-rows', type=int, default=500, help="Ignorer les tables plus petites (un index n'y gagne rien)")
+        parser.add_argument('--no-admin', action='store_true', help="Ne pas analyser les listes de l'admin")
+        parser.add_argument('--plans', action='store_true', help="Afficher le plan de chaque requête signalée")
+
+    def handle(self, *args, **options):
+        host = next((h for h in settings.ALLOWED_HOSTS if h not in ('*', '') and not h.startswith('.')), 'localhost')
+        queries, missing = index_advisor.capture(host, include_admin=not options['no_admin'])
+        for route in missing:
+            self.stdout.write(self.style.WARNING(f"{route} : pas de requête d'exemple, route non analysée"))
+
+        by_route = {}
+        for query in queries:
+            by_route.setdefault(query.route, []).append(query)
+        self.stdout.write(f"\n{'route':<28} {'requêtes':>8} {'signalées':>9}")
+        for route, route_queries in by_route.items():
+            flagged = [q for q in route_queries if q.flags]
+            self.stdout.write(f"{route:<28} {len(route_queries):>8} {len(flagged):>9}")
+            seen = set()
+            for query in flagged:
+                if query.sql in seen:
+                    continue
+                seen.add(query.sql)
+                self.stdout.write(f"    {', '.join(sorted(set(query.flags)))} : {query.sql[:160]}")
+                if options['plans']:
+                    for line in query.plan:
+                        self.stdout.write(f"        {line}")
+
+        recommended = index_advisor.recommendations(queries, options['min_rows'])
+        if not recommended:
+            self.stdout.write(self.style.SUCCESS("\nAucun index manquant."))
+            return
+        self.stdout.write("\nIndex proposés :")
+        for rec in recommended:
+            status = '' if rec['retenu'] else f" (ignoré : {rec['rows']} lignes < --min-rows)"
+            self.stdout.write(
+                f"  {rec['model'].__name__:<16} {', '.join(rec['fields']):<40} {rec['rows']:>7} lignes"
+                f"  [{', '.join(rec['routes'])}]{status}"
+            )
+        retained = [rec for rec in recommended if rec['retenu']]
+        if retained:
+            self.stdout.write("\nÀ ajouter dans Meta.indexes puis `makemigrations` :")
+        for rec in retained:
+            self.stdout.write(
+                f"  {rec['model'].__name__}: models.Index(fields={rec['fields']!r}, name={rec['name']!r}),"
+            )
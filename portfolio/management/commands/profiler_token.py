@@ -0,0 +1,14 @@
+# portfolio/management/commands/profiler_token.py
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from portfolio.request_profiler import make_token
+
+
+class Command(BaseCommand):
+    help = "Génère un jeton signé pour profiler une requête via l'en-tête X-Profile-Request"
+
+    def handle(self, *args, **options):
+        hours = settings.REQUEST_PROFILER_TOKEN_MAX_AGE // 3600
+        self.stdout.write(f"X-Profile-Request: {make_token()}")
+        self.stderr.write(f"Valable {hours} h, par exemple : curl -H 'X-Profile-Request: ...' https://...")
@@ -0,0 +1,17 @@
+# portfolio/management/commands/rebuild_dashboard.py
+from django.core.management.base import BaseCommand
+
+from portfolio import dashboard
+
+
+class Command(BaseCommand):
+    help = "Recompte les compteurs du tableau de bord de l'admin depuis les tables (après un import ou une suppression en SQL)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help="Jours de statistiques à recalculer (défaut : DASHBOARD_DAYS)")
+
+    def handle(self, *args, **options):
+        values = dashboard.rebuild(options['days'])
+        for name, value in values.items():
+            self.stdout.write(f"  {name:<32} {value:>9}")
+        self.stdout.write(self.style.SUCCESS("Tableau de bord recalculé"))
@@ -0,0 +1,18 @@
+# portfolio/management/commands/refresh_popularity.py
+from django.core.management.base import BaseCommand
+
+from portfolio import page_views
+from portfolio.models import Project
+
+
+class Command(BaseCommand):
+    help = "Recalcule tout de suite le classement « populaires » des projets (sinon fait par les workers)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10, help="Projets du haut du classement à afficher")
+
+    def handle(self, *args, **options):
+        changed = page_views.refresh_ranks()
+        self.stdout.write(self.style.SUCCESS(f"{changed} rangs modifiés"))
+        for project in Project.objects.order_by('rang_popularite')[:options['top']]:
+            self.stdout.write(f"  {project.rang_popularite:>4}  {project.vues:>7} vues  {project.titre}")
@@ -0,0 +1,26 @@
+# portfolio/management/commands/render_markdown.py
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from portfolio import richtext
+from portfolio.caching import bump_content_version, bump_model_version
+
+
+class Command(BaseCommand):
+    help = "Rend à nouveau le Markdown des projets, de la galerie et des actualités (après un changement de richtext.CONFIG)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Tout rendre, pas seulement les lignes périmées")
+        parser.add_argument('--batch-size', type=int, default=500, help="Lignes écrites par requête")
+
+    def handle(self, *args, **options):
+        models = [apps.get_model(label) for label in richtext.FIELDS]
+        done = richtext.rerender(models, everything=options['all'], batch_size=options['batch_size'])
+        for label, count in done.items():
+            self.stdout.write(f"  {label:<28} {count:>7}")
+            if count:
+                bump_model_version(label)
+        if any(done.values()):
+            # bulk_update ne déclenche pas post_save : les pages en cache sont périmées ici
+            bump_content_version()
+        self.stdout.write(self.style.SUCCESS(f"Rendu {richtext.VERSION} : {sum(done.values())} lignes"))
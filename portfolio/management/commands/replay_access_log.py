@@ -0,0 +1,89 @@
+# portfolio/management/commands/replay_access_log.py
+import json
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio import access_log, loadbench
+
+
+class Command(BaseCommand):
+    help = "Rejoue un journal d'accès contre une instance locale et compare les latences par route"
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*', help="Journaux à rejouer (défaut : logs/access.log et ses archives)")
+        parser.add_argument('--url', help="Instance cible (défaut : gunicorn lancé sur une copie de la base)")
+        parser.add_argument('--database', help="Base SQLite copiée pour l'instance locale (défaut : base courante)")
+        parser.add_argument('--workers', type=int, default=4, help="Workers gunicorn de l'instance locale")
+        parser.add_argument('--speed', type=float, default=1.0, help="1 = rythme d'origine, 10 = dix fois plus vite, 0 = sans attente")
+        parser.add_argument('--concurrency', type=int, default=16, help="Requêtes simultanées au maximum")
+        parser.add_argument('--limit', type=int, help="Ne rejouer que les N premières requêtes")
+        parser.add_argument('--routes', nargs='*', help="Limiter aux routes nommées")
+        parser.add_argument('--output', help="Écrire le résumé JSON dans ce fichier")
+
+    def handle(self, *args, **options):
+        paths = options['files'] or self._default_files()
+        if not paths:
+            raise CommandError("Aucun journal d'accès trouvé (ACCESS_LOG_ENABLED ?)")
+        entries = access_log.read_entries(paths)
+        if options['routes']:
+            entries = [e for e in entries if e.get('r') in options['routes']]
+        skipped = sum(1 for e in entries if e['m'] not in access_log.REPLAYABLE_METHODS)
+        entries = [e for e in entries if e['m'] in access_log.REPLAYABLE_METHODS][:options['limit']]
+        if not entries:
+            raise CommandError("Aucune requête rejouable dans ces journaux")
+
+        duration = entries[-1]['t'] - entries[0]['t']
+        self.stdout.write(
+            f"{len(entries)} requêtes sur {duration:.0f} s enregistrées"
+            f" ({skipped} POST/PUT/DELETE ignorées), vitesse x{options['speed'] or '∞'}"
+        )
+        progress = lambda n: self.stdout.write(f"  {n}/{len(entries)}")
+
+        if options['url']:
+            results = access_log.replay(entries, options['url'], options['speed'], options['concurrency'], progress)
+        else:
+            source = options['database'] or settings.DATABASES['default']['NAME']
+            db_path = loadbench.prepare_database(None, None, source=source)
+            with tempfile.TemporaryDirectory() as workdir:
+                loadbench.write_overlay(workdir, db_path)
+                with loadbench.Server(workdir, workers=options['workers']) as server:
+                    url = f'http://127.0.0.1:{server.port}'
+                    results = access_log.replay(entries, url, options['speed'], options['concurrency'], progress)
+
+        summary = access_log.summarize(results)
+        self.stdout.write(
+            f"\n{'route':<28} {'req':>6} {'err':>4} {'statut≠':>7}"
+            f" {'p50 enr.':>9} {'p50 rejeu':>9} {'Δ p50':>8} {'p95 enr.':>9} {'p95 rejeu':>9}"
+        )
+        for route, row in summary.items():
+            delta = row['delta_p50_ms']
+            delta_text = f"{delta:+8.2f}" if delta is not None else f"{'-':>8}"
+            if delta is not None and row['recorded_p50_ms'] and delta > row['recorded_p50_ms']:
+                delta_text = self.style.WARNING(delta_text)
+            self.stdout.write(
+                f"{route:<28} {row['requests']:>6} {row['errors']:>4} {row['status_changed']:>7}"
+                f" {row['recorded_p50_ms'] or 0:>9.2f} {row['replayed_p50_ms'] or 0:>9.2f} {delta_text}"
+                f" {row['recorded_p95_ms'] or 0:>9.2f} {row['replayed_p95_ms'] or 0:>9.2f}"
+            )
+
+        if options['output']:
+            output = Path(options['output'])
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_text(json.dumps({
+                'commit': loadbench.git_commit(),
+                'files': [str(p) for p in paths],
+                'speed': options['speed'],
+                'routes': summary,
+            }, indent=2, ensure_ascii=False), encoding='utf-8')
+            self.stdout.write(f"Résumé : {output}")
+
+    @staticmethod
+    def _default_files():
+        directory = Path(settings.BASE_DIR) / 'logs'
+        return sorted(
+            (p for p in directory.glob('access.log*') if not p.name.endswith('.lock')),
+            key=lambda p: p.stat().st_mtime,
+        )
@@ -0,0 +1,22 @@
+# portfolio/management/commands/rollup_clicks.py
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+
+from portfolio import outbound
+from portfolio.models import ClicsJournaliers
+
+
+class Command(BaseCommand):
+    help = "Agrège par jour les clics sortants des jours terminés (sinon fait par les workers toutes les heures)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help="Jours récents à résumer")
+
+    def handle(self, *args, **options):
+        total = outbound.rollup()
+        self.stdout.write(self.style.SUCCESS(f"{total} clics agrégés"))
+        days = (
+            ClicsJournaliers.objects.values('jour').annotate(clics=Sum('clics')).order_by('-jour')[:options['days']]
+        )
+        for row in days:
+            self.stdout.write(f"  {row['jour']:%d/%m/%Y}  {row['clics']:>7} clics")
@@ -0,0 +1,54 @@
+# portfolio/management/commands/seed_data.py
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from portfolio.synthetic import DEFAULT_COUNTS, seed
+
+
+class Command(BaseCommand):
+    help = "Remplit la base avec des données synthétiques déterministes pour les tests de charge"
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULT_COUNTS.items():
+            parser.add_argument(f'--{name}', type=int, default=default, help=f"Nombre de lignes (défaut : {default})")
+        parser.add_argument('--seed', type=int, default=42, help="Graine du générateur")
+        parser.add_argument(
+            '--now', help="Date de référence des dates générées, ISO 8601 (défaut : 2025-01-01 UTC)"
+        )
+        parser.add_argument('--batch-size', type=int, default=5000, help="Taille des lots bulk_create")
+        parser.add_argument('--images', type=int, default=24, help="Images de substitution générées par type")
+        parser.add_argument(
+            '--clear', action='store_true',
+            help="Vider d'abord les tables de contenu, abonnés et messages (données réelles comprises)"
+        )
+        parser.add_argument('--force', action='store_true', help="Autoriser l'exécution avec DEBUG=False")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError("DEBUG=False : base de production ? Relancer avec --force pour confirmer.")
+        counts = {name: options[name] for name in DEFAULT_COUNTS}
+        now = None
+        if options['now']:
+            try:
+                now = datetime.fromisoformat(options['now'])
+            except ValueError:
+                raise CommandError(f"--now : date ISO 8601 attendue, reçu {options['now']!r}")
+            if timezone.is_naive(now):
+                now = timezone.make_aware(now)
+        start = time.perf_counter()
+        seed(
+            counts,
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            images=options['images'],
+            clear=options['clear'],
+            stdout=self.stdout,
+            now=now,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{sum(counts.values())} lignes générées en {time.perf_counter() - start:.1f} s."
+        ))
@@ -0,0 +1,194 @@
+# portfolio/metrics.py
+"""
+Métriques au format texte Prometheus, agrégées sur tous les workers.
+
+Chaque processus cumule ses compteurs en mémoire et les ajoute toutes les
+``METRICS_FLUSH_INTERVAL`` secondes à un fichier SQLite partagé
+(``METRICS_LOCATION``), comme les statistiques du cache. ``/metrics`` lit
+ce fichier : les valeurs sont donc la somme de tous les workers, à
+l'intervalle de flush près, sans service externe.
+
+Les histogrammes sont stockés déjà cumulés (``_bucket{le=...}``, ``_sum``,
+``_count``) pour que l'agrégation reste une simple addition.
+"""
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (name, labels)
+) WITHOUT ROWID;
+"""
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Famille -> (type, aide)
+FAMILIES = {
+    'portfolio_http_requests_total': ('counter', "Requêtes HTTP par route, méthode et statut"),
+    'portfolio_http_request_duration_seconds': ('histogram', "Durée de traitement des requêtes"),
+    'portfolio_http_response_size_bytes': ('histogram', "Taille des réponses (après compression)"),
+    'portfolio_db_queries': ('histogram', "Requêtes SQL exécutées par requête HTTP"),
+    'portfolio_page_cache_events_total': ('counter', "Événements du cache des pages"),
+    'portfolio_fragment_cache_events_total': ('counter', "Événements du cache des fragments"),
+}
+
+_pending = defaultdict(float)
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+_pid = os.getpid()
+_local = threading.local()
+
+
+def _labels(**labels):
+    """Étiquettes sérialisées au format Prometheus : ``route="x",status="200"``"""
+    return ','.join(
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for k, v in sorted(labels.items())
+    )
+
+
+def _add(name, labels, value):
+    global _pid
+    with _lock:
+        if os.getpid() != _pid:
+            # Valeurs héritées du processus parent : déjà comptées par lui
+            _pending.clear()
+            _pid = os.getpid()
+        _pending[name, labels] += value
+
+
+def inc(name, value=1, **labels):
+    _add(name, _labels(**labels), value)
+
+
+def observe(name, value, buckets, **labels):
+    for bound in buckets:
+        if value <= bound:
+            _add(f'{name}_bucket', _labels(**labels, le=bound), 1)
+    _add(f'{name}_bucket', _labels(**labels, le='+Inf'), 1)
+    _add(f'{name}_sum', _labels(**labels), value)
+    _add(f'{name}_count', _labels(**labels), 1)
+
+
+# Stockage partagé -------------------------------------------------------------
+
+def _connection():
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.pid != os.getpid():
+        path = str(getattr(settings, 'METRICS_LOCATION', settings.BASE_DIR / 'cache' / 'metrics.sqlite3'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+        _local.pid = os.getpid()
+    return conn
+
+
+def flush(force=False):
+    """Ajoute les valeurs en attente au fichier partagé : dans un thread, ou tout de suite avec ``force``"""
+    global _last_flush
+    with _lock:
+        if not force and time.monotonic() - _last_flush < getattr(settings, 'METRICS_FLUSH_INTERVAL', 5):
+            return
+        pending = [(name, labels, value) for (name, labels), value in _pending.items()]
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return
+    if force:
+        _write(pending)
+    else:
+        # Hors du thread de la requête : un fichier verrouillé ne retarde ni ne fait échouer la réponse
+        threading.Thread(target=_write, args=(pending,), name='metrics-flush', daemon=True).start()
+
+
+def _write(pending):
+    try:
+        conn = _connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(
+                'INSERT INTO samples (name, labels, value) VALUES (?, ?, ?)'
+                ' ON CONFLICT(name, labels) DO UPDATE SET value = value + excluded.value',
+                pending,
+            )
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+    except Exception:
+        logger.exception("Écriture des métriques impossible (%d valeurs)", len(pending))
+        # Rien n'a été ajouté : les valeurs repartent avec le flush suivant
+        for name, labels, value in pending:
+            _add(name, labels, value)
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            conn = getattr(_local, 'conn', None)
+            if conn is not None:
+                conn.close()
+                _local.conn = None
+
+
+atexit.register(flush, force=True)
+
+
+def _cache_samples():
+    """Compteurs du cache (déjà partagés entre workers via le cache lui-même)"""
+    from .caching import fragment_stats, stats
+    from .templatetags.portfolio_tags import FRAGMENTS
+
+    samples = [
+        ('portfolio_page_cache_events_total', _labels(event=event), count)
+        for event, count in stats().items()
+    ]
+    for name, values in fragment_stats(list(FRAGMENTS)).items():
+        for event in ('hit', 'miss'):
+            samples.append(('portfolio_fragment_cache_events_total', _labels(fragment=name, event=event), values[event]))
+    return samples
+
+
+def _sort_key(row):
+    name, labels, _ = row
+    parts = labels.split(',')
+    le = next((p[len('le="'):-1] for p in parts if p.startswith('le="')), None)
+    others = ','.join(p for p in parts if not p.startswith('le="'))
+    return (others, name.endswith('_bucket') is False, float(le) if le is not None else 0, name)
+
+
+def render():
+    """Exposition texte Prometheus (version 0.0.4)"""
+    flush(force=True)
+    rows = _connection().execute('SELECT name, labels, value FROM samples ORDER BY name, labels').fetchall()
+    rows += _cache_samples()
+
+    by_family = defaultdict(list)
+    for name, labels, value in rows:
+        family = next((f for f in FAMILIES if name == f or name.startswith(f + '_')), name)
+        by_family[family].append((name, labels, value))
+
+    lines = []
+    for family, samples in sorted(by_family.items()):
+        samples.sort(key=_sort_key)
+        kind, help_text = FAMILIES.get(family, ('untyped', ''))
+        lines.append(f'# HELP {family} {help_text}')
+        lines.append(f'# TYPE {family} {kind}')
+        for name, labels, value in samples:
+            value = int(value) if float(value).is_integer() else value
+            lines.append(f'{name}{{{labels}}} {value}' if labels else f'{name} {value}')
+    return '\n'.join(lines) + '\n'
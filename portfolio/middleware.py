@@ -0,0 +1,383 @@
+# portfolio/middleware.py
+import logging
+import re
+import time
+import zlib
+from contextlib import ExitStack
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.urls import resolve, reverse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from . import access_log, metrics, page_views, request_profiler, routers, static_site, template_profiler
+
+try:
+    import brotli
+except ImportError:  # Brotli est dans requirements.txt, gzip reste disponible sans
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Balises dont le contenu ne doit jamais être réécrit
+PROTECTED_TAGS_RE = re.compile(
+    r'(<(pre|script|textarea|style)\b.*?</\2\s*>)', re.IGNORECASE | re.DOTALL
+)
+# Commentaires HTML, hors commentaires conditionnels (<!--[if ...]>)
+HTML_COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+WHITESPACE_RE = re.compile(r'\s{2,}')
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript',
+    'application/xml', 'application/xhtml+xml', 'image/svg+xml',
+)
+
+
+def _collapse(match):
+    return '\n' if '\n' in match.group(0) else ' '
+
+
+def minify_html(html):
+    """
+    Supprime commentaires et indentation sans changer le rendu : les suites
+    d'espaces sont réduites à un seul caractère (le navigateur les fusionne
+    de toute façon) et ``<pre>``, ``<script>``, ``<textarea>`` et ``<style>``
+    sont laissés intacts.
+    """
+    parts = PROTECTED_TAGS_RE.split(html)
+    out = []
+    # split() intercale : texte, bloc protégé, nom de balise, texte, ...
+    for i in range(0, len(parts), 3):
+        text = HTML_COMMENT_RE.sub('', parts[i])
+        out.append(WHITESPACE_RE.sub(_collapse, text))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+    return ''.join(out).strip()
+
+
+def parse_accept_encoding(header):
+    """``'br;q=1.0, gzip;q=0.5'`` -> ``{'br': 1.0, 'gzip': 0.5}``"""
+    encodings = {}
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        if not name:
+            continue
+        q = 1.0
+        match = re.search(r'q\s*=\s*([0-9.]+)', params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        encodings[name.strip().lower()] = q
+    return encodings
+
+
+def choose_encoding(header):
+    accepted = parse_accept_encoding(header)
+    candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+    wildcard = accepted.get('*', 0)
+    scored = [(accepted.get(name, wildcard), name) for name in candidates]
+    # À qualité égale on préfère brotli (ordre de ``candidates``)
+    best_q = max((q for q, _ in scored), default=0)
+    if best_q <= 0:
+        return None
+    return next(name for q, name in scored if q == best_q)
+
+
+class Encoder:
+    """Compression incrémentale brotli ou gzip"""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._brotli = brotli.Compressor(
+                mode=brotli.MODE_TEXT,
+                quality=getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5),
+            )
+        else:
+            self._zlib = zlib.compressobj(
+                getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6), zlib.DEFLATED, 31
+            )
+
+    def compress(self, data, flush=False):
+        if self.encoding == 'br':
+            out = self._brotli.process(data)
+            return out + self._brotli.flush() if flush else out
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+    def compress_all(self, data):
+        return self.compress(data) + self.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Minifie le HTML des vues et compresse les réponses dynamiques en brotli
+    ou gzip selon ``Accept-Encoding``.
+
+    À placer juste après WhiteNoise (qui compresse déjà les fichiers
+    statiques) : les réponses déjà encodées, trop petites ou d'un type non
+    textuel sont laissées telles quelles. Les réponses en streaming sont
+    compressées morceau par morceau, avec un flush à chaque morceau pour que
+    le navigateur puisse afficher la page au fil de l'eau.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 860)
+        self.minify = getattr(settings, 'COMPRESSION_MINIFY_HTML', True)
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        if self.minify and not response.streaming and content_type.startswith('text/html'):
+            charset = response.charset or 'utf-8'
+            try:
+                response.content = minify_html(response.content.decode(charset)).encode(charset)
+            except UnicodeDecodeError:
+                pass
+            else:
+                if response.has_header('Content-Length'):
+                    response.headers['Content-Length'] = str(len(response.content))
+
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        encoder = Encoder(encoding)
+        if response.streaming:
+            response.streaming_content = (
+                self._compress_async(response.streaming_content, encoder)
+                if response.is_async
+                else self._compress_stream(response.streaming_content, encoder)
+            )
+            # Taille compressée inconnue avant la fin du flux
+            del response.headers['Content-Length']
+        else:
+            compressed = encoder.compress_all(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # Un ETag fort ne correspond plus au corps encodé (RFC 9110 §8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def _compress_stream(chunks, encoder):
+        for chunk in chunks:
+            data = encoder.compress(chunk, flush=True)
+            if data:
+                yield data
+        yield encoder.finish()
+
+    @staticmethod
+    async def _compress_async(chunks, encoder):
+        async for chunk in chunks:
+            data = encoder.compress(chunk, flush=True)
+            if data:
+                yield data
+        yield encoder.finish()
+
+
+class TemplateProfilerMiddleware:
+    """
+    Profile le rendu des templates de chaque requête (voir
+    ``template_profiler.py``) quand ``TEMPLATE_PROFILER_ENABLED`` est vrai.
+
+    L'arbre est écrit dans les logs, conservé pour ``/debug/templates/`` et
+    résumé dans l'en-tête ``Server-Timing``. Désactivé, le middleware se
+    retire de la chaîne au démarrage.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'TEMPLATE_PROFILER_ENABLED', False):
+            raise MiddlewareNotUsed
+        template_profiler.install()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = template_profiler.start(f'{request.method} {request.get_full_path()}')
+        start = time.perf_counter_ns()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(template_profiler.count_query))
+                response = self.get_response(request)
+        finally:
+            profile = template_profiler.stop(token)
+        profile.root.count = 1
+        profile.root.total_ns = time.perf_counter_ns() - start
+
+        if profile.root.children:
+            data = profile.to_dict()
+            data['date'] = datetime.now().isoformat(timespec='seconds')
+            logger.info(
+                "Profil des templates (%s requêtes vue, %s requêtes templates)\n%s",
+                data['view_queries'], data['template_queries'], template_profiler.format_tree(data),
+            )
+            template_profiler.store(data)
+            response.headers['Server-Timing'] = f"tpl;dur={data['template_ms']}"
+        return response
+
+
+class RequestProfilerMiddleware:
+    """
+    Exécute sous cProfile les requêtes échantillonnées ou signées (voir
+    ``request_profiler.py``). Pour les autres requêtes, le coût se limite à
+    un tirage aléatoire.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not request_profiler.should_profile(request):
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        response, profiler = request_profiler.run(self.get_response, request)
+        if profiler is not None:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            try:
+                name = request_profiler.save(profiler, request, elapsed_ms)
+            except OSError:
+                logger.exception("Impossible d'enregistrer le profil de %s", request.path)
+            else:
+                response.headers['X-Profile-Id'] = name
+                logger.info("Requête profilée : %s %s (%.0f ms) -> %s", request.method, request.path, elapsed_ms, name)
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Mesure chaque requête dynamique pour ``/metrics`` : nombre par route et
+    statut, durée, taille de la réponse et requêtes SQL exécutées.
+
+    La route est le nom de la vue (``portfolio:index``), jamais l'URL, pour
+    garder un nombre d'étiquettes borné.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = [0]
+
+        def count_query(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(count_query))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match else 'unmatched'
+        metrics.inc('portfolio_http_requests_total', route=route, method=request.method, status=response.status_code)
+        metrics.observe('portfolio_http_request_duration_seconds', elapsed, metrics.LATENCY_BUCKETS, route=route)
+        metrics.observe('portfolio_db_queries', queries[0], metrics.QUERY_BUCKETS, route=route)
+        if not response.streaming:
+            metrics.observe('portfolio_http_response_size_bytes', len(response.content), metrics.SIZE_BUCKETS, route=route)
+        metrics.flush()
+        return response
+
+
+class AccessLogMiddleware:
+    """
+    Une ligne compacte par requête dynamique dans ``logs/access.log`` :
+    méthode, chemin, query string, statut, latence et route. Sert de source
+    à ``replay_access_log``. Les fichiers statiques (WhiteNoise) n'y passent pas.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'ACCESS_LOG_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        access_log.log_request(request, response, time.perf_counter() - start)
+        return response
+
+
+class StaticSiteMiddleware:
+    """
+    Sert les pages exportées par ``export_static`` (voir ``static_site.py``)
+    tant que leur contenu n'a pas changé, sans passer par la vue ni la base.
+
+    Placé après ``CsrfViewMiddleware`` : le jeton du visiteur est substitué
+    dans la page et le cookie CSRF posé comme pour une page dynamique.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'STATIC_SITE_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = static_site.serve(request)
+        if response is None:
+            return self.get_response(request)
+        # Route renseignée pour les métriques et le journal d'accès
+        request.resolver_match = resolve(request.path_info)
+        page_views.record_match(request, request.resolver_match)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Ouvre l'état de routage de ``routers.py`` pour chaque requête : lectures
+    sur les réplicas, sauf pour l'admin et pour les visiteurs porteurs du
+    cookie posé après une écriture. Sans réplica, se retire de la chaîne.
+    """
+
+    def __init__(self, get_response):
+        if not routers.replica_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.admin_prefix = reverse('admin:index')
+
+    def __call__(self, request):
+        pinned = (
+            settings.REPLICA_PIN_COOKIE in request.COOKIES
+            or request.path.startswith(self.admin_prefix)
+        )
+        token = routers.start_request(pinned)
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = routers.end_request(token)
+        if wrote:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax', secure=request.is_secure(),
+            )
+        return response
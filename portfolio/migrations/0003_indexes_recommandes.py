@@ -0,0 +1,43 @@
+# Generated by Django 5.2.3 on 2026-10-19 02:55
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0002_contactinfo_sitesettings_sociallink'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='newsletter',
+            name='token_desabonnement',
+            field=models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, verbose_name='Token de désabonnement'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['-date_envoi'], name='contactm_date_e_0921_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['ordre_affichage', '-date_publication'], name='news_ordre_date_p_312c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsletter',
+            index=models.Index(fields=['-date_inscription'], name='newslett_date_i_e213_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['featured', 'ordre_affichage'], name='project_featur_ordre_1ac0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['ordre_affichage', '-created_at'], name='project_ordre_create_87f8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='socialgallery',
+            index=models.Index(fields=['ordre_affichage', '-created_at'], name='socialga_ordre_create_87f8_idx'),
+        ),
+    ]
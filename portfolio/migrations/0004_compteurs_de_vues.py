@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-19 02:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0003_indexes_recommandes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='rang_popularite',
+            field=models.PositiveIntegerField(blank=True, db_index=True, editable=False, null=True, verbose_name='Rang de popularité'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='vues',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Vues'),
+        ),
+        migrations.AddField(
+            model_name='socialgallery',
+            name='vues',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Vues'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.3 on 2026-10-19 02:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0004_compteurs_de_vues'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClicSortant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cible', models.CharField(choices=[('n', 'Actualité'), ('p', 'Partenaire'), ('s', 'Lien social')], max_length=1, verbose_name='Cible')),
+                ('objet_id', models.PositiveIntegerField(verbose_name='Objet')),
+                ('date', models.DateTimeField(db_index=True, verbose_name='Date')),
+            ],
+            options={
+                'verbose_name': 'Clic sortant',
+                'verbose_name_plural': 'Clics sortants',
+            },
+        ),
+        migrations.CreateModel(
+            name='ClicsJournaliers',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jour', models.DateField(verbose_name='Jour')),
+                ('cible', models.CharField(choices=[('n', 'Actualité'), ('p', 'Partenaire'), ('s', 'Lien social')], max_length=1, verbose_name='Cible')),
+                ('objet_id', models.PositiveIntegerField(verbose_name='Objet')),
+                ('libelle', models.CharField(blank=True, max_length=200, verbose_name='Lien')),
+                ('clics', models.PositiveIntegerField(default=0, verbose_name='Clics')),
+            ],
+            options={
+                'verbose_name': 'Clics du jour',
+                'verbose_name_plural': 'Clics par jour',
+                'ordering': ['-jour', '-clics'],
+                'unique_together': {('jour', 'cible', 'objet_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-19 03:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0005_clics_sortants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Compteur',
+            fields=[
+                ('nom', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Nom')),
+                ('valeur', models.BigIntegerField(default=0, verbose_name='Valeur')),
+            ],
+            options={
+                'verbose_name': 'Compteur',
+                'verbose_name_plural': 'Compteurs',
+            },
+        ),
+        migrations.CreateModel(
+            name='StatistiquesJour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jour', models.DateField(unique=True, verbose_name='Jour')),
+                ('inscriptions', models.PositiveIntegerField(default=0, verbose_name='Inscriptions')),
+                ('desinscriptions', models.PositiveIntegerField(default=0, verbose_name='Désinscriptions')),
+                ('messages', models.PositiveIntegerField(default=0, verbose_name='Messages reçus')),
+            ],
+            options={
+                'verbose_name': 'Statistiques du jour',
+                'verbose_name_plural': 'Statistiques par jour',
+                'ordering': ['-jour'],
+            },
+        ),
+    ]
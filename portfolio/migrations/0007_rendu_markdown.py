@@ -0,0 +1,96 @@
+# Generated by Django 5.2.3 on 2026-10-19 03:04
+
+from django.db import migrations, models
+
+
+def render_existing(apps, schema_editor):
+    # Textes déjà saisis : rendus une fois ici, puis à chaque sauvegarde
+    from portfolio import richtext
+
+    richtext.rerender([apps.get_model(*label.split('.')) for label in richtext.FIELDS], everything=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0006_tableau_de_bord'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='description_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='extrait',
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name='Extrait'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='rendu_version',
+            field=models.CharField(blank=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='temps_lecture',
+            field=models.PositiveSmallIntegerField(default=1, editable=False, verbose_name='Temps de lecture (min)'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='description_detaillee_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='extrait',
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name='Extrait'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='rendu_version',
+            field=models.CharField(blank=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='temps_lecture',
+            field=models.PositiveSmallIntegerField(default=1, editable=False, verbose_name='Temps de lecture (min)'),
+        ),
+        migrations.AddField(
+            model_name='socialgallery',
+            name='contenu_detaille_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='socialgallery',
+            name='extrait',
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name='Extrait'),
+        ),
+        migrations.AddField(
+            model_name='socialgallery',
+            name='rendu_version',
+            field=models.CharField(blank=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='socialgallery',
+            name='temps_lecture',
+            field=models.PositiveSmallIntegerField(default=1, editable=False, verbose_name='Temps de lecture (min)'),
+        ),
+        migrations.AlterField(
+            model_name='news',
+            name='description',
+            field=models.TextField(help_text='Markdown', verbose_name='Description'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='description_detaillee',
+            field=models.TextField(help_text='Description complète pour la page détail (Markdown)', verbose_name='Description détaillée'),
+        ),
+        migrations.AlterField(
+            model_name='socialgallery',
+            name='contenu_detaille',
+            field=models.TextField(help_text='Contenu complet pour la page détail (Markdown)', verbose_name='Contenu détaillé'),
+        ),
+        migrations.RunPython(render_existing, migrations.RunPython.noop),
+    ]
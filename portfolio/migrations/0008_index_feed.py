@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0007_rendu_markdown'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feed',
+            index=models.Index(fields=['ordre_affichage', '-created_at'], name='feed_ordre_create_87f8_idx'),
+        ),
+    ]
@@ -57,8 +57,13 @@ class Project(models.Model):
     )
     description_detaillee = models.TextField(
         verbose_name="Description détaillée",
-        help_text="Description complète pour la page détail"
+        help_text="Description complète pour la page détail (Markdown)"
     )
+    # Rendu du Markdown à la sauvegarde (voir richtext.py)
+    description_detaillee_html = models.TextField(blank=True, editable=False)
+    extrait = models.CharField(max_length=255, blank=True, editable=False, verbose_name="Extrait")
+    temps_lecture = models.PositiveSmallIntegerField(default=1, editable=False, verbose_name="Temps de lecture (min)")
+    rendu_version = models.CharField(max_length=12, blank=True, editable=False)
     image = models.ImageField(
         upload_to='projects/', 
         verbose_name="Image du projet",
@@ -80,6 +85,12 @@ class Project(models.Model):
     featured = models.BooleanField(default=False, verbose_name="Projet mis en avant")
     url_demo = models.URLField(blank=True, null=True, verbose_name="URL de démo")
     url_github = models.URLField(blank=True, null=True, verbose_name="URL GitHub")
+    # Compteur alimenté par lots (voir page_views.py), classement recalculé périodiquement
+    vues = models.PositiveIntegerField(default=0, editable=False, verbose_name="Vues")
+    rang_popularite = models.PositiveIntegerField(
+        null=True, blank=True, editable=False, db_index=True,
+        verbose_name="Rang de popularité"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -87,6 +98,10 @@ class Project(models.Model):
         verbose_name = "Projet"
         verbose_name_plural = "Projets"
         ordering = ['ordre_affichage', '-created_at']
+        indexes = [
+            models.Index(fields=['featured', 'ordre_affichage'], name='project_featur_ordre_1ac0_idx'),
+            models.Index(fields=['ordre_affichage', '-created_at'], name='project_ordre_create_87f8_idx'),
+        ]
 
     def __str__(self):
         return self.titre
@@ -153,7 +168,12 @@ class News(models.Model):
     }
 
     titre = models.CharField(max_length=200, verbose_name="Titre")
-    description = models.TextField(verbose_name="Description")
+    description = models.TextField(verbose_name="Description", help_text="Markdown")
+    # Rendu du Markdown à la sauvegarde (voir richtext.py)
+    description_html = models.TextField(blank=True, editable=False)
+    extrait = models.CharField(max_length=255, blank=True, editable=False, verbose_name="Extrait")
+    temps_lecture = models.PositiveSmallIntegerField(default=1, editable=False, verbose_name="Temps de lecture (min)")
+    rendu_version = models.CharField(max_length=12, blank=True, editable=False)
     image = models.ImageField(
         upload_to='news/', 
         verbose_name="Image",
@@ -175,6 +195,9 @@ class News(models.Model):
         verbose_name = "Actualité"
         verbose_name_plural = "Actualités"
         ordering = ['ordre_affichage', '-date_publication']
+        indexes = [
+            models.Index(fields=['ordre_affichage', '-date_publication'], name='news_ordre_date_p_312c_idx'),
+        ]
 
     def __str__(self):
         return self.titre
@@ -222,16 +245,25 @@ class SocialGallery(models.Model):
     )
     contenu_detaille = models.TextField(
         verbose_name="Contenu détaillé",
-        help_text="Contenu complet pour la page détail"
+        help_text="Contenu complet pour la page détail (Markdown)"
     )
+    # Rendu du Markdown à la sauvegarde (voir richtext.py)
+    contenu_detaille_html = models.TextField(blank=True, editable=False)
+    extrait = models.CharField(max_length=255, blank=True, editable=False, verbose_name="Extrait")
+    temps_lecture = models.PositiveSmallIntegerField(default=1, editable=False, verbose_name="Temps de lecture (min)")
+    rendu_version = models.CharField(max_length=12, blank=True, editable=False)
     slug = models.SlugField(unique=True, blank=True)
     ordre_affichage = models.IntegerField(default=0, verbose_name="Ordre d'affichage")
+    vues = models.PositiveIntegerField(default=0, editable=False, verbose_name="Vues")
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         verbose_name = "Galerie sociale"
         verbose_name_plural = "Galerie sociale"
         ordering = ['ordre_affichage', '-created_at']
+        indexes = [
+            models.Index(fields=['ordre_affichage', '-created_at'], name='socialga_ordre_create_87f8_idx'),
+        ]
 
     def __str__(self):
         return self.titre
@@ -271,6 +303,10 @@ class Feed(models.Model):
         verbose_name = "Feed"
         verbose_name_plural = "Feed"
         ordering = ['ordre_affichage', '-created_at']
+        indexes = [
+            # Lots « Voir plus » de l'accueil, paginés par clé (voir sections.py)
+            models.Index(fields=['ordre_affichage', '-created_at'], name='feed_ordre_create_87f8_idx'),
+        ]
 
     def __str__(self):
         return f"Feed image {self.id}"
@@ -291,6 +327,7 @@ class Newsletter(models.Model):
     token_desabonnement = models.UUIDField(
         default=uuid.uuid4, 
         editable=False,
+        db_index=True,
         verbose_name="Token de désabonnement"
     )
 
@@ -298,10 +335,20 @@ class Newsletter(models.Model):
         verbose_name = "Abonné newsletter"
         verbose_name_plural = "Abonnés newsletter"
         ordering = ['-date_inscription']
+        indexes = [
+            models.Index(fields=['-date_inscription'], name='newslett_date_i_e213_idx'),
+        ]
 
     def __str__(self):
         return self.email
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Valeur chargée : le tableau de bord ne compte que les changements (signals.py)
+        instance._actif_initial = values[field_names.index('actif')] if 'actif' in field_names else None
+        return instance
+
 
 class SocialLink(models.Model):
     """Liens vers les réseaux sociaux"""
@@ -477,6 +524,83 @@ class ContactMessage(models.Model):
         verbose_name = "Message de contact"
         verbose_name_plural = "Messages de contact"
         ordering = ['-date_envoi']
+        indexes = [
+            models.Index(fields=['-date_envoi'], name='contactm_date_e_0921_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.nom} - {self.sujet}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Valeur chargée : le tableau de bord ne compte que les changements (signals.py)
+        instance._lu_initial = values[field_names.index('lu')] if 'lu' in field_names else None
+        return instance
+
+
+class ClicSortant(models.Model):
+    """Clic sur un lien externe, inséré par lots (voir outbound.py) puis agrégé par jour"""
+    CIBLE_CHOICES = [
+        ('n', 'Actualité'),
+        ('p', 'Partenaire'),
+        ('s', 'Lien social'),
+    ]
+
+    cible = models.CharField(max_length=1, choices=CIBLE_CHOICES, verbose_name="Cible")
+    objet_id = models.PositiveIntegerField(verbose_name="Objet")
+    date = models.DateTimeField(db_index=True, verbose_name="Date")
+
+    class Meta:
+        verbose_name = "Clic sortant"
+        verbose_name_plural = "Clics sortants"
+
+    def __str__(self):
+        return f"{self.get_cible_display()} #{self.objet_id} - {self.date:%d/%m/%Y %H:%M}"
+
+
+class ClicsJournaliers(models.Model):
+    """Clics sortants agrégés par jour et par lien (``rollup_clicks``)"""
+    jour = models.DateField(verbose_name="Jour")
+    cible = models.CharField(max_length=1, choices=ClicSortant.CIBLE_CHOICES, verbose_name="Cible")
+    objet_id = models.PositiveIntegerField(verbose_name="Objet")
+    libelle = models.CharField(max_length=200, blank=True, verbose_name="Lien")
+    clics = models.PositiveIntegerField(default=0, verbose_name="Clics")
+
+    class Meta:
+        verbose_name = "Clics du jour"
+        verbose_name_plural = "Clics par jour"
+        ordering = ['-jour', '-clics']
+        unique_together = ['jour', 'cible', 'objet_id']
+
+    def __str__(self):
+        return f"{self.jour:%d/%m/%Y} - {self.libelle} : {self.clics}"
+
+
+class Compteur(models.Model):
+    """Compteur du tableau de bord de l'admin, tenu à jour à chaque écriture (voir dashboard.py)"""
+    nom = models.CharField(max_length=100, primary_key=True, verbose_name="Nom")
+    valeur = models.BigIntegerField(default=0, verbose_name="Valeur")
+
+    class Meta:
+        verbose_name = "Compteur"
+        verbose_name_plural = "Compteurs"
+
+    def __str__(self):
+        return f"{self.nom} = {self.valeur}"
+
+
+class StatistiquesJour(models.Model):
+    """Inscriptions, désinscriptions et messages reçus par jour (voir dashboard.py)"""
+    jour = models.DateField(unique=True, verbose_name="Jour")
+    inscriptions = models.PositiveIntegerField(default=0, verbose_name="Inscriptions")
+    desinscriptions = models.PositiveIntegerField(default=0, verbose_name="Désinscriptions")
+    messages = models.PositiveIntegerField(default=0, verbose_name="Messages reçus")
+
+    class Meta:
+        verbose_name = "Statistiques du jour"
+        verbose_name_plural = "Statistiques par jour"
+        ordering = ['-jour']
 
     def __str__(self):
-        return f"{self.nom} - {self.sujet}"
\ No newline at end of file
+        return f"{self.jour:%d/%m/%Y}"
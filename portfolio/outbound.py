@@ -0,0 +1,219 @@
+# portfolio/outbound.py
+"""
+Suivi des clics sur les liens externes (actualités, partenaires, réseaux
+sociaux) via la redirection signée ``/go/<jeton>/``.
+
+Le jeton (``n-12:<signature>``) désigne l'objet, jamais l'URL : la vue ne
+peut rediriger que vers un lien saisi dans l'admin, et un jeton forgé
+répond 404. La cible est lue dans une table en mémoire propre au worker,
+rechargée quand la version d'un des trois modèles change (vérifiée au plus
+toutes les ``OUTBOUND_MAP_CHECK_INTERVAL`` secondes) : la redirection ne
+touche pas la base.
+
+Les clics sont cumulés en mémoire et insérés par lots dans ``ClicSortant``
+toutes les ``OUTBOUND_FLUSH_INTERVAL`` secondes, comme les vues de
+``page_views.py``. ``rollup()`` agrège les jours terminés dans
+``ClicsJournaliers`` (lisible dans l'admin) et supprime les clics
+agrégés ; un worker le lance au plus toutes les ``OUTBOUND_ROLLUP_INTERVAL``
+secondes, ``manage.py rollup_clicks`` à la demande.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from datetime import datetime, time as day_start
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import Count, Max
+from django.db.models.functions import TruncDate
+from django.urls import reverse
+from django.utils import timezone
+
+from .caching import model_versions
+from .models import ClicSortant, ClicsJournaliers, News, Partner, SocialLink
+
+logger = logging.getLogger(__name__)
+
+# Code de cible -> (modèle, champ de l'URL, champ du libellé)
+TARGETS = {
+    'n': (News, 'lien_externe', 'titre'),
+    'p': (Partner, 'url_site', 'nom_partenaire'),
+    's': (SocialLink, 'url', 'nom_affichage'),
+}
+CODES = {model: code for code, (model, _, _) in TARGETS.items()}
+LABELS = [model._meta.label_lower for model, _, _ in TARGETS.values()]
+
+ROLLUP_LOCK_KEY = 'outbound:rollup-lock'
+
+_signer = signing.Signer(salt='portfolio.outbound')
+_map = {'targets': {}, 'versions': None, 'checked': 0.0}
+_map_lock = threading.Lock()
+_pending = []
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+_pid = os.getpid()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+# Liens -----------------------------------------------------------------------
+
+def sign(code, pk):
+    """Jeton de la redirection vers l'objet ``pk`` de la cible ``code``"""
+    return _signer.sign(f'{code}-{pk}')
+
+
+def link_for(obj):
+    """URL de redirection suivie pour ``obj``, ou ``''`` s'il n'a pas de lien"""
+    code = CODES[type(obj)]
+    if not getattr(obj, TARGETS[code][1]):
+        return ''
+    return reverse('portfolio:outbound', args=[sign(code, obj.pk)])
+
+
+def _load_targets():
+    targets = {}
+    for code, (model, url_field, _) in TARGETS.items():
+        for pk, url in model.objects.exclude(**{f'{url_field}__isnull': True}).values_list('pk', url_field):
+            if url:
+                targets[f'{code}-{pk}'] = url
+    return targets
+
+
+def target(key):
+    """URL de ``key`` (``'n-12'``) depuis la table en mémoire, rechargée si le contenu a changé"""
+    now = time.monotonic()
+    if now - _map['checked'] >= _setting('OUTBOUND_MAP_CHECK_INTERVAL', 2):
+        versions = model_versions(LABELS)
+        with _map_lock:
+            if versions != _map['versions']:
+                _map['targets'] = _load_targets()
+                _map['versions'] = versions
+            _map['checked'] = now
+    return _map['targets'].get(key)
+
+
+def resolve(token):
+    """``(code, pk, url)`` pour un jeton valide et un lien existant, sinon ``None``"""
+    try:
+        key = _signer.unsign(token)
+    except signing.BadSignature:
+        return None
+    url = target(key)
+    if url is None:
+        return None
+    code, _, pk = key.partition('-')
+    return code, int(pk), url
+
+
+# Clics -----------------------------------------------------------------------
+
+def record(code, pk):
+    global _pid
+    if not _setting('OUTBOUND_TRACKING_ENABLED', True):
+        return
+    with _lock:
+        if os.getpid() != _pid:
+            # Clics hérités du processus parent : déjà enregistrés par lui
+            _pending.clear()
+            _pid = os.getpid()
+        _pending.append((code, pk, timezone.now()))
+    flush()
+
+
+def flush(force=False):
+    """Insère les clics en attente : dans un thread, ou tout de suite avec ``force``"""
+    global _last_flush
+    with _lock:
+        if not force and time.monotonic() - _last_flush < _setting('OUTBOUND_FLUSH_INTERVAL', 30):
+            return
+        pending = list(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return
+    if force:
+        _write(pending)
+    else:
+        threading.Thread(target=_write, args=(pending,), name='outbound-flush', daemon=True).start()
+
+
+def _write(pending):
+    try:
+        ClicSortant.objects.bulk_create(
+            [ClicSortant(cible=code, objet_id=pk, date=date) for code, pk, date in pending],
+            batch_size=500,
+        )
+        if cache.add(ROLLUP_LOCK_KEY, 1, _setting('OUTBOUND_ROLLUP_INTERVAL', 3600)):
+            rollup()
+    except Exception:
+        logger.exception("Enregistrement des clics sortants impossible (%d clics)", len(pending))
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            connections.close_all()
+
+
+atexit.register(flush, force=True)
+
+
+# Agrégats --------------------------------------------------------------------
+
+def _labels(keys):
+    """Libellé courant de chaque ``(code, pk)``"""
+    labels = {}
+    for code, (model, _, label_field) in TARGETS.items():
+        pks = [pk for c, pk in keys if c == code]
+        labels.update({(code, pk): label for pk, label in model.objects.filter(pk__in=pks).values_list('pk', label_field)})
+    return labels
+
+
+def rollup(until=None):
+    """
+    Agrège les clics antérieurs à ``until`` (défaut : minuit aujourd'hui,
+    heure locale) dans ``ClicsJournaliers`` et les supprime ; retourne le
+    nombre de clics agrégés. Un clic arrivé en retard s'ajoute au jour déjà
+    agrégé.
+    """
+    if until is None:
+        until = timezone.make_aware(datetime.combine(timezone.localdate(), day_start.min))
+    with transaction.atomic():
+        # Borne sur l'id : un clic inséré pendant l'agrégat n'est ni compté ni supprimé
+        last_id = ClicSortant.objects.filter(date__lt=until).aggregate(last=Max('id'))['last']
+        if last_id is None:
+            return 0
+        events = ClicSortant.objects.filter(date__lt=until, id__lte=last_id)
+        counts = list(
+            events.annotate(jour=TruncDate('date')).values('jour', 'cible', 'objet_id')
+            .annotate(clics=Count('id')).order_by()
+        )
+        days = {row['jour'] for row in counts}
+        existing = {
+            (row.jour, row.cible, row.objet_id): row
+            for row in ClicsJournaliers.objects.filter(jour__in=days)
+        }
+        labels = _labels({(row['cible'], row['objet_id']) for row in counts})
+        created, updated = [], []
+        for row in counts:
+            key = (row['jour'], row['cible'], row['objet_id'])
+            label = labels.get((row['cible'], row['objet_id']), '')[:200]
+            if key in existing:
+                daily = existing[key]
+                daily.clics += row['clics']
+                daily.libelle = label or daily.libelle
+                updated.append(daily)
+            else:
+                created.append(ClicsJournaliers(
+                    jour=row['jour'], cible=row['cible'], objet_id=row['objet_id'],
+                    libelle=label, clics=row['clics'],
+                ))
+        ClicsJournaliers.objects.bulk_create(created, batch_size=500)
+        ClicsJournaliers.objects.bulk_update(updated, ['clics', 'libelle'], batch_size=500)
+        total = sum(row['clics'] for row in counts)
+        events.delete()
+    return total
@@ -0,0 +1,135 @@
+# portfolio/page_views.py
+"""
+Compteurs de vues des pages projet et galerie, écrits par lots.
+
+Un ``UPDATE ... SET vues = vues + 1`` à chaque affichage sérialiserait les
+écritures sur SQLite. Chaque worker cumule donc les vues en mémoire, par
+slug, et les écrit toutes les ``VIEW_COUNT_FLUSH_INTERVAL`` secondes en
+une seule transaction, dans un thread à part pour ne pas retarder la
+requête qui déclenche l'écriture (et à l'arrêt du processus).
+
+Le classement « populaires » n'est pas calculé à la lecture : après une
+écriture, un seul worker à la fois (verrou dans le cache partagé) recalcule
+``Project.rang_popularite`` au plus toutes les ``POPULARITY_RANK_INTERVAL``
+secondes. Les listes triées par popularité lisent ce rang indexé ; leur clé
+de cache inclut ``ranks_version()`` pour suivre chaque nouveau classement.
+
+Les écritures passent par ``QuerySet.update`` et ``bulk_update`` : pas de
+signal ``post_save``, donc ni cache des pages ni export statique périmés à
+chaque vue.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .caching import _exporting
+from .models import Project, SocialGallery
+
+logger = logging.getLogger(__name__)
+
+# Route -> modèle dont la page détail est comptée
+DETAIL_ROUTES = {'projet_detail': Project, 'galerie_detail': SocialGallery}
+
+RANKS_VERSION_KEY = 'page-views:ranks-version'
+RANKS_LOCK_KEY = 'page-views:ranks-lock'
+
+_pending = Counter()
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+_pid = os.getpid()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def record(request, model, slug):
+    """Compte une vue de la page détail ``slug`` de ``model``"""
+    global _pid
+    if not _setting('VIEW_COUNT_ENABLED', True) or request.method != 'GET' or _exporting():
+        return
+    with _lock:
+        if os.getpid() != _pid:
+            # Vues héritées du processus parent : déjà comptées par lui
+            _pending.clear()
+            _pid = os.getpid()
+        _pending[model._meta.label_lower, slug] += 1
+    flush()
+
+
+def record_match(request, match):
+    """Compte une vue d'après la route résolue (pages servies par l'export statique)"""
+    model = DETAIL_ROUTES.get(match.url_name) if match else None
+    if model is not None:
+        record(request, model, match.kwargs['slug'])
+
+
+def flush(force=False):
+    """Écrit les vues en attente : dans un thread, ou tout de suite avec ``force``"""
+    global _last_flush
+    with _lock:
+        if not force and time.monotonic() - _last_flush < _setting('VIEW_COUNT_FLUSH_INTERVAL', 30):
+            return
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return
+    if force:
+        _write(pending)
+    else:
+        # Thread sans le contexte de la requête : l'écriture ne l'épingle pas au primaire
+        threading.Thread(target=_write, args=(pending,), name='page-views-flush', daemon=True).start()
+
+
+def _write(pending):
+    models = {model._meta.label_lower: model for model in DETAIL_ROUTES.values()}
+    try:
+        with transaction.atomic():
+            for (label, slug), count in sorted(pending.items()):
+                models[label].objects.filter(slug=slug).update(vues=F('vues') + count)
+        if cache.add(RANKS_LOCK_KEY, 1, _setting('POPULARITY_RANK_INTERVAL', 300)):
+            refresh_ranks()
+    except Exception:
+        logger.exception("Écriture des compteurs de vues impossible (%d pages)", len(pending))
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            connections.close_all()
+
+
+atexit.register(flush, force=True)
+
+
+def refresh_ranks():
+    """Recalcule ``Project.rang_popularite`` ; retourne le nombre de rangs modifiés"""
+    ranked = Project.objects.annotate(
+        rang=Window(RowNumber(), order_by=[F('vues').desc(), F('ordre_affichage').asc(), F('pk').asc()]),
+    ).values_list('pk', 'rang', 'rang_popularite')
+    changed = [Project(pk=pk, rang_popularite=rang) for pk, rang, current in ranked if rang != current]
+    if changed:
+        Project.objects.bulk_update(changed, ['rang_popularite'], batch_size=500)
+        cache.set(RANKS_VERSION_KEY, time.time_ns(), None)
+    return len(changed)
+
+
+def ranks_version():
+    """Version du classement, partagée par tous les workers"""
+    version = cache.get(RANKS_VERSION_KEY)
+    if version is None:
+        cache.add(RANKS_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(RANKS_VERSION_KEY)
+    return version
+
+
+def popular(queryset):
+    """``queryset`` trié par rang de popularité (projets jamais classés en dernier)"""
+    return queryset.order_by(F('rang_popularite').asc(nulls_last=True), 'ordre_affichage', '-created_at')
@@ -0,0 +1,137 @@
+# portfolio/request_profiler.py
+"""
+Profilage cProfile de requêtes réelles, échantillonnées ou demandées.
+
+Une requête est profilée si elle tire sous ``REQUEST_PROFILER_SAMPLE_RATE``
+(0.001 = une sur mille) ou si elle porte l'en-tête ``X-Profile-Request``
+avec un jeton signé (``python manage.py profiler_token``). Le profil pstats
+est écrit dans ``REQUEST_PROFILER_DIR`` ; seuls les ``REQUEST_PROFILER_KEEP``
+plus récents sont conservés. Ils sont listés et téléchargeables depuis
+``/debug/profiles/`` (staff).
+
+Un seul profil à la fois par processus : une requête tirée pendant qu'une
+autre est profilée est servie normalement.
+"""
+import cProfile
+import io
+import os
+import pstats
+import random
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+
+HEADER = 'HTTP_X_PROFILE_REQUEST'
+TOKEN_SALT = 'portfolio.request_profiler'
+PROFILE_NAME_RE = re.compile(r'^[\w.-]+\.prof$')
+
+_lock = threading.Lock()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def profile_dir():
+    return Path(_setting('REQUEST_PROFILER_DIR', settings.BASE_DIR / 'profiles'))
+
+
+def make_token():
+    """Valeur de l'en-tête ``X-Profile-Request``, valable ``REQUEST_PROFILER_TOKEN_MAX_AGE`` s"""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign('profile')
+
+
+def _valid_token(value):
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(
+            value, max_age=_setting('REQUEST_PROFILER_TOKEN_MAX_AGE', 24 * 3600)
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def should_profile(request):
+    value = request.META.get(HEADER)
+    if value:
+        return _valid_token(value)
+    rate = _setting('REQUEST_PROFILER_SAMPLE_RATE', 0)
+    return rate > 0 and random.random() < rate
+
+
+def run(func, *args):
+    """
+    Exécute ``func(*args)`` sous cProfile si aucun autre profil n'est en
+    cours dans ce processus. Retourne ``(résultat, profiler ou None)``.
+    """
+    if not _lock.acquire(blocking=False):
+        return func(*args), None
+    try:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            result = func(*args)
+        finally:
+            profiler.disable()
+        return result, profiler
+    finally:
+        _lock.release()
+
+
+def save(profiler, request, elapsed_ms):
+    """Écrit le profil dans l'anneau et retourne son nom de fichier"""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r'[^a-zA-Z0-9]+', '-', request.path).strip('-')[:60] or 'index'
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    name = f'{stamp}-{os.getpid()}-{request.method.lower()}-{slug}-{elapsed_ms:.0f}ms.prof'
+    tmp = directory / f'.{name}.tmp'
+    profiler.dump_stats(tmp)
+    os.replace(tmp, directory / name)
+    _prune(directory)
+    return name
+
+
+def _prune(directory):
+    keep = _setting('REQUEST_PROFILER_KEEP', 50)
+    files = sorted(directory.glob('*.prof'), reverse=True)
+    for path in files[keep:]:
+        path.unlink(missing_ok=True)
+
+
+def list_profiles():
+    directory = profile_dir()
+    if not directory.exists():
+        return []
+    profiles = []
+    for path in sorted(directory.glob('*.prof'), reverse=True):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        profiles.append({
+            'name': path.name,
+            'size': stat.st_size,
+            'date': datetime.fromtimestamp(stat.st_mtime),
+        })
+    return profiles
+
+
+def profile_path(name):
+    """Chemin d'un profil existant, ``None`` si le nom est invalide ou absent"""
+    if not PROFILE_NAME_RE.match(name):
+        return None
+    path = profile_dir() / name
+    return path if path.is_file() else None
+
+
+def summary(path, limit=40):
+    """Fonctions les plus coûteuses (temps cumulé), au format texte de pstats"""
+    out = io.StringIO()
+    stats = pstats.Stats(str(path), stream=out)
+    stats.strip_dirs().sort_stats('cumulative').print_stats(limit)
+    return out.getvalue()
@@ -0,0 +1,135 @@
+# portfolio/richtext.py
+"""
+Textes longs en Markdown, rendus une fois à la sauvegarde.
+
+``Project.description_detaillee``, ``SocialGallery.contenu_detaille`` et
+``News.description`` sont saisis en Markdown. À chaque sauvegarde
+(``pre_save``, voir ``signals.py``) le HTML est calculé et rangé dans une
+colonne ``*_html`` avec un extrait en texte brut et le temps de lecture :
+les pages affichent ces colonnes sans analyser le Markdown à chaque requête.
+
+Le HTML brut saisi est échappé (``html: False``) et markdown-it refuse les
+liens ``javascript:``, ``vbscript:``, ``file:`` et ``data:`` (sauf images) :
+le rendu peut être marqué ``safe`` sans bibliothèque de nettoyage
+supplémentaire. Les retours à la ligne simples restent des ``<br>``,
+comme avec l'ancien filtre ``linebreaks``.
+
+Chaque ligne garde l'empreinte de la configuration qui l'a rendue
+(``rendu_version``) : après une modification de ``CONFIG`` ou une mise à
+jour de markdown-it-py, ``manage.py render_markdown`` ne refait que les
+lignes périmées.
+"""
+import hashlib
+import html
+import json
+import math
+import re
+
+import markdown_it
+from markdown_it import MarkdownIt
+
+# Modèle -> (champ Markdown, colonne HTML)
+FIELDS = {
+    'portfolio.project': ('description_detaillee', 'description_detaillee_html'),
+    'portfolio.socialgallery': ('contenu_detaille', 'contenu_detaille_html'),
+    'portfolio.news': ('description', 'description_html'),
+}
+
+# Toute modification change ``VERSION`` et rend les lignes existantes périmées
+CONFIG = {
+    'preset': 'commonmark',
+    'options': {'html': False, 'breaks': True, 'typographer': True},
+    'enable': ['table', 'strikethrough', 'replacements', 'smartquotes'],
+    'external_links': {'rel': 'nofollow noopener', 'target': '_blank'},
+    'excerpt_chars': 200,
+    'words_per_minute': 200,
+}
+
+VERSION = hashlib.sha1(
+    (json.dumps(CONFIG, sort_keys=True) + markdown_it.__version__).encode('utf-8')
+).hexdigest()[:12]
+
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+
+
+def _build():
+    md = MarkdownIt(CONFIG['preset'], CONFIG['options']).enable(CONFIG['enable'])
+
+    def link_open(renderer, tokens, idx, options, env):
+        token = tokens[idx]
+        if (token.attrGet('href') or '').startswith(('http://', 'https://')):
+            for name, value in CONFIG['external_links'].items():
+                token.attrSet(name, value)
+        return renderer.renderToken(tokens, idx, options, env)
+
+    md.add_render_rule('link_open', link_open)
+    return md
+
+
+_md = _build()
+
+
+def render(text):
+    """HTML de ``text`` (Markdown)"""
+    return _md.render(text or '')
+
+
+def plain_text(rendered):
+    """Texte brut d'un rendu HTML, espaces normalisés"""
+    return SPACE_RE.sub(' ', html.unescape(TAG_RE.sub(' ', rendered))).strip()
+
+
+def excerpt(text, limit=None):
+    """Début de ``text`` coupé sur un mot, au plus ``limit`` caractères"""
+    limit = limit or CONFIG['excerpt_chars']
+    if len(text) <= limit:
+        return text
+    cut = text[:limit - 1].rsplit(' ', 1)[0].rstrip(' ,;:.')
+    return f'{cut}…'
+
+
+def reading_time(text):
+    """Minutes de lecture (au moins une)"""
+    return max(1, math.ceil(len(text.split()) / CONFIG['words_per_minute']))
+
+
+def render_instance(instance):
+    """Remplit les colonnes dérivées de ``instance`` ; retourne les champs modifiés"""
+    source, target = FIELDS[instance._meta.label_lower]
+    rendered = render(getattr(instance, source))
+    text = plain_text(rendered)
+    setattr(instance, target, rendered)
+    instance.extrait = excerpt(text)
+    instance.temps_lecture = reading_time(text)
+    instance.rendu_version = VERSION
+    return [target, 'extrait', 'temps_lecture', 'rendu_version']
+
+
+def rerender(models, everything=False, batch_size=500):
+    """
+    Rend à nouveau les lignes de ``models`` rendues avec une autre
+    configuration (toutes avec ``everything``) ; retourne ``{label: lignes}``.
+
+    ``bulk_update`` : ni ``pre_save`` ni invalidation du cache à chaque ligne,
+    c'est à l'appelant de périmer les pages.
+    """
+    done = {}
+    for model in models:
+        source, target = FIELDS[model._meta.label_lower]
+        queryset = model._base_manager.all()
+        if not everything:
+            queryset = queryset.exclude(rendu_version=VERSION)
+        pending, count, fields = [], 0, None
+        for instance in queryset.only('pk', source).order_by('pk').iterator(chunk_size=batch_size):
+            fields = render_instance(instance)
+            pending.append(instance)
+            if len(pending) >= batch_size:
+                model._base_manager.bulk_update(pending, fields)
+                count += len(pending)
+                pending = []
+        if pending:
+            model._base_manager.bulk_update(pending, fields)
+            count += len(pending)
+        done[model._meta.label_lower] = count
+    return done
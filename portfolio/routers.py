@@ -0,0 +1,75 @@
+# portfolio/routers.py
+"""
+Routage lectures/écritures entre le primaire (``default``) et les réplicas
+(``replica_1``, ``replica_2``... déclarés par ``DATABASE_REPLICA_URLS``).
+
+Seules les lectures faites pendant une requête HTTP vont sur un réplica :
+``ReplicaRoutingMiddleware`` ouvre un état de routage pour la requête. Les
+commandes de gestion, le shell et les tâches lisent donc toujours sur le
+primaire (``seed_data`` relit par exemple les clés qu'il vient d'insérer).
+
+Restent sur le primaire :
+
+- toutes les écritures, et les lectures qui suivent dans la même requête ;
+- les lectures dans un bloc ``atomic()`` ouvert sur le primaire ;
+- les requêtes de l'admin ;
+- les visiteurs qui viennent d'écrire, pendant ``REPLICA_PIN_SECONDS``
+  (cookie ``REPLICA_PIN_COOKIE``) : ils relisent ce qu'ils ont écrit même si
+  le réplica est en retard.
+
+Une page reconstruite pour le cache depuis un réplica en retard reste en
+cache au plus ``PAGE_CACHE_TIMEOUT`` secondes : le retard de réplication
+doit rester petit devant cette durée.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Dictionnaire mutable : visible de la vue au middleware même quand asgiref
+# exécute la vue dans une copie du contexte
+_state = ContextVar('replica_routing', default=None)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith('replica_')]
+
+
+def start_request(pinned):
+    """Ouvre l'état de routage d'une requête ; retourne le jeton pour ``end_request``"""
+    return _state.set({'pinned': pinned, 'wrote': False})
+
+
+def end_request(token):
+    """Ferme l'état de la requête ; vrai si elle a écrit sur le primaire"""
+    state = _state.get()
+    _state.reset(token)
+    return bool(state and state['wrote'])
+
+
+class PrimaryReplicaRouter:
+    def __init__(self):
+        self.replicas = replica_aliases()
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if not self.replicas or state is None or state['pinned']:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(self.replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state['wrote'] = state['pinned'] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primaire et réplicas contiennent les mêmes données
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Les réplicas reçoivent le schéma par la réplication (ou par copie en local)
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,117 @@
+# portfolio/sections.py
+"""
+Sections de l'accueil chargées à la demande.
+
+``index.html`` ne rend côté serveur que le haut de page (présentation et
+projets). Chaque section plus bas (compétences, actualités, galerie, feed,
+partenaires) est un fragment HTML servi par ``views.section`` et inséré
+par le navigateur quand elle approche de l'écran (``IntersectionObserver``) :
+la première réponse ne dépend plus du volume du contenu, et les images des
+sections jamais atteintes ne sont pas téléchargées.
+
+Les fragments ne contiennent ni jeton CSRF ni contenu propre au visiteur :
+ils sont mis en cache par URL (``caching.get_or_build``) et servis avec un
+``Cache-Control`` public.
+
+La galerie et le feed se paginent par clé (« Voir plus ») : le curseur
+porte l'ordre d'affichage, la date et l'id du dernier élément affiché, et
+le lot suivant est lu à partir de là dans l'index
+``(ordre_affichage, -created_at)``, sans ``OFFSET`` ni doublon quand un
+élément est ajouté entre deux lots.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import Q
+from django.urls import reverse
+
+from .models import Feed, News, Partner, Skill, SocialGallery
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+ORDRE_MIN, ORDRE_MAX = -2**31, 2**31 - 1
+PK_MAX = 2**63 - 1
+
+# Nom -> gabarit du fragment, modèles affichés, éléments par lot (paginé par clé)
+SECTIONS = {
+    'competences': {'template': 'portfolio/sections/competences.html', 'models': (Skill,)},
+    'actualites': {'template': 'portfolio/sections/actualites.html', 'models': (News,)},
+    'galerie': {'template': 'portfolio/sections/galerie.html', 'models': (SocialGallery,), 'batch': 6},
+    'feed': {'template': 'portfolio/sections/feed.html', 'models': (Feed,), 'batch': 8},
+    'partenaires': {'template': 'portfolio/sections/partenaires.html', 'models': (Partner,)},
+}
+
+# Gabarit des seuls éléments d'un lot suivant
+ITEMS_TEMPLATE = 'portfolio/sections/{}_elements.html'
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def url(name):
+    return reverse('portfolio:section', args=[name])
+
+
+# Curseurs --------------------------------------------------------------------
+
+def encode_cursor(obj):
+    """Curseur ``ordre.microsecondes.id`` de l'élément ``obj``"""
+    micros = (obj.created_at - EPOCH) // timedelta(microseconds=1)
+    return f'{obj.ordre_affichage}.{micros}.{obj.pk}'
+
+
+def decode_cursor(cursor):
+    """``(ordre, date, id)`` d'un curseur, ``InvalidCursor`` s'il est mal formé"""
+    try:
+        ordre, micros, pk = (int(part) for part in cursor.split('.'))
+        created_at = EPOCH + timedelta(microseconds=micros)
+    except (ValueError, OverflowError):
+        raise InvalidCursor(cursor)
+    # Bornes des colonnes (IntegerField, BigAutoField) : rien ne déborde en SQL
+    if not (ORDRE_MIN <= ordre <= ORDRE_MAX and 0 < pk <= PK_MAX):
+        raise InvalidCursor(cursor)
+    return ordre, created_at, pk
+
+
+def after(queryset, cursor):
+    """
+    Éléments de ``queryset`` qui suivent ``cursor`` dans l'ordre
+    ``ordre_affichage, -created_at, id``.
+    """
+    ordre, created_at, pk = decode_cursor(cursor)
+    # Borne sur la première colonne de l'index : la lecture commence au bon endroit
+    return queryset.filter(ordre_affichage__gte=ordre).filter(
+        Q(ordre_affichage__gt=ordre)
+        | Q(ordre_affichage=ordre, created_at__lt=created_at)
+        | Q(ordre_affichage=ordre, created_at=created_at, pk__gt=pk)
+    )
+
+
+def page(model, name, cursor=None):
+    """
+    ``(éléments, url du lot suivant ou '')`` : un lot de ``model`` à partir de
+    ``cursor`` (début de la liste sans curseur).
+    """
+    batch = SECTIONS[name]['batch']
+    queryset = model.objects.order_by('ordre_affichage', '-created_at', 'pk')
+    if cursor:
+        queryset = after(queryset, cursor)
+    items = list(queryset[:batch + 1])
+    if len(items) <= batch:
+        return items, ''
+    items = items[:batch]
+    return items, f'{url(name)}?apres={encode_cursor(items[-1])}'
+
+
+# Contextes -------------------------------------------------------------------
+
+def context(name, cursor=None):
+    """Contexte du fragment ``name`` (du lot qui suit ``cursor`` pour la galerie et le feed)"""
+    if name == 'competences':
+        return {'skills': Skill.objects.all().order_by('ordre_affichage')}
+    if name == 'actualites':
+        return {'news': News.objects.all().order_by('ordre_affichage', '-date_publication')[:6]}
+    if name == 'partenaires':
+        return {'partners': Partner.objects.filter(actif=True).order_by('ordre_affichage')}
+    model = SECTIONS[name]['models'][0]
+    items, suite = page(model, name, cursor)
+    return {'items': items, 'suite': suite}
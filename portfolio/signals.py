@@ -0,0 +1,92 @@
+# portfolio/signals.py
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from . import dashboard, richtext
+from .caching import bump_content_version, bump_model_version
+from .models import (
+    Profile, Project, Skill, News, Partner,
+    SocialGallery, Feed, SocialLink, ContactInfo, SiteSettings,
+    ContactMessage, Newsletter,
+)
+from .sqlite import configure_connection
+
+# Modèles dont le contenu apparaît dans les pages publiques
+CONTENT_MODELS = (
+    Profile, Project, Skill, News, Partner,
+    SocialGallery, Feed, SocialLink, ContactInfo, SiteSettings,
+)
+
+
+def invalidate_page_cache(sender, **kwargs):
+    """Périme les pages et fragments en cache dès qu'un contenu public change"""
+    bump_content_version()
+    bump_model_version(sender._meta.label_lower)
+
+
+# Connecté modèle par modèle : un récepteur sans ``sender`` empêcherait les
+# suppressions rapides (sans chargement des lignes) de Newsletter et ContactMessage
+for model in CONTENT_MODELS:
+    post_save.connect(invalidate_page_cache, sender=model)
+    post_delete.connect(invalidate_page_cache, sender=model)
+
+
+# Compteurs du tableau de bord de l'admin (voir dashboard.py). Pas de
+# post_delete pour Newsletter et ContactMessage (suppressions rapides, voir
+# plus haut) : les suppressions en masse appellent dashboard.*_removed.
+def count_message(sender, instance, created, **kwargs):
+    if created:
+        with transaction.atomic():
+            dashboard.adjust(messages=1, messages_non_lus=0 if instance.lu else 1)
+            dashboard.bump_day(messages=1)
+    elif getattr(instance, '_lu_initial', None) not in (None, instance.lu):
+        dashboard.adjust(messages_non_lus=-1 if instance.lu else 1)
+    instance._lu_initial = instance.lu
+
+
+def count_subscriber(sender, instance, created, **kwargs):
+    if created:
+        with transaction.atomic():
+            dashboard.adjust(abonnes=1, abonnes_actifs=1 if instance.actif else 0)
+            dashboard.bump_day(inscriptions=1)
+    elif getattr(instance, '_actif_initial', None) not in (None, instance.actif):
+        with transaction.atomic():
+            dashboard.adjust(abonnes_actifs=1 if instance.actif else -1)
+            if not instance.actif:
+                dashboard.bump_day(desinscriptions=1)
+    instance._actif_initial = instance.actif
+
+
+def count_content_added(sender, instance, created, **kwargs):
+    if created:
+        dashboard.adjust_content(sender, 1)
+
+
+def count_content_removed(sender, instance, **kwargs):
+    dashboard.adjust_content(sender, -1)
+
+
+post_save.connect(count_message, sender=ContactMessage)
+post_save.connect(count_subscriber, sender=Newsletter)
+for model in dashboard.CONTENT_MODELS:
+    post_save.connect(count_content_added, sender=model)
+    post_delete.connect(count_content_removed, sender=model)
+
+
+# Markdown rendu une fois à la sauvegarde, les pages lisent les colonnes *_html
+def render_markdown(sender, instance, update_fields=None, **kwargs):
+    source, _ = richtext.FIELDS[sender._meta.label_lower]
+    if update_fields is not None and source not in update_fields:
+        return
+    fields = richtext.render_instance(instance)
+    if update_fields is not None and instance.pk is not None:
+        # save(update_fields=...) n'écrirait que le texte source : colonnes dérivées écrites ici
+        sender._base_manager.filter(pk=instance.pk).update(**{name: getattr(instance, name) for name in fields})
+
+
+for model in (Project, SocialGallery, News):
+    pre_save.connect(render_markdown, sender=model)
+
+# Pragmas SQLite (WAL, mmap, busy_timeout...) à chaque nouvelle connexion
+connection_created.connect(configure_connection)
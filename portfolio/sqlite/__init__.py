@@ -0,0 +1,28 @@
+# portfolio/sqlite/__init__.py
+"""
+Réglages SQLite pour plusieurs workers.
+
+``configure_connection`` est branché sur ``connection_created`` (voir
+``signals.py``) et applique ``SQLITE_PRAGMAS`` à chaque nouvelle connexion
+SQLite : journal WAL (les lectures ne sont plus bloquées par une écriture),
+``synchronous=NORMAL`` (pas de fsync à chaque commit en WAL), lectures
+memory-mapped, cache de pages et ``busy_timeout``.
+
+Ce paquet est aussi un moteur de base de données (``base.py``) :
+
+    DATABASES = {'default': {'ENGINE': 'portfolio.sqlite', ...}}
+
+Avec ce moteur, les écritures de tous les workers passent une par une par
+un verrou fichier (voir ``SQLITE_SERIALIZE_WRITES`` dans settings.py et
+``manage.py bench_sqlite`` pour la comparaison).
+"""
+from django.conf import settings
+
+
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
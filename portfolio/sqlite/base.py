@@ -0,0 +1,109 @@
+# portfolio/sqlite/base.py
+"""
+Moteur SQLite à écrivain unique.
+
+SQLite n'accepte qu'une écriture à la fois ; quand plusieurs workers
+écrivent ensemble, les perdants attendent dans ``busy_timeout`` par
+sommeils successifs, sans ordre d'arrivée. Ici chaque transaction
+d'écriture prend d'abord un verrou ``flock`` exclusif sur
+``<base>.writer.lock`` : les écrivains font la queue dans le noyau et la
+base ne voit jamais deux écrivains à la fois. Les lectures ne prennent
+aucun verrou (WAL).
+
+- bloc ``atomic()`` : verrou pris au ``BEGIN``, rendu au commit/rollback ;
+- écriture hors transaction (``save()`` simple) : verrou le temps de
+  l'instruction.
+"""
+import fcntl
+
+from django.db.backends.sqlite3 import base
+
+READ_STATEMENTS = {'SELECT', 'PRAGMA', 'EXPLAIN'}
+
+
+class WriterLock:
+    """
+    Verrou fichier exclusif, réentrant pour la connexion qui le détient.
+    Sans ``path`` (base en mémoire), seule la profondeur est suivie.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.depth = 0
+
+    @property
+    def held(self):
+        return self.depth > 0
+
+    def acquire(self):
+        if self.depth == 0 and self.path:
+            if self.file is None:
+                self.file = open(self.path, 'a')
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        self.depth += 1
+
+    def release(self):
+        if self.depth == 0:
+            return
+        self.depth -= 1
+        if self.depth == 0 and self.file is not None:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+
+    def close(self):
+        self.depth = 0
+        if self.file is not None:
+            self.file.close()  # libère aussi le verrou
+            self.file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _is_write(sql):
+    words = sql.lstrip().split(None, 1)
+    return bool(words) and words[0].upper() not in READ_STATEMENTS
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        path = None if self.is_in_memory_db() else f"{self.settings_dict['NAME']}.writer.lock"
+        self.writer_lock = WriterLock(path)
+        self.execute_wrappers.append(self._serialize_write)
+
+    def _serialize_write(self, execute, sql, params, many, context):
+        if self.writer_lock.held or not _is_write(sql):
+            return execute(sql, params, many, context)
+        with self.writer_lock:
+            return execute(sql, params, many, context)
+
+    def _start_transaction_under_autocommit(self):
+        self.writer_lock.acquire()
+        try:
+            super()._start_transaction_under_autocommit()
+        except BaseException:
+            self.writer_lock.release()
+            raise
+
+    def _commit(self):
+        try:
+            super()._commit()
+        finally:
+            self.writer_lock.release()
+
+    def _rollback(self):
+        try:
+            super()._rollback()
+        finally:
+            self.writer_lock.release()
+
+    def _close(self):
+        try:
+            super()._close()
+        finally:
+            self.writer_lock.close()
@@ -0,0 +1,320 @@
+# portfolio/static_site.py
+"""
+Export statique des pages publiques et régénération incrémentale.
+
+``python manage.py export_static`` rend, avec les vues elles-mêmes, toutes
+les pages qui ne dépendent que du contenu de la base (accueil, listings,
+chaque projet et chaque élément de galerie) ainsi que les ``api_*`` dans
+``STATIC_SITE_ROOT`` ::
+
+    index.html
+    sections/galerie/index.html, ...
+    projet/<slug>/index.html
+    projets/index.html, projets/page/2/index.html, ...
+    api/projects/index.json
+
+``manifest.json`` associe chaque URL à son fichier et aux modèles dont elle
+dépend, avec la version de ces modèles au moment de l'export (voir
+``caching.model_versions``) et une empreinte de chaque ligne.
+``StaticSiteMiddleware`` ne sert un fichier que si les versions n'ont pas
+bougé depuis : une modification dans l'admin repasse les pages concernées
+en dynamique jusqu'au prochain export, jamais de page périmée.
+
+``--incremental`` compare les empreintes à celles du manifeste et ne
+rend que les pages touchées par les lignes ajoutées, modifiées ou
+supprimées. Contact, newsletter et recherche restent dynamiques.
+"""
+import hashlib
+import json
+import math
+import os
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils.cache import patch_cache_control
+
+from .caching import CSRF_PLACEHOLDER, exporting, model_versions
+from .models import (
+    ContactInfo, Feed, News, Partner, Profile, Project, SiteSettings, Skill,
+    SocialGallery, SocialLink,
+)
+from .sections import SECTIONS
+from .views import GALERIE_PAR_PAGE, PROJETS_PAR_PAGE
+
+MANIFEST = 'manifest.json'
+
+# Affichés par base.html sur toutes les pages
+BASE_MODELS = (Profile, ContactInfo, SocialLink, SiteSettings)
+# Haut de l'accueil ; les autres sections sont des fragments (voir sections.py)
+HOME_MODELS = BASE_MODELS + (Project,)
+INDEX_MODELS = BASE_MODELS + (Project, Skill, News, Partner, SocialGallery, Feed)
+
+# Éléments qui apparaissent dans les « similaires » de toutes les pages détail
+SIMILAR_COUNT = 4
+
+# Champs mis à jour en continu (page_views.py) et absents des pages exportées
+VOLATILE_FIELDS = {'vues', 'rang_popularite'}
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def _labels(models):
+    return [_label(model) for model in models]
+
+
+# Inventaire ------------------------------------------------------------------
+
+def _listing_urls(name, count, per_page):
+    url = reverse(f'portfolio:{name}')
+    return [url] + [f'{url}?page={n}' for n in range(2, math.ceil(count / per_page) + 1)]
+
+
+def site_pages():
+    """URL -> ``{'kind', 'group', 'models'}`` de toutes les pages exportables"""
+    html_base = _labels(BASE_MODELS)
+    pages = {reverse('portfolio:index'): {'kind': 'html', 'group': 'index', 'models': _labels(HOME_MODELS)}}
+    # Premier lot de chaque section ; les lots suivants (``?apres=``) restent dynamiques
+    for name, section in SECTIONS.items():
+        pages[reverse('portfolio:section', args=[name])] = {
+            'kind': 'html', 'group': 'fragment', 'models': _labels(section['models']),
+        }
+    for model, detail, listing, per_page in (
+        (Project, 'projet_detail', 'tous_projets', PROJETS_PAR_PAGE),
+        (SocialGallery, 'galerie_detail', 'toute_galerie', GALERIE_PAR_PAGE),
+    ):
+        models = html_base + [_label(model)]
+        for slug in model.objects.values_list('slug', flat=True):
+            pages[reverse(f'portfolio:{detail}', args=[slug])] = {'kind': 'html', 'group': 'detail', 'models': models}
+        for url in _listing_urls(listing, model.objects.count(), per_page):
+            pages[url] = {'kind': 'html', 'group': 'listing', 'models': models}
+    for name, model in (('api_projects', Project), ('api_gallery', SocialGallery), ('api_feed', Feed)):
+        pages[reverse(f'portfolio:{name}')] = {'kind': 'json', 'group': 'api', 'models': [_label(model)]}
+    return pages
+
+
+def file_for(url, kind):
+    """Chemin relatif du fichier d'une URL (``/projets/?page=2`` -> ``projets/page/2/index.html``)"""
+    path, _, query = url.partition('?')
+    parts = [p for p in path.split('/') if p]
+    if query:
+        parts += ['page', query.removeprefix('page=')]
+    return '/'.join(parts + [f'index.{kind}'])
+
+
+def snapshot():
+    """Empreinte de chaque ligne des modèles suivis, slugs et « similaires »"""
+    rows = {}
+    for model in INDEX_MODELS:
+        fields = [f.attname for f in model._meta.concrete_fields if f.name not in VOLATILE_FIELDS]
+        rows[_label(model)] = {
+            str(row[0]): hashlib.sha1(repr(row[1:]).encode('utf-8')).hexdigest()[:16]
+            for row in model.objects.order_by().values_list(*fields)
+        }
+    featured = Project.objects.filter(featured=True).order_by('ordre_affichage')
+    similar = {
+        _label(Project): [str(pk) for pk in featured.values_list('pk', flat=True)[:SIMILAR_COUNT]],
+        _label(SocialGallery): [str(pk) for pk in SocialGallery.objects.order_by('ordre_affichage').values_list('pk', flat=True)[:SIMILAR_COUNT]],
+    }
+    slugs = {
+        _label(model): {str(pk): slug for pk, slug in model.objects.values_list('pk', 'slug')}
+        for model in (Project, SocialGallery)
+    }
+    return {'rows': rows, 'similar': similar, 'slugs': slugs}
+
+
+def affected_urls(old, new, pages):
+    """URL à régénérer quand le contenu passe de l'instantané ``old`` à ``new``"""
+    affected = {url for url in pages if url not in old['pages']}
+    changed = {}
+    for label, rows in new['rows'].items():
+        old_rows = old['rows'].get(label, {})
+        changed[label] = {pk for pk in set(old_rows) | set(rows) if old_rows.get(pk) != rows.get(pk)}
+
+    if any(changed[label] for label in _labels(BASE_MODELS)):
+        # En-tête, barre de contact ou pied de page : toutes les pages HTML (hors fragments)
+        affected |= {url for url, page in pages.items() if page['kind'] == 'html' and page['group'] != 'fragment'}
+
+    detail_names = {_label(Project): 'projet_detail', _label(SocialGallery): 'galerie_detail'}
+    for label, pks in changed.items():
+        if not pks:
+            continue
+        affected |= {
+            url for url, page in pages.items()
+            if page['group'] in ('index', 'listing', 'fragment', 'api') and label in page['models']
+        }
+        if label not in detail_names:
+            continue
+        old_similar, new_similar = old['similar'].get(label, []), new['similar'][label]
+        if old_similar != new_similar or pks & set(new_similar):
+            # Les cartes « similaires » ont changé : toutes les pages détail du modèle
+            affected |= {
+                url for url, page in pages.items()
+                if page['group'] == 'detail' and label in page['models']
+            }
+        else:
+            for pk in pks:
+                slug = new['slugs'][label].get(pk)
+                if slug:
+                    affected.add(reverse(f'portfolio:{detail_names[label]}', args=[slug]))
+    return affected & set(pages)
+
+
+# Rendu -----------------------------------------------------------------------
+
+def _write(path, content):
+    """Écriture atomique : un lecteur voit l'ancien fichier ou le nouveau"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    with os.fdopen(fd, 'wb') as fh:
+        fh.write(content)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, path)
+
+
+def render_page(url, base_url):
+    """Contenu de ``url`` rendu par sa vue, ou ``None`` si elle ne répond pas 200"""
+    parts = urlsplit(base_url)
+    path, _, query = url.partition('?')
+    request = RequestFactory().get(
+        path, dict(p.split('=', 1) for p in query.split('&') if p),
+        HTTP_HOST=parts.netloc, secure=parts.scheme == 'https',
+    )
+    match = resolve(path)
+    request.resolver_match = match
+    with exporting():
+        response = match.func(request, *match.args, **match.kwargs)
+    return response.content if response.status_code == 200 else None
+
+
+def read_manifest(root):
+    try:
+        return json.loads((Path(root) / MANIFEST).read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def export(root=None, base_url=None, incremental=False, stdout=None):
+    """
+    Exporte le site dans ``root`` ; retourne ``{'rendered', 'removed', 'failed', 'seconds'}``.
+
+    Les versions des modèles sont lues avant les données : une modification
+    pendant l'export laisse les pages concernées en dynamique.
+    """
+    root = Path(root or settings.STATIC_SITE_ROOT)
+    base_url = base_url or settings.STATIC_SITE_URL
+    start = time.perf_counter()
+    labels = _labels(INDEX_MODELS)
+    versions = dict(zip(labels, model_versions(labels)))
+    current = snapshot()
+    pages = site_pages()
+
+    old = read_manifest(root) if incremental else None
+    if old is None:
+        todo = set(pages)
+        old = {'pages': {}}
+    else:
+        todo = affected_urls(old, current, pages)
+
+    failed = []
+    for url in sorted(todo):
+        try:
+            content = render_page(url, base_url)
+        except Exception as e:
+            content = None
+            if stdout:
+                stdout.write(f"Échec {url} : {type(e).__name__} {e}")
+        if content is None:
+            failed.append(url)
+            continue
+        _write(root / file_for(url, pages[url]['kind']), content)
+
+    manifest_pages = {
+        url: {**page, 'file': file_for(url, page['kind'])}
+        for url, page in pages.items()
+        if url not in failed and (url in todo or url in old['pages'])
+    }
+    removed = [page['file'] for url, page in old['pages'].items() if url not in manifest_pages]
+    _write(root / MANIFEST, json.dumps({
+        'base_url': base_url,
+        'versions': versions,
+        'pages': manifest_pages,
+        **current,
+    }, ensure_ascii=False).encode('utf-8'))
+    for name in removed:
+        (root / name).unlink(missing_ok=True)
+
+    return {
+        'rendered': len(todo) - len(failed),
+        'removed': len(removed),
+        'failed': failed,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+# Service ---------------------------------------------------------------------
+
+CONTENT_TYPES = {'html': 'text/html; charset=utf-8', 'json': 'application/json'}
+
+_manifest = {'mtime': None, 'data': None}
+
+
+def _current_manifest(root):
+    """Manifeste relu seulement quand le fichier change (un ``stat`` par requête)"""
+    try:
+        mtime = os.stat(Path(root) / MANIFEST).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if mtime != _manifest['mtime']:
+        _manifest['data'] = read_manifest(root)
+        _manifest['mtime'] = mtime
+    return _manifest['data']
+
+
+def lookup(request):
+    """Chemin du fichier exporté pour ``request`` s'il est à jour, sinon ``None``"""
+    if request.method not in ('GET', 'HEAD'):
+        return None, None
+    query = request.META.get('QUERY_STRING', '')
+    if query and not (query.startswith('page=') and query[5:].isdigit()):
+        return None, None
+    root = settings.STATIC_SITE_ROOT
+    manifest = _current_manifest(root)
+    if not manifest:
+        return None, None
+    page = manifest['pages'].get(f'{request.path}?{query}' if query else request.path)
+    if page is None:
+        return None, None
+    recorded = [manifest['versions'].get(label) for label in page['models']]
+    if model_versions(page['models']) != recorded:
+        return None, None
+    return Path(root) / page['file'], page['kind']
+
+
+def serve(request):
+    """Réponse servie depuis l'export, ou ``None`` pour laisser passer vers la vue"""
+    path, kind = lookup(request)
+    if path is None:
+        return None
+    try:
+        with open(path, 'rb') as fh:
+            content = fh.read()
+    except FileNotFoundError:
+        return None
+    public = kind == 'html' and CSRF_PLACEHOLDER.encode() not in content
+    if kind == 'html' and not public:
+        content = content.replace(CSRF_PLACEHOLDER.encode(), get_token(request).encode())
+    response = HttpResponse(content, content_type=CONTENT_TYPES[kind])
+    response.headers['X-Static-Site'] = 'hit'
+    if public:
+        # Fragment de l'accueil : ni jeton ni contenu propre au visiteur
+        patch_cache_control(response, public=True, max_age=getattr(settings, 'HOME_SECTION_MAX_AGE', 60))
+    return response
@@ -0,0 +1,310 @@
+# portfolio/synthetic.py
+"""
+Génération de données synthétiques pour les tests de charge.
+
+Tout est déterministe pour une graine donnée : mêmes textes, mêmes dates,
+mêmes images. Les dates sont comptées à rebours depuis ``DEFAULT_NOW`` (ou
+la date passée à ``seed(now=...)``), jamais depuis l'heure courante, et
+chaque table tire dans son propre générateur : ajouter un modèle ou
+retrouver le profil déjà en base ne décale pas les autres. Slugs et emails
+sont numérotés après les lignes existantes ; avec ``clear=True`` les tables
+et leurs séquences sont remises à zéro, et deux exécutions identiques
+produisent les mêmes lignes, clés primaires comprises. Les lignes sont insérées par ``bulk_create`` en lots, dans
+une transaction par lot ; les ``save()`` des modèles (calcul du slug) et
+les signaux ne sont donc pas appelés, les slugs et le rendu Markdown
+(``richtext``) sont calculés ici et le cache est invalidé une fois à la
+fin (voir ``seed()``).
+"""
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils.text import slugify
+
+from . import dashboard, richtext
+from .caching import bump_content_version, bump_model_version
+from .models import (
+    ContactInfo, ContactMessage, Feed, News, Newsletter, Partner, Profile,
+    Project, SiteSettings, Skill, SocialGallery, SocialLink,
+)
+
+# Volumes par défaut ; surchargés par les options de ``seed_data``
+DEFAULT_COUNTS = {
+    'projects': 1000,
+    'skills': 12,
+    'news': 500,
+    'partners': 50,
+    'gallery': 500,
+    'feed': 200,
+    'subscribers': 10000,
+    'messages': 5000,
+}
+
+IMAGE_SIZES = ((200, 200), (400, 400), (600, 400), (800, 600), (1200, 900), (1600, 1200))
+
+MOTS = (
+    "plateforme application mobile solution numérique communauté jeunesse entreprise "
+    "innovation formation projet développement données gestion service client réseau "
+    "santé éducation agriculture énergie transport culture sport marché paiement "
+    "Brazzaville Congo Afrique startup accompagnement impact durable collaboratif"
+).split()
+PRENOMS = "Merveil Grâce Exaucé Divine Junior Prince Christelle Océane Bienvenu Jordy Ruth Emmanuel".split()
+NOMS = "Nkounkou Bananga Mabiala Moukoko Samba Ngoma Kimbembe Malonga Bouanga Massamba Loubaki".split()
+PRENOMS_ASCII = [slugify(p) for p in PRENOMS]
+NOMS_ASCII = [slugify(n) for n in NOMS]
+DOMAINES = ("gmail.com", "yahoo.fr", "outlook.com", "hotmail.fr", "exemple.cg")
+TECHNOLOGIES = (
+    "Django", "React", "Vue.js", "PostgreSQL", "Tailwind", "Flutter", "Node.js",
+    "Docker", "Python", "TypeScript", "Redis", "Figma", "Firebase", "Laravel",
+)
+# Date de référence des dates générées : fixe pour qu'une graine suffise à tout reproduire
+DEFAULT_NOW = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+ICONES = ("fas fa-code", "fas fa-brain", "fas fa-chart-line", "fas fa-mobile-alt", "fas fa-users", "fas fa-lightbulb")
+
+
+@contextmanager
+def explicit_dates(*models):
+    """Désactive ``auto_now_add`` et ``auto_now`` le temps de l'insertion pour garder nos dates"""
+    flags = [
+        (field, flag) for model in models for field in model._meta.concrete_fields
+        for flag in ('auto_now_add', 'auto_now') if getattr(field, flag, False)
+    ]
+    for field, flag in flags:
+        setattr(field, flag, False)
+    try:
+        yield
+    finally:
+        for field, flag in flags:
+            setattr(field, flag, True)
+
+
+class Generator:
+    def __init__(self, seed=42, batch_size=5000, images=24, stdout=None, now=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.image_count = images
+        self.stdout = stdout
+        self.now = (now or DEFAULT_NOW).replace(microsecond=0)
+        self.images = {}
+
+    def reseed(self, name):
+        """Générateur propre à ``name`` : chaque table est indépendante des autres"""
+        self.rng = random.Random(f'{self.seed}:{name}')
+
+    # Texte -----------------------------------------------------------------
+
+    def words(self, n):
+        return ' '.join(self.rng.choice(MOTS) for _ in range(n))
+
+    def sentence(self, n=12):
+        return self.words(n).capitalize() + '.'
+
+    def paragraph(self, sentences=5):
+        return ' '.join(self.sentence(self.rng.randint(8, 18)) for _ in range(sentences))
+
+    def title(self):
+        return self.words(self.rng.randint(2, 5)).title()
+
+    def person(self):
+        return self.rng.choice(PRENOMS), self.rng.choice(NOMS)
+
+    def email(self, i):
+        prenom, nom = self.rng.choice(PRENOMS_ASCII), self.rng.choice(NOMS_ASCII)
+        return f"{prenom}.{nom}{i}@{self.rng.choice(DOMAINES)}"
+
+    def past(self, days=730):
+        return self.now - timedelta(seconds=self.rng.randint(0, days * 86400))
+
+    # Images ----------------------------------------------------------------
+
+    def image(self, kind):
+        """Nom de fichier d'une image de substitution (générée une seule fois)"""
+        if kind not in self.images:
+            self.images[kind] = [self._make_image(kind, i) for i in range(self.image_count)]
+        return self.rng.choice(self.images[kind])
+
+    def _make_image(self, kind, index):
+        from PIL import Image, ImageDraw
+
+        width, height = IMAGE_SIZES[index % len(IMAGE_SIZES)]
+        name = f'seed/{kind}/{self.seed}-{index}-{width}x{height}.jpg'
+        if default_storage.exists(name):
+            return name
+        rng = random.Random(f'{self.seed}:{kind}:{index}')
+        start = [rng.randint(0, 255) for _ in range(3)]
+        end = [rng.randint(0, 255) for _ in range(3)]
+        image = Image.new('RGB', (width, height))
+        draw = ImageDraw.Draw(image)
+        for y in range(height):
+            t = y / max(height - 1, 1)
+            draw.line([(0, y), (width, y)], fill=tuple(int(a + (b - a) * t) for a, b in zip(start, end)))
+        draw.text((10, 10), f'{kind} {index} {width}x{height}', fill=(255, 255, 255))
+        buffer = BytesIO()
+        image.save(buffer, 'JPEG', quality=80)
+        return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+    # Insertion -------------------------------------------------------------
+
+    def bulk(self, model, count, build):
+        """Insère ``count`` objets construits par ``build(i)``, par lots"""
+        start = time.perf_counter()
+        self.reseed(model._meta.label_lower)
+        # Indices au-delà des lignes existantes : slugs et emails restent uniques
+        offset = (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        # Pas de pre_save : colonnes *_html remplies comme le ferait signals.render_markdown
+        rendered = model._meta.label_lower in richtext.FIELDS
+        with explicit_dates(model):
+            for first in range(0, count, self.batch_size):
+                objs = [build(offset + i) for i in range(first, min(first + self.batch_size, count))]
+                if rendered:
+                    for obj in objs:
+                        richtext.render_instance(obj)
+                with transaction.atomic():
+                    model.objects.bulk_create(objs, batch_size=self.batch_size)
+        elapsed = time.perf_counter() - start
+        if self.stdout:
+            rate = count / elapsed if elapsed else 0
+            self.stdout.write(f"{model._meta.verbose_name_plural:<28} {count:>9} lignes {elapsed:>7.1f} s ({rate:,.0f}/s)")
+
+    # Modèles ---------------------------------------------------------------
+
+    def singletons(self):
+        self.reseed('singletons')
+        if not Profile.objects.exists():
+            prenom, nom = self.person()
+            Profile.objects.create(
+                nom=nom, prenom=prenom, pseudo=slugify(f'{prenom}{nom}')[:50],
+                titre_professionnel=self.title(), bio=self.paragraph(4),
+                photo_profil=self.image('profile'),
+            )
+        if not ContactInfo.objects.exists():
+            ContactInfo.objects.create(
+                telephone='+242060000000', email=self.email(0),
+                whatsapp='+242060000000', adresse='Brazzaville, Congo',
+            )
+        if not SiteSettings.objects.exists():
+            SiteSettings.objects.create()
+        existing = set(SocialLink.objects.values_list('plateforme', flat=True))
+        for i, (plateforme, label) in enumerate(SocialLink.PLATFORM_CHOICES):
+            if plateforme not in existing:
+                SocialLink.objects.create(
+                    plateforme=plateforme, url=f'https://{plateforme}.com/seed{self.seed}',
+                    nom_affichage=f'@{label.lower()}', ordre_affichage=i,
+                    sidebar_contact=i < 3,
+                )
+
+    def project(self, i):
+        titre = self.title()
+        created_at = self.past()
+        return Project(
+            titre=titre,
+            description_courte=self.sentence(20)[:300],
+            description_detaillee=self.paragraph(8),
+            image=self.image('projects'),
+            statut=self.rng.choice(Project.STATUS_CHOICES)[0],
+            technologies=self.rng.sample(TECHNOLOGIES, self.rng.randint(1, 5)),
+            slug=f'{slugify(titre)[:40]}-{i}',
+            ordre_affichage=self.rng.randint(0, 1000),
+            featured=self.rng.random() < 0.01,
+            url_demo=f'https://demo.exemple.cg/{i}' if self.rng.random() < 0.5 else None,
+            url_github=f'https://github.com/exemple/projet-{i}' if self.rng.random() < 0.5 else None,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+
+    def skill(self, i):
+        return Skill(
+            nom_competence=self.title(), description=self.paragraph(2),
+            icone_class=self.rng.choice(ICONES), ordre_affichage=i, created_at=self.past(),
+        )
+
+    def news(self, i):
+        return News(
+            titre=self.title(), description=self.paragraph(2), image=self.image('news'),
+            lien_externe=f'https://blog.exemple.cg/article-{i}',
+            plateforme=self.rng.choice(News.PLATEFORME_CHOICES)[0],
+            date_publication=self.past(), ordre_affichage=self.rng.randint(0, 100),
+        )
+
+    def partner(self, i):
+        return Partner(
+            nom_partenaire=self.title(), logo=self.image('partners'),
+            url_site=f'https://partenaire-{i}.exemple.cg', description=self.sentence(),
+            ordre_affichage=i, actif=self.rng.random() < 0.9, created_at=self.past(),
+        )
+
+    def gallery(self, i):
+        titre = self.title()
+        return SocialGallery(
+            image=self.image('gallery'), titre=titre,
+            description_courte=self.sentence(20)[:300], contenu_detaille=self.paragraph(6),
+            slug=f'{slugify(titre)[:40]}-{i}', ordre_affichage=self.rng.randint(0, 1000),
+            created_at=self.past(),
+        )
+
+    def feed(self, i):
+        return Feed(
+            image=self.image('feed'), alt_text=self.sentence(6),
+            ordre_affichage=self.rng.randint(0, 1000), created_at=self.past(),
+        )
+
+    def subscriber(self, i):
+        return Newsletter(
+            email=self.email(i), date_inscription=self.past(),
+            actif=self.rng.random() < 0.95,
+            token_desabonnement=uuid.UUID(int=self.rng.getrandbits(128), version=4),
+        )
+
+    def message(self, i):
+        prenom, nom = self.person()
+        return ContactMessage(
+            nom=f'{prenom} {nom}', email=self.email(i), sujet=self.sentence(6)[:200],
+            message=self.paragraph(self.rng.randint(1, 6)), date_envoi=self.past(365),
+            lu=self.rng.random() < 0.7,
+        )
+
+
+BUILDERS = {
+    'projects': (Project, 'project'),
+    'skills': (Skill, 'skill'),
+    'news': (News, 'news'),
+    'partners': (Partner, 'partner'),
+    'gallery': (SocialGallery, 'gallery'),
+    'feed': (Feed, 'feed'),
+    'subscribers': (Newsletter, 'subscriber'),
+    'messages': (ContactMessage, 'message'),
+}
+
+
+def seed(counts, seed=42, batch_size=5000, images=24, clear=False, stdout=None, now=None):
+    """Remplit la base selon ``counts`` (clés de ``DEFAULT_COUNTS``)"""
+    generator = Generator(seed=seed, batch_size=batch_size, images=images, stdout=stdout, now=now)
+    if clear:
+        # Vidage SQL direct (un queryset.delete() chargerait chaque ligne pour
+        # les signaux), séquences comprises : les clés primaires repartent de 1
+        tables = [model._meta.db_table for model, _ in BUILDERS.values()]
+        connection.ops.execute_sql_flush(
+            connection.ops.sql_flush(no_style(), tables, reset_sequences=True)
+        )
+    generator.singletons()
+    for name, (model, method) in BUILDERS.items():
+        count = counts.get(name, 0)
+        if count:
+            generator.bulk(model, count, getattr(generator, method))
+
+    # bulk_create et le DELETE direct n'envoient pas de signal : invalidation
+    # explicite de chaque modèle inséré ou vidé (fragments, export statique,
+    # table des liens sortants)
+    bump_content_version()
+    for model in (Profile, ContactInfo, SiteSettings, SocialLink, *(model for model, _ in BUILDERS.values())):
+        bump_model_version(model._meta.label_lower)
+    dashboard.rebuild()
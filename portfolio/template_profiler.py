@@ -0,0 +1,174 @@
+# portfolio/template_profiler.py
+"""
+Profilage du rendu des templates, activé par ``TEMPLATE_PROFILER_ENABLED``.
+
+Une fois installé, chaque rendu de template et chaque nœud (balise ou
+variable) exécuté pendant une requête est chronométré et agrégé dans un
+arbre : ``template -> {% block %} -> {% for %} -> {{ projet.status_color }}``.
+Les requêtes SQL lancées pendant le rendu (querysets évalués paresseusement
+depuis un template) sont comptées sur le nœud qui les a déclenchées.
+
+Désactivé, rien n'est installé : le moteur de templates n'est pas modifié.
+Les pages servies depuis le cache ne sont pas rendues ; pour profiler un
+rendu complet, périmer le cache (sauvegarde dans l'admin) avant la requête.
+"""
+import contextvars
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.base import Node, Template, TextNode, VariableNode
+
+RECENT_KEY = 'template-profiler:recent'
+
+_current = contextvars.ContextVar('template_profile', default=None)
+_installed = False
+
+
+class Frame:
+    __slots__ = ('label', 'count', 'total_ns', 'queries', 'children')
+
+    def __init__(self, label):
+        self.label = label
+        self.count = 0
+        self.total_ns = 0
+        self.queries = 0
+        self.children = {}
+
+    @property
+    def self_ns(self):
+        return self.total_ns - sum(child.total_ns for child in self.children.values())
+
+    def to_dict(self, min_ns=0):
+        children = sorted(self.children.values(), key=lambda f: f.total_ns, reverse=True)
+        return {
+            'label': self.label,
+            'count': self.count,
+            'total_ms': round(self.total_ns / 1e6, 3),
+            'self_ms': round(self.self_ns / 1e6, 3),
+            'queries': self.queries,
+            'children': [c.to_dict(min_ns) for c in children if c.total_ns >= min_ns],
+        }
+
+
+class Profile:
+    """Arbre des durées de rendu d'une requête"""
+
+    def __init__(self, label):
+        self.root = Frame(label)
+        self.stack = [self.root]
+        self.view_queries = 0
+        self.template_queries = 0
+
+    def enter(self, label):
+        parent = self.stack[-1]
+        frame = parent.children.get(label)
+        if frame is None:
+            frame = parent.children[label] = Frame(label)
+        frame.count += 1
+        self.stack.append(frame)
+        return frame
+
+    def exit(self, frame, elapsed_ns):
+        frame.total_ns += elapsed_ns
+        self.stack.pop()
+
+    def query(self):
+        if len(self.stack) > 1:
+            self.stack[-1].queries += 1
+            self.template_queries += 1
+        else:
+            self.view_queries += 1
+
+    def template_ns(self):
+        return sum(child.total_ns for child in self.root.children.values())
+
+    def to_dict(self):
+        min_ns = getattr(settings, 'TEMPLATE_PROFILER_MIN_MS', 0.05) * 1e6
+        return {
+            **self.root.to_dict(min_ns),
+            'template_ms': round(self.template_ns() / 1e6, 3),
+            'view_queries': self.view_queries,
+            'template_queries': self.template_queries,
+        }
+
+
+def format_tree(data, depth=0):
+    """Représentation texte de ``Profile.to_dict()`` pour les logs"""
+    line = f"{'  ' * depth}{data['total_ms']:>9.2f} ms {data['self_ms']:>8.2f} ms {data['count']:>5}×"
+    if data['queries']:
+        line += f" {data['queries']} req."
+    lines = [f"{line}  {data['label']}"]
+    for child in data['children']:
+        lines.append(format_tree(child, depth + 1))
+    return '\n'.join(lines)
+
+
+# Instrumentation -------------------------------------------------------------
+
+def _node_label(node):
+    token = getattr(node, 'token', None)
+    if token is None:
+        return type(node).__name__
+    contents = ' '.join(token.contents.split())
+    if len(contents) > 80:
+        contents = contents[:77] + '...'
+    template_name = getattr(getattr(node, 'origin', None), 'template_name', None) or '?'
+    if isinstance(node, VariableNode):
+        return f'{{{{ {contents} }}}} {template_name}:{token.lineno}'
+    return f'{{% {contents} %}} {template_name}:{token.lineno}'
+
+
+def _timed(original, label_for):
+    def wrapper(self, context):
+        profile = _current.get()
+        if profile is None or isinstance(self, TextNode):
+            return original(self, context)
+        frame = profile.enter(label_for(self))
+        start = time.perf_counter_ns()
+        try:
+            return original(self, context)
+        finally:
+            profile.exit(frame, time.perf_counter_ns() - start)
+    wrapper.__wrapped__ = original
+    return wrapper
+
+
+def install():
+    """Instrumente le moteur de templates (une seule fois par processus)"""
+    global _installed
+    if _installed:
+        return
+    Node.render_annotated = _timed(Node.render_annotated, _node_label)
+    Template._render = _timed(Template._render, lambda t: f'template {t.name or "<chaîne>"}')
+    _installed = True
+
+
+def count_query(execute, sql, params, many, context):
+    """``execute_wrapper`` : attribue la requête au nœud en cours de rendu"""
+    profile = _current.get()
+    if profile is not None:
+        profile.query()
+    return execute(sql, params, many, context)
+
+
+def start(label):
+    return _current.set(Profile(label))
+
+
+def stop(token):
+    profile = _current.get()
+    _current.reset(token)
+    return profile
+
+
+def store(data):
+    """Conserve les derniers profils dans le cache partagé (endpoint de debug)"""
+    keep = getattr(settings, 'TEMPLATE_PROFILER_KEEP', 20)
+    recent = cache.get(RECENT_KEY) or []
+    recent.insert(0, data)
+    cache.set(RECENT_KEY, recent[:keep], None)
+
+
+def recent():
+    return cache.get(RECENT_KEY) or []
@@ -0,0 +1,82 @@
+# portfolio/templatetags/portfolio_tags.py
+import hashlib
+import time
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.safestring import mark_safe
+
+from portfolio import dashboard, outbound
+from portfolio.caching import model_versions, record_fragment
+
+register = template.Library()
+
+# Fragments de base.html et modèles qu'ils affichent
+FRAGMENTS = {
+    'favicon': ('portfolio.sitesettings',),
+    'header': ('portfolio.profile',),
+    'sidebar': ('portfolio.contactinfo', 'portfolio.sociallink'),
+    'footer': ('portfolio.profile', 'portfolio.sociallink'),
+}
+
+
+class FragmentNode(template.Node):
+    def __init__(self, name, nodelist, vary_on):
+        self.name = name
+        self.nodelist = nodelist
+        self.vary_on = vary_on
+
+    def cache_key(self, context):
+        parts = [str(v) for v in model_versions(FRAGMENTS[self.name])]
+        parts += [str(var.resolve(context)) for var in self.vary_on]
+        digest = hashlib.sha1(':'.join(parts).encode('utf-8')).hexdigest()
+        return f'fragment:{self.name}:{digest}'
+
+    def render(self, context):
+        start = time.perf_counter_ns()
+        key = self.cache_key(context)
+        html = cache.get(key)
+        hit = html is not None
+        if not hit:
+            html = self.nodelist.render(context)
+            cache.set(key, html, getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 3600))
+        record_fragment(self.name, hit, time.perf_counter_ns() - start)
+        return mark_safe(html)
+
+
+@register.tag
+def fragment(parser, token):
+    """
+    Met en cache le rendu d'un bloc commun à toutes les pages::
+
+        {% fragment 'header' profile.pk %} ... {% endfragment %}
+
+    La clé dépend de la version des modèles déclarés dans ``FRAGMENTS``
+    (incrémentée à chaque sauvegarde, voir ``signals.py``) et des
+    expressions facultatives passées après le nom.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' attend le nom du fragment")
+    name = bits[1].strip('\'"')
+    if name not in FRAGMENTS:
+        raise template.TemplateSyntaxError(f"Fragment inconnu : {name!r}")
+    nodelist = parser.parse(('endfragment',))
+    parser.delete_first_token()
+    return FragmentNode(name, nodelist, [parser.compile_filter(bit) for bit in bits[2:]])
+
+
+@register.filter
+def lien_suivi(obj):
+    """
+    Lien externe d'une actualité, d'un partenaire ou d'un lien social, passé
+    par la redirection qui compte les clics : ``href="{{ partner|lien_suivi }}"``.
+    """
+    return outbound.link_for(obj)
+
+
+@register.simple_tag
+def tableau_de_bord():
+    """Statistiques de l'accueil de l'admin : ``{% tableau_de_bord as stats %}``"""
+    return dashboard.stats()
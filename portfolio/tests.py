@@ -1,3 +1,615 @@
-from django.test import TestCase
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+import zlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.admin.sites import site
+from django.core.cache import cache
+from django.db import connection
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from theme import assets
+
+from . import archive, caching, dashboard, metrics, middleware, outbound, page_views, richtext, routers, sections, static_site, synthetic, views
+from .cache_backends import SQLiteCache
+from .models import ClicSortant, ContactMessage, Feed, News, Partner, Project, SocialGallery, StatistiquesJour
+from .throttling import RateWindow
+
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+# Cache en mémoire et rien d'écrit dans logs/ ou cache/ pendant les tests
+@override_settings(
+    CACHES=TEST_CACHES,
+    ACCESS_LOG_ENABLED=False,
+    METRICS_ENABLED=False,
+    OUTBOUND_TRACKING_ENABLED=False,
+    STATIC_SITE_ENABLED=False,
+    VIEW_COUNT_ENABLED=False,
+)
+class PortfolioTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Clics en attente : jamais écrits par atexit dans la vraie base après les tests
+        self.addCleanup(outbound._pending.clear)
+
+
+class ArchiveFindTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def _message(self, local):
+        msg = ContactMessage.objects.create(nom='Test', email='Test@Exemple.cg', sujet='Sujet', message='Message')
+        ContactMessage.objects.filter(pk=msg.pk).update(date_envoi=timezone.make_aware(local), lu=True)
+        return msg.pk
+
+    def test_bornes_en_heure_locale(self):
+        # 00:30 à Brazzaville = 23:30 UTC la veille
+        minuit_et_demie = self._message(datetime(2025, 6, 29, 0, 30))
+        veille = self._message(datetime(2025, 6, 28, 23, 30))
+        archive.archive_messages(days=0, root=self.root)
+
+        with archive.ArchiveIndex(self.root) as index:
+            ids = [row[0] for row in index.find(
+                date_from=timezone.make_aware(datetime(2025, 6, 29)),
+                date_to=timezone.make_aware(datetime(2025, 6, 30)),
+            )]
+            self.assertEqual(ids, [minuit_et_demie])
+            ids = [row[0] for row in index.find(date_to=timezone.make_aware(datetime(2025, 6, 29)))]
+            self.assertEqual(ids, [veille])
+            self.assertEqual(len(index.find(email='test@exemple.cg')), 2)
+
+
+# Une horloge figée évite un changement de fenêtre en plein test
+@mock.patch('portfolio.throttling.time.time', return_value=1_750_000_010.0)
+class ThrottleTests(PortfolioTestCase):
+    def _contact(self, **overrides):
+        data = {'nom': 'Test', 'email': 'test@exemple.cg', 'sujet': 'Sujet', 'message': 'Bonjour', **overrides}
+        return self.client.post(reverse('portfolio:contact_message'), data)
+
+    @override_settings(THROTTLE_RATES={'contact_ip': '2/min', 'contact_email': '100/hour'})
+    def test_429_avec_retry_after(self, _time):
+        self.assertEqual(self._contact(sujet='Un').status_code, 200)
+        self.assertEqual(self._contact(sujet='Deux').status_code, 200)
+        response = self._contact(sujet='Trois')
+        self.assertEqual(response.status_code, 429)
+        # 10 s jusqu'à la fin de la fenêtre, puis 30 s pour que ses deux envois ne pèsent plus que 1
+        self.assertEqual(response['Retry-After'], '40')
+        self.assertEqual(ContactMessage.objects.count(), 2)
+
+    def test_pas_de_rafale_a_la_frontiere(self, clock):
+        window = RateWindow('test:frontiere', 4, 60)
+        clock.return_value = 1_750_000_019.0  # une seconde avant la fin de la fenêtre
+        self.assertEqual([window.consume() for _ in range(4)], [0, 0, 0, 0])
+        clock.return_value = 1_750_000_021.0  # une seconde après
+        self.assertGreater(window.consume(), 0)
+        # Le quota revient progressivement : à mi-fenêtre, la précédente ne pèse plus que 2
+        clock.return_value = 1_750_000_050.0
+        self.assertEqual([window.consume() == 0 for _ in range(3)], [True, True, False])
+        # Les requêtes refusées ne sont pas comptées
+        self.assertEqual(cache.get(f'{window.key}:{int(1_750_000_050 // 60)}'), 2)
+
+    def test_requetes_simultanees(self, _time):
+        passed = []
+
+        def consume():
+            if RateWindow('test:concurrence', 5, 60).consume() == 0:
+                passed.append(1)
+
+        threads = [threading.Thread(target=consume) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(passed), 5)
+
+    @override_settings(THROTTLE_RATES={'contact_ip': '100/min', 'contact_email': '100/hour'})
+    def test_doublon_apres_echec_puis_succes(self, _time):
+        trop_long = self._contact(message='x' * 2001)
+        self.assertFalse(trop_long.json()['success'])
+        # Le premier envoi a échoué : le même contenu peut être renvoyé
+        self.assertNotEqual(self._contact(message='x' * 2001).status_code, 409)
+        self.assertTrue(self._contact().json()['success'])
+        self.assertEqual(self._contact().status_code, 409)
+        self.assertEqual(self._contact(email='TEST@Exemple.cg').status_code, 409)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+
+
+class PageCacheTests(PortfolioTestCase):
+    def test_cle_ignore_les_parametres_non_lus(self):
+        factory = RequestFactory()
+        key = caching.request_cache_key('projets', factory.get('/projets/', {'page': 2, 'tri': 'populaires'}))
+        self.assertEqual(
+            key,
+            caching.request_cache_key('projets', factory.get('/projets/?utm_source=x&tri=populaires&page=2&x=123')),
+        )
+        self.assertNotEqual(key, caching.request_cache_key('projets', factory.get('/projets/', {'page': 3})))
+
+    def test_page_en_cache_sans_parametres_du_premier_visiteur(self):
+        project = Project.objects.create(
+            titre='Projet', description_courte='Court', description_detaillee='Long', image='projects/test.jpg',
+        )
+        for url in (reverse('portfolio:index'), project.get_absolute_url()):
+            self.assertEqual(self.client.get(url, {'utm_source': 'attacker-evil'}).status_code, 200)
+            html = self.client.get(url, {'utm_source': 'autre'}).content.decode()
+            self.assertNotIn('attacker-evil', html)
+            self.assertIn(f'content="http://testserver{url}"', html)
+
+    @override_settings(PAGE_CACHE_WAIT=0.2)
+    def test_attente_bornee_si_un_autre_worker_construit(self):
+        # Verrou tenu par un constructeur qui ne finit jamais
+        cache.add('page:test:lock', 1, 30)
+        start = time.monotonic()
+        self.assertEqual(caching.get_or_build('page:test', lambda: 'rendu local'), 'rendu local')
+        self.assertLess(time.monotonic() - start, 2)
+
+
+class SeedTests(PortfolioTestCase):
+    def test_seed_perime_tous_les_modeles(self):
+        labels = [model._meta.label_lower for model, _ in synthetic.BUILDERS.values()]
+        before = caching.model_versions(labels)
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        with override_settings(MEDIA_ROOT=media):
+            synthetic.seed({'projects': 2, 'news': 2, 'gallery': 2, 'feed': 1}, images=1)
+        after = caching.model_versions(labels)
+        self.assertTrue(all(a != b for a, b in zip(before, after)))
+        for model in (Project, News, SocialGallery):
+            self.assertFalse(model.objects.exclude(rendu_version=richtext.VERSION).exists())
+            self.assertFalse(model.objects.filter(extrait='').exists())
+
+    def test_meme_graine_memes_donnees(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        counts = {'projects': 3, 'skills': 2, 'subscribers': 4, 'messages': 3}
+        models = [synthetic.BUILDERS[name][0] for name in counts]
+
+        def snapshot():
+            return [list(model.objects.order_by('pk').values_list()) for model in models]
+
+        def dates():
+            return list(Project.objects.order_by('pk').values_list('created_at', flat=True))
+
+        with override_settings(MEDIA_ROOT=media):
+            synthetic.seed(counts, seed=7, images=1, clear=True)
+            first, first_dates = snapshot(), dates()
+            # Le profil existe désormais : les autres tables ne doivent pas en dépendre
+            synthetic.seed(counts, seed=7, images=1, clear=True)
+            self.assertEqual(snapshot(), first)
+            self.assertTrue(all(date <= synthetic.DEFAULT_NOW for date in first_dates))
+            # --now décale les dates sans toucher au reste
+            now = datetime(2026, 10, 19, tzinfo=dt_timezone.utc)
+            synthetic.seed(counts, seed=7, images=1, clear=True, now=now)
+        self.assertEqual(dates(), [date + (now - synthetic.DEFAULT_NOW) for date in first_dates])
+
+
+class StaticExportTests(PortfolioTestCase):
+    def test_export_complet_sans_echec(self):
+        for i in range(2):
+            Project.objects.create(
+                titre=f'Projet {i}', description_courte='Court', description_detaillee='Long', image='projects/test.jpg',
+            )
+            SocialGallery.objects.create(
+                titre=f'Galerie {i}', description_courte='Court', contenu_detaille='Long', image='gallery/test.jpg',
+            )
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        result = static_site.export(root=root, base_url='https://exemple.cg')
+        self.assertEqual(result['failed'], [])
+        manifest = static_site.read_manifest(root)
+        for name in ('tous_projets', 'toute_galerie'):
+            self.assertIn(reverse(f'portfolio:{name}'), manifest['pages'])
+
+
+class AdminActionTests(PortfolioTestCase):
+    def test_actions_groupees_perime_l_export(self):
+        project = Project.objects.create(titre='Projet', description_courte='Court', description_detaillee='Long')
+        label = Project._meta.label_lower
+        admin = site._registry[Project]
+        request = RequestFactory().post('/admin/')
+        for action in (admin.marquer_featured, admin.retirer_featured):
+            before = caching.model_versions([label])
+            with mock.patch.object(admin, 'message_user'):
+                action(request, Project.objects.filter(pk=project.pk))
+            self.assertNotEqual(caching.model_versions([label]), before)
+
+
+@override_settings(OUTBOUND_MAP_CHECK_INTERVAL=0)
+class OutboundTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.partner = Partner.objects.create(nom_partenaire='Partenaire', url_site='https://exemple.cg/')
+
+    @override_settings(OUTBOUND_TRACKING_ENABLED=True)
+    def test_redirection_signee(self):
+        response = self.client.get(outbound.link_for(self.partner))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], 'https://exemple.cg/')
+        outbound.flush(force=True)
+        self.assertEqual(list(ClicSortant.objects.values_list('cible', 'objet_id')), [('p', self.partner.pk)])
+        self.assertEqual(outbound._pending, [])
+
+    def test_signature_invalide_refusee(self):
+        token = outbound.sign('p', self.partner.pk)
+        forged = token.replace(f'p-{self.partner.pk}', f'p-{self.partner.pk + 1}')
+        request = RequestFactory().get('/go/')
+        for bad in (forged, token[:-1] + ('A' if token[-1] != 'A' else 'B'), f'p-{self.partner.pk}'):
+            with self.assertRaises(Http404):
+                views.outbound_redirect(request, bad)
+
+
+class DashboardTests(PortfolioTestCase):
+    def test_recomptage_garde_les_messages_archives(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        hier = timezone.localdate() - timedelta(days=1)
+        for _ in range(2):
+            msg = ContactMessage.objects.create(nom='Test', email='test@exemple.cg', sujet='Sujet', message='Message')
+            ContactMessage.objects.filter(pk=msg.pk).update(date_envoi=timezone.make_aware(datetime.combine(hier, datetime.min.time())))
+        with override_settings(CONTACT_ARCHIVE_DIR=root):
+            dashboard.rebuild()
+            self.assertEqual(StatistiquesJour.objects.get(jour=hier).messages, 2)
+            archive.archive_messages(days=0)
+            dashboard.rebuild()
+        self.assertEqual(ContactMessage.objects.count(), 0)
+        self.assertEqual(StatistiquesJour.objects.get(jour=hier).messages, 2)
+
+
+class MarkdownTests(PortfolioTestCase):
+    def _project(self, texte):
+        return Project.objects.create(titre='Projet', description_courte='Court', description_detaillee=texte)
+
+    def test_rendu_a_la_sauvegarde(self):
+        project = self._project('Un **projet** avec [lien](https://exemple.cg/).')
+        self.assertIn('<strong>projet</strong>', project.description_detaillee_html)
+        self.assertIn('rel="nofollow noopener"', project.description_detaillee_html)
+        self.assertTrue(project.extrait.startswith('Un projet avec lien'))
+        self.assertEqual(project.rendu_version, richtext.VERSION)
+
+        project.description_detaillee = 'Nouveau texte'
+        project.save(update_fields=['description_detaillee'])
+        project.refresh_from_db()
+        self.assertEqual(project.description_detaillee_html, '<p>Nouveau texte</p>\n')
+
+    def test_liens_et_html_dangereux_refuses(self):
+        html = self._project(
+            '[a](javascript:alert(1)) [b](JavaScript:alert(1)) [c](data:text/html,x) <script>alert(1)</script>'
+        ).description_detaillee_html
+        self.assertNotIn('href="javascript:', html.lower())
+        self.assertNotIn('href="data:', html)
+        self.assertNotIn('<script>', html)
+
+
+class SectionTests(PortfolioTestCase):
+    def test_curseur_mal_forme(self):
+        debordements = ('1.99999999999999999999.1', f'{2**31}.0.1', f'{2**70}.0.1', f'0.0.{2**63}', '0.0.0', '0.0.-1')
+        for bad in ('', 'abc', '1.2', '1.2.3.4', '1.x.3') + debordements:
+            with self.assertRaises(sections.InvalidCursor):
+                sections.decode_cursor(bad)
+        for bad in debordements:
+            with self.assertRaises(Http404):
+                views.section(RequestFactory().get(sections.url('galerie'), {'apres': bad}), 'galerie')
+        feed = Feed(ordre_affichage=3, created_at=datetime(2025, 6, 29, 12, 0, 0, 123456, tzinfo=dt_timezone.utc), pk=7)
+        self.assertEqual(sections.decode_cursor(sections.encode_cursor(feed)), (3, feed.created_at, 7))
+
+    def test_pagination_par_cle_avec_egalites(self):
+        # Même ordre et même date pour la plupart : seul l'id départage
+        meme_date = timezone.make_aware(datetime(2025, 6, 29, 12, 0))
+        for i in range(20):
+            feed = Feed.objects.create(image='feed/test.jpg', alt_text=f'Image {i}', ordre_affichage=i % 2)
+            Feed.objects.filter(pk=feed.pk).update(created_at=meme_date - timedelta(minutes=1 if i % 3 == 0 else 0))
+        attendu = list(Feed.objects.order_by('ordre_affichage', '-created_at', 'pk').values_list('pk', flat=True))
+
+        vus, cursor = [], None
+        while True:
+            items, suite = sections.page(Feed, 'feed', cursor)
+            vus += [item.pk for item in items]
+            if not suite:
+                break
+            cursor = suite.split('apres=', 1)[1]
+        self.assertEqual(vus, attendu)
+
+    def test_repli_sans_javascript(self):
+        html = self.client.get(reverse('portfolio:index')).content.decode()
+        # Liens dans <noscript> : gabarit minifié, espaces non significatifs
+        fallbacks = ' '.join(html.split('<noscript>')[1:])
+        for url in [sections.url(name) for name in ('competences', 'actualites', 'feed', 'partenaires')] + [reverse('portfolio:toute_galerie')]:
+            self.assertIn(f'href="{url}"', fallbacks)
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class MetricsTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        self.addCleanup(metrics._pending.clear)
+        metrics._pending.clear()
+        settings = override_settings(METRICS_ENABLED=True, METRICS_LOCATION=f'{root}/metrics.sqlite3')
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_fichier_verrouille_sans_erreur_500(self):
+        locked = sqlite3.OperationalError('database is locked')
+        with mock.patch('portfolio.metrics._connection', side_effect=locked), self.assertLogs('portfolio.metrics', 'ERROR'):
+            with override_settings(METRICS_FLUSH_INTERVAL=0):
+                response = self.client.get(sections.url('competences'))
+            self.assertEqual(response.status_code, 200)
+            for thread in threading.enumerate():
+                if thread.name == 'metrics-flush':
+                    thread.join()
+        # Valeurs gardées pour le flush suivant, qui les écrit
+        self.assertTrue(metrics._pending)
+        metrics.flush(force=True)
+        self.assertFalse(metrics._pending)
+        self.assertIn('portfolio_http_requests_total{', metrics.render())
+
+
+class ListingTests(PortfolioTestCase):
+    def _projects(self, vues):
+        return [
+            Project.objects.create(
+                titre=f'Projet {i}', description_courte='Court', description_detaillee='Long',
+                image='projects/test.jpg', ordre_affichage=i, vues=n,
+            ).pk
+            for i, n in enumerate(vues)
+        ]
+
+    def _order(self, params=None):
+        response = self.client.get(reverse('portfolio:tous_projets'), params)
+        self.assertEqual(response.status_code, 200)
+        return [int(pk) for pk in re.findall(r'data-projet="(\d+)"', response.content.decode())]
+
+    def test_tri_populaires(self):
+        pks = self._projects([5, 50, 0, 20])
+        self.assertEqual(self._order(), pks)
+        page_views.refresh_ranks()
+        self.assertEqual(self._order({'tri': 'populaires'}), [pks[1], pks[3], pks[0], pks[2]])
+        # Nouveau classement : nouvelle clé de cache, pas la page déjà rendue
+        Project.objects.filter(pk=pks[2]).update(vues=100)
+        page_views.refresh_ranks()
+        self.assertEqual(self._order({'tri': 'populaires'})[0], pks[2])
+
+    def test_galerie_paginee(self):
+        response = self.client.get(reverse('portfolio:toute_galerie'), {'page': 2})
+        self.assertEqual(response.status_code, 200)
+
+
+class IconAssetsTests(PortfolioTestCase):
+    # Extrait de la structure de fontawesome-free/css/all.css (6.x)
+    FONTAWESOME_CSS = """
+    .fa-solid,.fas{font-family:var(--fa-style-family,"Font Awesome 6 Free");font-weight:900}
+    .fa-fw{text-align:center;width:1.25em}
+    .fa-spin{-webkit-animation-name:fa-spin;animation-name:fa-spin;animation-duration:var(--fa-animation-duration,2s)}
+    .fa-pulse,.fa-spin-pulse{animation-name:fa-spin;animation-timing-function:steps(8)}
+    .fa-beat{animation-name:fa-beat}
+    @media (prefers-reduced-motion:reduce){.fa-beat,.fa-spin{animation-duration:1ms}}
+    @-webkit-keyframes fa-spin{0%{transform:rotate(0deg)}to{transform:rotate(1turn)}}
+    @keyframes fa-spin{0%{transform:rotate(0deg)}to{transform:rotate(1turn)}}
+    @keyframes fa-beat{0%{transform:scale(1)}}
+    .fa-spinner:before{content:"\\f110"}
+    .fa-code:before{content:"\\f121"}
+    """
+
+    def test_utilitaires_et_animations_conserves(self):
+        css = assets.icon_utility_css(self.FONTAWESOME_CSS, {'spinner', 'spin', 'fw', 'solid'})
+        self.assertIn('.fa-spin{', css)
+        self.assertIn('.fa-fw{', css)
+        self.assertIn('@keyframes fa-spin{', css)
+        self.assertIn('@-webkit-keyframes fa-spin{', css)
+        self.assertIn('@media (prefers-reduced-motion:reduce){.fa-spin{', css)
+        for absent in ('fa-beat', 'fa-pulse', 'fa-solid', 'content:'):
+            self.assertNotIn(absent, css)
+
+    def test_classes_des_gabarits(self):
+        with mock.patch.object(assets, 'python_files', return_value=[]):
+            used = assets.collect_icon_classes()
+        self.assertTrue({'spinner', 'spin'} <= used)
+
+
+class SQLiteCacheTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def _cache(self, **options):
+        return SQLiteCache(f'{self.root}/cache.sqlite3', {'TIMEOUT': 300, 'OPTIONS': options})
+
+    def _threads(self, target, count=16):
+        threads = [threading.Thread(target=target) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_add_atomique(self):
+        backend = self._cache()
+        added = []
+        self._threads(lambda: added.append(backend.add('verrou', 1, 30)))
+        self.assertEqual(added.count(True), 1)
+        # Clé expirée : de nouveau libre
+        backend.set('verrou', 1, -1)
+        self.assertTrue(backend.add('verrou', 2, 30))
+        self.assertEqual(backend.get('verrou'), 2)
+
+    def test_incr_atomique(self):
+        backend = self._cache()
+        backend.set('compteur', 0)
+
+        def incr():
+            for _ in range(25):
+                backend.incr('compteur')
+
+        self._threads(incr, count=8)
+        self.assertEqual(backend.get('compteur'), 200)
+        with self.assertRaises(ValueError):
+            backend.incr('absente')
+
+    @mock.patch('portfolio.throttling.time.time', return_value=1_750_000_010.0)
+    def test_fenetre_de_debit_sur_sqlite(self, _time):
+        location = f'{self.root}/partage.sqlite3'
+        with override_settings(CACHES={'default': {'BACKEND': 'portfolio.cache_backends.SQLiteCache', 'LOCATION': location}}):
+            passed = []
+
+            def consume():
+                if RateWindow('test:sqlite', 5, 60).consume() == 0:
+                    passed.append(1)
+
+            self._threads(consume, count=20)
+        self.assertEqual(len(passed), 5)
+
+    def test_eviction_lru(self):
+        backend = self._cache(MAX_ENTRIES=10, CULL_EVERY=1, ACCESS_RESOLUTION=0)
+        clock = iter(range(1_000, 2_000))
+        with mock.patch('portfolio.cache_backends.time.time', side_effect=lambda: float(next(clock))):
+            for i in range(10):
+                backend.set(f'cle{i}', i)
+            backend.get('cle0')  # relue : devient la plus récente
+            backend.set('cle10', 10)
+            # 11 entrées > 10 : le tiers le moins récemment lu part (CULL_FREQUENCY=3)
+            present = [i for i in range(11) if backend.has_key(f'cle{i}')]
+        self.assertEqual(present, [0, 4, 5, 6, 7, 8, 9, 10])
+
+    def test_plafond_en_octets(self):
+        backend = self._cache(MAX_BYTES=20_000, CULL_EVERY=1)
+        for i in range(10):
+            backend.set(f'gros{i}', 'x' * 5_000)
+        sizes = backend._connection().execute('SELECT COUNT(*), SUM(size) FROM cache').fetchone()
+        self.assertLessEqual(sizes[1], 20_000)
+        self.assertTrue(backend.has_key('gros9'))
+
+
+class CompressionTests(PortfolioTestCase):
+    BODY = ('{"projets": [%s]}' % ','.join(f'"projet {i}"' for i in range(200))).encode()
+
+    def _get(self, accept=None, response=None):
+        headers = {'HTTP_ACCEPT_ENCODING': accept} if accept is not None else {}
+        request = RequestFactory().get('/api/projects/', **headers)
+        if response is None:
+            response = HttpResponse(self.BODY, content_type='application/json')
+        return middleware.CompressionMiddleware(lambda request: response)(request)
+
+    def _vary(self, response):
+        return [v.strip() for v in response.get('Vary', '').split(',') if v.strip()]
+
+    @unittest.skipIf(middleware.brotli is None, "brotli non installé")
+    def test_brotli_prefere(self):
+        response = self._get('gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('Accept-Encoding', self._vary(response))
+        self.assertEqual(middleware.brotli.decompress(response.content), self.BODY)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+
+    def test_gzip_selon_les_qualites(self):
+        for accept in ('gzip', 'br;q=0.5, gzip', 'br;q=0, *'):
+            response = self._get(accept)
+            self.assertEqual(response['Content-Encoding'], 'gzip', accept)
+            self.assertIn('Accept-Encoding', self._vary(response))
+            self.assertEqual(zlib.decompress(response.content, 31), self.BODY)
+
+    def test_sans_encodage_accepte(self):
+        for accept in (None, 'identity', 'gzip;q=0, br;q=0'):
+            response = self._get(accept)
+            self.assertFalse(response.has_header('Content-Encoding'), accept)
+            # La réponse dépend quand même de l'en-tête : les caches doivent le savoir
+            self.assertIn('Accept-Encoding', self._vary(response))
+            self.assertEqual(response.content, self.BODY)
+
+    def test_petite_reponse_ou_deja_encodee(self):
+        small = self._get('gzip', HttpResponse(b'{}', content_type='application/json'))
+        self.assertFalse(small.has_header('Content-Encoding'))
+        self.assertNotIn('Accept-Encoding', self._vary(small))
+        encoded = HttpResponse(self.BODY, content_type='application/json', headers={'Content-Encoding': 'gzip'})
+        self.assertEqual(self._get('gzip', encoded).content, self.BODY)
+
+    def test_etag_fort_devient_faible(self):
+        response = HttpResponse(self.BODY, content_type='application/json', headers={'ETag': '"abc"'})
+        self.assertEqual(self._get('gzip', response)['ETag'], 'W/"abc"')
+
+    def test_flux_compresse_par_morceau(self):
+        chunks = [self.BODY[i:i + 1000] for i in range(0, len(self.BODY), 1000)]
+        response = self._get('gzip', StreamingHttpResponse(iter(chunks), content_type='text/html'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertEqual(zlib.decompress(b''.join(response.streaming_content), 31), self.BODY)
+
+
+@override_settings(REPLICA_PIN_COOKIE='primary_pin', REPLICA_PIN_SECONDS=10)
+class ReplicaRoutingTests(PortfolioTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('portfolio.routers.replica_aliases', return_value=['replica_1'])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.router = routers.PrimaryReplicaRouter()
+
+    def _request(self, view, path='/', cookies=None, atomic=False):
+        request = RequestFactory().get(path)
+        request.COOKIES.update(cookies or {})
+        # TestCase ouvre un bloc atomique sur le primaire : neutralisé sauf demande
+        with mock.patch.object(connection, 'in_atomic_block', atomic):
+            return middleware.ReplicaRoutingMiddleware(view)(request)
+
+    def test_lectures_hors_requete_sur_le_primaire(self):
+        # Commandes de gestion, shell : pas d'état de routage
+        self.assertEqual(self.router.db_for_read(Project), 'default')
+
+    def test_ecriture_epingle_la_suite_et_pose_le_cookie(self):
+        seen = []
+
+        def view(request):
+            seen.append(self.router.db_for_read(Project))
+            seen.append(self.router.db_for_write(Project))
+            seen.append(self.router.db_for_read(Project))
+            return HttpResponse()
+
+        response = self._request(view)
+        self.assertEqual(seen, ['replica_1', 'default', 'default'])
+        cookie = response.cookies['primary_pin']
+        self.assertEqual(cookie['max-age'], 10)
+        self.assertTrue(cookie['httponly'])
+
+    def test_cookie_apres_un_vrai_formulaire(self):
+        response = self.client.post(reverse('portfolio:contact_message'), {
+            'nom': 'Test', 'email': 'test@exemple.cg', 'sujet': 'Sujet', 'message': 'Bonjour',
+        })
+        self.assertTrue(response.json()['success'])
+        self.assertIn('primary_pin', response.cookies)
+        self.assertNotIn('primary_pin', self.client.get(sections.url('competences')).cookies)
+
+    def test_lecture_seule_sans_cookie(self):
+        seen = []
+
+        def view(request):
+            seen.append(self.router.db_for_read(Project))
+            return HttpResponse()
+
+        response = self._request(view)
+        self.assertEqual(seen, ['replica_1'])
+        self.assertNotIn('primary_pin', response.cookies)
+
+    def test_visiteur_epingle_admin_et_transaction(self):
+        seen = []
+
+        def view(request):
+            seen.append(self.router.db_for_read(Project))
+            return HttpResponse()
+
+        self._request(view, cookies={'primary_pin': '1'})
+        self._request(view, path=reverse('admin:index'))
+        self.assertEqual(seen, ['default', 'default'])
+
+        self._request(view, atomic=True)
+        self.assertEqual(seen, ['default', 'default', 'default'])
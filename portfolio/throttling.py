@@ -0,0 +1,210 @@
+# portfolio/throttling.py
+"""
+Limitation de débit des endpoints publics en écriture (contact, newsletter).
+
+Chaque client dispose d'un compteur par fenêtre fixe stocké dans le cache,
+par IP et par email. ``cache.add`` puis ``cache.incr`` sont atomiques (y
+compris dans ``SQLiteCache``) : des requêtes simultanées ne peuvent pas
+toutes lire le même compteur et passer ensemble.
+
+Un compteur par fenêtre fixe seul laisserait passer deux fois la capacité
+de part et d'autre d'une frontière de fenêtre. La décision utilise donc une
+fenêtre glissante estimée : le compteur de la fenêtre précédente, pondéré
+par la part de celle-ci encore couverte par la période glissante, s'ajoute
+au compteur courant. Un client qui a épuisé son quota en fin de fenêtre le
+retrouve progressivement, pas d'un coup à la frontière. Les requêtes
+excédentaires reçoivent un ``429`` avec l'en-tête ``Retry-After`` (délai
+avant que l'estimation repasse sous la capacité) avant toute écriture en
+base ou envoi de mail, et ne sont pas comptées.
+
+Les doublons exacts (même nom, email, sujet et message) sont détectés par
+une empreinte SHA-256 réservée dans le cache avant la vue, et libérée si la
+vue échoue : seul un envoi réussi bloque sa répétition.
+"""
+import hashlib
+import json
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+
+PERIODS = {
+    's': 1, 'sec': 1, 'second': 1,
+    'm': 60, 'min': 60, 'minute': 60,
+    'h': 3600, 'hour': 3600,
+    'd': 86400, 'day': 86400,
+}
+
+DEFAULT_RATES = {
+    'contact_ip': '5/min',
+    'contact_email': '3/hour',
+    'newsletter_ip': '10/min',
+    'newsletter_email': '3/hour',
+}
+
+
+def parse_rate(rate):
+    """'5/min' -> (capacité, secondes par période)"""
+    num, period = rate.split('/')
+    return int(num), PERIODS[period.strip().lower()]
+
+
+def get_rate(name):
+    rates = {**DEFAULT_RATES, **getattr(settings, 'THROTTLE_RATES', {})}
+    rate = rates.get(name)
+    return parse_rate(rate) if rate else None
+
+
+def get_client_ip(request):
+    """IP du client, en tenant compte des proxys de confiance (Render)"""
+    num_proxies = getattr(settings, 'THROTTLE_NUM_PROXIES', 0)
+    if num_proxies:
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        addrs = [a.strip() for a in forwarded.split(',') if a.strip()]
+        if addrs:
+            return addrs[-min(num_proxies, len(addrs))]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+class RateWindow:
+    """Compteur de requêtes en fenêtre glissante estimée, stocké dans le cache Django"""
+
+    def __init__(self, key, capacity, period):
+        self.key = f"throttle:{key}"
+        self.capacity = capacity
+        self.period = period
+
+    def _incr(self, key):
+        # La fenêtre sert encore de « précédente » pendant la période suivante
+        timeout = 2 * self.period + 1
+        if cache.add(key, 1, timeout):
+            return 1
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Clé expirée entre les deux appels : nouvelle fenêtre
+            cache.add(key, 1, timeout)
+            return 1
+
+    def consume(self):
+        """Retourne 0 si la requête passe, sinon le délai d'attente en secondes"""
+        now = time.time()
+        window = int(now // self.period)
+        elapsed = now - window * self.period
+        key = f"{self.key}:{window}"
+        count = self._incr(key)
+        previous = cache.get(f"{self.key}:{window - 1}", 0)
+        if previous * (1 - elapsed / self.period) + count <= self.capacity:
+            return 0
+        # Refusée : elle ne doit pas peser sur la fenêtre suivante
+        try:
+            cache.decr(key)
+        except ValueError:
+            pass
+        return self._wait(elapsed, previous, count - 1)
+
+    def _wait(self, elapsed, previous, current):
+        """Secondes avant que ``previous`` pondéré + ``current`` laisse passer une requête"""
+        room = self.capacity - current - 1
+        if room >= 0:
+            # Attendre que la fenêtre précédente pèse assez peu
+            return max(0.0, (1 - room / previous) * self.period - elapsed)
+        # Fenêtre courante pleine : c'est elle qui devra s'estomper dans la suivante
+        fraction = 1 - (self.capacity - 1) / current if current else 1
+        return self.period - elapsed + max(0.0, fraction) * self.period
+
+
+def _request_data(request):
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body)
+        except (ValueError, UnicodeDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+    return request.POST
+
+
+def _too_many_requests(wait):
+    response = JsonResponse({
+        'success': False,
+        'message': 'Trop de requêtes. Veuillez réessayer dans quelques instants.'
+    }, status=429)
+    response['Retry-After'] = str(max(1, math.ceil(wait)))
+    return response
+
+
+def claim_fingerprint(scope, values):
+    """Réserve l'empreinte de ``values`` ; retourne sa clé, ou ``None`` si déjà vue récemment"""
+    digest = hashlib.sha256('\x1f'.join(values).encode('utf-8')).hexdigest()
+    key = f"throttle:dup:{scope}:{digest}"
+    window = getattr(settings, 'THROTTLE_DUPLICATE_WINDOW', 3600)
+    return key if cache.add(key, 1, window) else None
+
+
+def _succeeded(response):
+    """Réponse 2xx dont le JSON ne signale pas d'échec (les vues répondent 200 en cas d'erreur)"""
+    if not 200 <= response.status_code < 300:
+        return False
+    if response.get('Content-Type', '').startswith('application/json'):
+        try:
+            return json.loads(response.content).get('success', True) is not False
+        except (ValueError, AttributeError):
+            return True
+    return True
+
+
+def throttle(scope, duplicate_fields=None):
+    """
+    Décorateur de vue : seaux par IP (``<scope>_ip``) et par email
+    (``<scope>_email``), puis détection optionnelle des doublons.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not getattr(settings, 'THROTTLE_ENABLED', True):
+                return view_func(request, *args, **kwargs)
+
+            rate = get_rate(f"{scope}_ip")
+            if rate:
+                wait = RateWindow(f"{scope}:ip:{get_client_ip(request)}", *rate).consume()
+                if wait:
+                    return _too_many_requests(wait)
+
+            data = _request_data(request)
+            email = str(data.get('email', '')).strip().lower()
+            rate = get_rate(f"{scope}_email")
+            if email and rate:
+                email_key = hashlib.sha256(email.encode('utf-8')).hexdigest()
+                wait = RateWindow(f"{scope}:email:{email_key}", *rate).consume()
+                if wait:
+                    return _too_many_requests(wait)
+
+            fingerprint = None
+            if duplicate_fields:
+                values = [
+                    email if field == 'email' else str(data.get(field, '')).strip()
+                    for field in duplicate_fields
+                ]
+                if all(values):
+                    fingerprint = claim_fingerprint(scope, values)
+                    if fingerprint is None:
+                        return JsonResponse({
+                            'success': False,
+                            'message': 'Ce message a déjà été envoyé.'
+                        }, status=409)
+
+            try:
+                response = view_func(request, *args, **kwargs)
+            except Exception:
+                if fingerprint:
+                    cache.delete(fingerprint)
+                raise
+            if fingerprint and not _succeeded(response):
+                # Envoi refusé ou en erreur : la version corrigée doit pouvoir passer
+                cache.delete(fingerprint)
+            return response
+        return wrapper
+    return decorator
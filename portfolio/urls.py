@@ -16,6 +16,9 @@ urlpatterns = [
     path('projets/', views.tous_projets, name='tous_projets'),
     path('galerie/', views.toute_galerie, name='toute_galerie'),
     
+    # Sections de l'accueil chargées à la demande (voir sections.py)
+    path('sections/<slug:name>/', views.section, name='section'),
+
     # AJAX endpoints
     path('newsletter/', views.newsletter_subscribe, name='newsletter_subscribe'),
     path('contact/', views.contact_message, name='contact_message'),
@@ -30,6 +33,17 @@ urlpatterns = [
     path('api/projects/', views.api_projects, name='api_projects'),
     path('api/gallery/', views.api_gallery, name='api_gallery'),
     path('api/feed/', views.api_feed, name='api_feed'),
+
+    # Liens externes suivis (redirection signée, voir outbound.py)
+    path('go/<str:token>/', views.outbound_redirect, name='outbound'),
+
+    # Supervision
+    path('metrics', views.metrics_view, name='metrics'),
+
+    # Diagnostic (staff uniquement)
+    path('debug/templates/', views.template_profiles, name='template_profiles'),
+    path('debug/profiles/', views.request_profiles, name='request_profiles'),
+    path('debug/profiles/<str:name>/', views.request_profile_detail, name='request_profile_detail'),
 ]
 
 # portfolio_project/urls.py (URLs principales du projet)
@@ -1,45 +1,47 @@
 # portfolio/views.py
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.template.loader import render_to_string
+from django.utils.cache import patch_cache_control
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.core.paginator import Paginator
 from django.core.mail import send_mail
 from django.conf import settings
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+import hmac
 import json
 import logging
 
 from .models import (
-    Profile, Project, Skill, News, Partner, 
+    Profile, Project, News,
     SocialGallery, Feed, Newsletter, ContactMessage,
-    SocialLink, ContactInfo, SiteSettings
 )
+from . import metrics, outbound, page_views, request_profiler, sections, template_profiler
+from .caching import get_or_build, render_cached, request_cache_key
+from .throttling import throttle
 
 logger = logging.getLogger(__name__)
 
+PROJETS_PAR_PAGE = 9
+GALERIE_PAR_PAGE = 12
+# ?tri=populaires : ordre du classement précalculé (voir page_views.py)
+TRI_POPULAIRES = 'populaires'
+
 
 def index(request):
     """Vue principale du portfolio"""
-    try:
-        # Récupération du profil principal
-        profile = Profile.objects.first()
-        
-        # Récupération des données pour chaque section
-        context = {
-            'profile': profile,
+    def build_context():
+        # Haut de page seulement : les autres sections sont chargées à la demande (voir sections.py)
+        return {
+            'profile': Profile.objects.first(),
             'projects': Project.objects.filter(featured=True).order_by('ordre_affichage')[:6],
-            'skills': Skill.objects.all().order_by('ordre_affichage'),
-            'news': News.objects.all().order_by('ordre_affichage', '-date_publication')[:6],
-            'partners': Partner.objects.filter(actif=True).order_by('ordre_affichage'),
-            'gallery': SocialGallery.objects.all().order_by('ordre_affichage')[:6],
-            'feed': Feed.objects.all().order_by('ordre_affichage')[:8],
-            'social_links': SocialLink.objects.filter(actif=True).order_by('ordre_affichage'),
-            'contact_info': ContactInfo.objects.first(),
-            'site_settings': SiteSettings.objects.first(),
+            # social_links, contact_info et site_settings : voir context_processors.py
         }
-        
-        return render(request, 'portfolio/index.html', context)
+
+    try:
+        return HttpResponse(render_cached(request, 'index', 'portfolio/index.html', build_context))
         
     except Exception as e:
         logger.error(f"Erreur dans la vue index: {str(e)}")
@@ -47,86 +49,122 @@ def index(request):
         context = {
             'profile': None,
             'projects': [],
-            'skills': [],
-            'news': [],
-            'partners': [],
-            'gallery': [],
-            'feed': [],
         }
         return render(request, 'portfolio/index.html', context)
 
 
+def section(request, name):
+    """Fragment HTML d'une section de l'accueil (``?apres=`` : lot suivant de la galerie ou du feed)"""
+    found = sections.SECTIONS.get(name)
+    if found is None:
+        raise Http404("Section inconnue")
+    cursor = request.GET.get('apres')
+    if cursor is not None:
+        if 'batch' not in found:
+            raise Http404("Section non paginée")
+        try:
+            sections.decode_cursor(cursor)
+        except sections.InvalidCursor:
+            raise Http404("Curseur invalide")
+    template_name = sections.ITEMS_TEMPLATE.format(name) if cursor else found['template']
+
+    def build():
+        # Sans requête : ni processeurs de contexte ni jeton CSRF, le fragment est public
+        return render_to_string(template_name, sections.context(name, cursor))
+
+    response = HttpResponse(get_or_build(request_cache_key(f'section:{name}', request), build))
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'HOME_SECTION_MAX_AGE', 60))
+    return response
+
+
 def projet_detail(request, slug):
     """Vue détaillée d'un projet"""
-    projet = get_object_or_404(Project, slug=slug)
-    
-    # Projets similaires (même statut ou technologies communes)
-    projets_similaires = Project.objects.filter(
-        featured=True
-    ).exclude(id=projet.id).order_by('ordre_affichage')[:3]
-    
-    context = {
-        'projet': projet,
-        'projets_similaires': projets_similaires,
-        'profile': Profile.objects.first(),
-    }
-    
-    return render(request, 'portfolio/projet_detail.html', context)
+    def build_context():
+        projet = get_object_or_404(Project, slug=slug)
+
+        # Projets similaires (même statut ou technologies communes)
+        projets_similaires = Project.objects.filter(
+            featured=True
+        ).exclude(id=projet.id).order_by('ordre_affichage')[:3]
+
+        return {
+            'projet': projet,
+            'projets_similaires': projets_similaires,
+            'profile': Profile.objects.first(),
+        }
+
+    html = render_cached(request, 'projet', 'portfolio/projet_detail.html', build_context)
+    page_views.record(request, Project, slug)
+    return HttpResponse(html)
 
 
 def galerie_detail(request, slug):
     """Vue détaillée d'un élément de la galerie sociale"""
-    galerie_item = get_object_or_404(SocialGallery, slug=slug)
-    
-    # Éléments similaires de la galerie
-    galerie_similaire = SocialGallery.objects.exclude(
-        id=galerie_item.id
-    ).order_by('ordre_affichage')[:3]
-    
-    context = {
-        'galerie_item': galerie_item,
-        'galerie_similaire': galerie_similaire,
-        'profile': Profile.objects.first(),
-    }
-    
-    return render(request, 'portfolio/galerie_detail.html', context)
+    def build_context():
+        galerie_item = get_object_or_404(SocialGallery, slug=slug)
+
+        # Éléments similaires de la galerie
+        galerie_similaire = SocialGallery.objects.exclude(
+            id=galerie_item.id
+        ).order_by('ordre_affichage')[:3]
+
+        return {
+            'galerie_item': galerie_item,
+            'galerie_similaire': galerie_similaire,
+            'profile': Profile.objects.first(),
+        }
+
+    html = render_cached(request, 'galerie', 'portfolio/galerie_detail.html', build_context)
+    page_views.record(request, SocialGallery, slug)
+    return HttpResponse(html)
 
 
 def tous_projets(request):
-    """Vue listant tous les projets avec pagination"""
-    projets_list = Project.objects.all().order_by('ordre_affichage', '-created_at')
-    
-    # Pagination
-    paginator = Paginator(projets_list, 9)  # 9 projets par page
-    page_number = request.GET.get('page')
-    projets = paginator.get_page(page_number)
-    
-    context = {
-        'projets': projets,
-        'profile': Profile.objects.first(),
-    }
-    
-    return render(request, 'portfolio/tous_projets.html', context)
+    """Vue listant tous les projets avec pagination (``?tri=populaires`` : les plus vus d'abord)"""
+    populaires = request.GET.get('tri') == TRI_POPULAIRES
+
+    def build_context():
+        if populaires:
+            projets_list = page_views.popular(Project.objects.all())
+        else:
+            projets_list = Project.objects.all().order_by('ordre_affichage', '-created_at')
+
+        # Pagination
+        paginator = Paginator(projets_list, PROJETS_PAR_PAGE)
+        page_number = request.GET.get('page')
+        projets = paginator.get_page(page_number)
+
+        return {
+            'projets': projets,
+            'tri': TRI_POPULAIRES if populaires else '',
+            'profile': Profile.objects.first(),
+        }
+
+    # Le classement change sans sauvegarde dans l'admin : sa version entre dans la clé
+    prefix = f'projets-populaires:{page_views.ranks_version()}' if populaires else 'projets'
+    return HttpResponse(render_cached(request, prefix, 'portfolio/tous_projets.html', build_context))
 
 
 def toute_galerie(request):
     """Vue listant toute la galerie sociale avec pagination"""
-    galerie_list = SocialGallery.objects.all().order_by('ordre_affichage', '-created_at')
-    
-    # Pagination
-    paginator = Paginator(galerie_list, 12)  # 12 éléments par page
-    page_number = request.GET.get('page')
-    galerie = paginator.get_page(page_number)
-    
-    context = {
-        'galerie': galerie,
-        'profile': Profile.objects.first(),
-    }
-    
-    return render(request, 'portfolio/toute_galerie.html', context)
+    def build_context():
+        galerie_list = SocialGallery.objects.all().order_by('ordre_affichage', '-created_at')
+
+        # Pagination
+        paginator = Paginator(galerie_list, GALERIE_PAR_PAGE)
+        page_number = request.GET.get('page')
+        galerie = paginator.get_page(page_number)
+
+        return {
+            'galerie': galerie,
+            'profile': Profile.objects.first(),
+        }
+
+    return HttpResponse(render_cached(request, 'galerie-liste', 'portfolio/toute_galerie.html', build_context))
 
 
 @require_http_methods(["POST"])
+@throttle('newsletter')
 def newsletter_subscribe(request):
     """Vue AJAX pour l'inscription à la newsletter"""
     try:
@@ -209,6 +247,7 @@ def newsletter_subscribe(request):
 
 
 @require_http_methods(["POST"])
+@throttle('contact', duplicate_fields=('nom', 'email', 'sujet', 'message'))
 def contact_message(request):
     """Vue AJAX pour l'envoi de messages de contact"""
     try:
@@ -362,11 +401,13 @@ def search(request):
 
 
 def api_projects(request):
-    """API JSON pour récupérer les projets (pour AJAX)"""
-    try:
-        projects = Project.objects.filter(featured=True).order_by('ordre_affichage')
-        
+    """API JSON pour récupérer les projets (pour AJAX), ``?tri=populaires`` possible"""
+    populaires = request.GET.get('tri') == TRI_POPULAIRES
+
+    def build():
         projects_data = []
+        projects = Project.objects.filter(featured=True)
+        projects = page_views.popular(projects) if populaires else projects.order_by('ordre_affichage')
         for project in projects:
             projects_data.append({
                 'id': project.id,
@@ -380,10 +421,15 @@ def api_projects(request):
                 'url_demo': project.url_demo,
                 'url_github': project.url_github,
             })
-        
+        return projects_data
+
+    try:
         return JsonResponse({
             'success': True,
-            'projects': projects_data
+            'projects': get_or_build(
+                f'api:projects:populaires:{page_views.ranks_version()}' if populaires else 'api:projects',
+                build,
+            )
         })
         
     except Exception as e:
@@ -396,11 +442,9 @@ def api_projects(request):
 
 def api_gallery(request):
     """API JSON pour récupérer la galerie (pour AJAX)"""
-    try:
-        gallery = SocialGallery.objects.all().order_by('ordre_affichage')
-        
+    def build():
         gallery_data = []
-        for item in gallery:
+        for item in SocialGallery.objects.all().order_by('ordre_affichage'):
             gallery_data.append({
                 'id': item.id,
                 'titre': item.titre,
@@ -408,10 +452,12 @@ def api_gallery(request):
                 'image': item.image.url if item.image else None,
                 'url': item.get_absolute_url(),
             })
-        
+        return gallery_data
+
+    try:
         return JsonResponse({
             'success': True,
-            'gallery': gallery_data
+            'gallery': get_or_build('api:gallery', build)
         })
         
     except Exception as e:
@@ -424,20 +470,20 @@ def api_gallery(request):
 
 def api_feed(request):
     """API JSON pour récupérer le feed (pour AJAX)"""
-    try:
-        feed = Feed.objects.all().order_by('ordre_affichage')
-        
+    def build():
         feed_data = []
-        for item in feed:
+        for item in Feed.objects.all().order_by('ordre_affichage'):
             feed_data.append({
                 'id': item.id,
                 'image': item.image.url if item.image else None,
                 'alt_text': item.alt_text,
             })
-        
+        return feed_data
+
+    try:
         return JsonResponse({
             'success': True,
-            'feed': feed_data
+            'feed': get_or_build('api:feed', build)
         })
         
     except Exception as e:
@@ -448,6 +494,67 @@ def api_feed(request):
         })
 
 
+def outbound_redirect(request, token):
+    """Redirige vers un lien externe et compte le clic (sans lecture en base)"""
+    found = outbound.resolve(token)
+    if found is None:
+        raise Http404("Lien inconnu")
+    code, pk, url = found
+    if request.method == 'GET':
+        outbound.record(code, pk)
+    response = HttpResponseRedirect(url)
+    response.headers['Cache-Control'] = 'no-store'
+    response.headers['X-Robots-Tag'] = 'noindex'
+    return response
+
+
+def metrics_view(request):
+    """Métriques au format Prometheus, protégées par ``Authorization: Bearer <METRICS_TOKEN>``"""
+    token = settings.METRICS_TOKEN
+    if not token or not settings.METRICS_ENABLED:
+        raise Http404("Métriques désactivées")
+    provided = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+    if not hmac.compare_digest(provided.encode(), token.encode()):
+        return HttpResponse('Jeton invalide', status=401, content_type='text/plain; charset=utf-8')
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@staff_member_required
+def template_profiles(request):
+    """Derniers profils de rendu des templates (JSON, ou texte avec ?format=text)"""
+    if not settings.TEMPLATE_PROFILER_ENABLED:
+        raise Http404("Profilage des templates désactivé")
+    profiles = template_profiler.recent()
+    if request.GET.get('format') == 'text':
+        text = '\n\n'.join(
+            f"{p['date']} {p['label']}\n{template_profiler.format_tree(p)}" for p in profiles
+        )
+        return HttpResponse(text, content_type='text/plain; charset=utf-8')
+    return JsonResponse({'profiles': profiles})
+
+
+@staff_member_required
+def request_profiles(request):
+    """Liste des profils cProfile enregistrés par RequestProfilerMiddleware"""
+    context = {
+        'title': 'Profils de requêtes',
+        'profiles': request_profiler.list_profiles(),
+        'sample_rate': settings.REQUEST_PROFILER_SAMPLE_RATE,
+    }
+    return render(request, 'admin/portfolio/request_profiles.html', context)
+
+
+@staff_member_required
+def request_profile_detail(request, name):
+    """Téléchargement d'un profil (.prof), ou résumé texte avec ?format=text"""
+    path = request_profiler.profile_path(name)
+    if path is None:
+        raise Http404("Profil introuvable")
+    if request.GET.get('format') == 'text':
+        return HttpResponse(request_profiler.summary(path), content_type='text/plain; charset=utf-8')
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=name)
+
+
 def handler404(request, exception):
     """Vue personnalisée pour les erreurs 404"""
     context = {
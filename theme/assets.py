@@ -0,0 +1,278 @@
+# theme/assets.py
+"""
+Pipeline des ressources front-end auto-hébergées.
+
+``python manage.py build_assets`` (lancé par build.sh après ``tailwind build``)
+copie depuis ``static_src/node_modules`` les polices Poppins, Font Awesome et
+Swiper dans ``theme/static/vendor/`` :
+
+- le jeu d'icônes est réduit aux classes ``fa-*`` réellement utilisées
+  (templates, code Python comme ``PLATFORM_ICONS`` et ``Skill.icone_class``
+  en base), CSS et glyphes compris, utilitaires (``fa-spin``, ``fa-fw``...)
+  et leurs ``@keyframes`` avec. La base est lue au moment du build : une
+  icône saisie ensuite dans l'admin n'apparaît qu'après un nouveau
+  ``build_assets`` (ou via ``ASSET_ICON_SAFELIST``) ;
+- les règles de la feuille Tailwind nécessaires au-dessus de la ligne de
+  flottaison (régions ``{# critical #}`` ... ``{# endcritical #}`` des
+  templates) sont extraites dans ``css/dist/critical.css`` pour être inlinées.
+"""
+import re
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+from django.template.utils import get_app_template_dirs
+
+THEME_DIR = Path(__file__).resolve().parent
+NODE_MODULES = THEME_DIR / 'static_src' / 'node_modules'
+STATIC_DIR = THEME_DIR / 'static'
+VENDOR_DIR = STATIC_DIR / 'vendor'
+CRITICAL_CSS_PATH = 'css/dist/critical.css'
+
+POPPINS_WEIGHTS = (300, 400, 500, 600, 700)
+
+# Chemin statique vendorisé, et URL CDN de repli tant que build_assets n'a pas tourné
+VENDOR_FILES = {
+    'icons_css': (
+        'vendor/fontawesome/icons.css',
+        'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css',
+    ),
+    'swiper_css': (
+        'vendor/swiper/swiper-bundle.min.css',
+        'https://cdn.jsdelivr.net/npm/swiper@10/swiper-bundle.min.css',
+    ),
+    'swiper_js': (
+        'vendor/swiper/swiper-bundle.min.js',
+        'https://cdn.jsdelivr.net/npm/swiper@10/swiper-bundle.min.js',
+    ),
+    'poppins': (
+        'vendor/poppins/poppins-latin-400-normal.woff2',
+        'https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap',
+    ),
+}
+
+ICON_CLASS_RE = re.compile(r'\bfa-[a-z0-9]+(?:-[a-z0-9]+)*')
+CRITICAL_REGION_RE = re.compile(r'\{#\s*critical\s*#\}(.*?)\{#\s*endcritical\s*#\}', re.S)
+CLASS_ATTR_RE = re.compile(r'class\s*=\s*"([^"]*)"')
+TEMPLATE_TAG_RE = re.compile(r'\{[{%#].*?[}%#]\}', re.S)
+CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+CSS_CLASS_RE = re.compile(r'\.((?:\\.|[A-Za-z0-9_-])+)')
+
+# Familles de style : déjà couvertes par ``ICON_BASE_CSS`` (leurs règles
+# Font Awesome dépendent de variables ``:root`` non reprises)
+ICON_STYLES = {'solid', 'regular', 'brands', 'sharp', 'classic', 'light', 'thin', 'duotone'}
+
+ICON_BASE_CSS = """\
+@font-face{font-family:"Font Awesome 6 Free";font-style:normal;font-weight:900;font-display:block;src:url(fa-solid-900.woff2) format("woff2")}
+@font-face{font-family:"Font Awesome 6 Brands";font-style:normal;font-weight:400;font-display:block;src:url(fa-brands-400.woff2) format("woff2")}
+.fa,.fas,.fa-solid,.fab,.fa-brands{-moz-osx-font-smoothing:grayscale;-webkit-font-smoothing:antialiased;display:inline-block;font-style:normal;font-variant:normal;line-height:1;text-rendering:auto}
+.fa,.fas,.fa-solid{font-family:"Font Awesome 6 Free";font-weight:900}
+.fab,.fa-brands{font-family:"Font Awesome 6 Brands";font-weight:400}
+"""
+
+
+# Sources ---------------------------------------------------------------------
+
+def template_files():
+    dirs = [Path(d) for d in settings.TEMPLATES[0]['DIRS']]
+    dirs += [Path(d) for d in get_app_template_dirs('templates')]
+    for directory in dirs:
+        yield from directory.rglob('*.html')
+
+
+def python_files():
+    for app in ('portfolio',):
+        yield from (settings.BASE_DIR / app).rglob('*.py')
+
+
+def collect_icon_classes():
+    """Classes ``fa-*`` référencées par les templates, le code et la base"""
+    names = set()
+    for path in (*template_files(), *python_files()):
+        names.update(ICON_CLASS_RE.findall(path.read_text(encoding='utf-8')))
+
+    from django.db import DatabaseError
+    from portfolio.models import Skill
+    try:
+        for icone_class in Skill.objects.values_list('icone_class', flat=True):
+            names.update(ICON_CLASS_RE.findall(icone_class))
+    except DatabaseError:
+        # Base non migrée pendant le build : les templates et le code suffisent
+        pass
+
+    for extra in getattr(settings, 'ASSET_ICON_SAFELIST', []):
+        names.update(ICON_CLASS_RE.findall(extra))
+    return {name[len('fa-'):] for name in names}
+
+
+def collect_critical_classes():
+    """Classes utilisées dans les régions critiques des templates"""
+    classes = set()
+    for path in template_files():
+        for region in CRITICAL_REGION_RE.findall(path.read_text(encoding='utf-8')):
+            for value in CLASS_ATTR_RE.findall(region):
+                classes.update(TEMPLATE_TAG_RE.sub(' ', value).split())
+    return classes
+
+
+# Font Awesome ----------------------------------------------------------------
+
+def parse_css_blocks(css):
+    """Découpe une feuille en blocs de premier niveau ``(prélude, contenu)``"""
+    css = CSS_COMMENT_RE.sub('', css)
+    blocks, depth, start, prelude = [], 0, 0, ''
+    for i, char in enumerate(css):
+        if char == '{':
+            if depth == 0:
+                prelude = css[start:i].strip()
+                start = i + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                blocks.append((prelude, css[start:i].strip()))
+                start = i + 1
+        elif char == ';' and depth == 0:
+            # Instructions hors bloc (@charset, @import) ignorées
+            start = i + 1
+    return blocks
+
+
+def parse_fontawesome(css):
+    """Association nom d'icône -> point de code, alias compris"""
+    icons = {}
+    for prelude, body in parse_css_blocks(css):
+        match = re.search(r'(?:content|--fa)\s*:\s*"\\([0-9a-fA-F]+)"', body)
+        if not match:
+            continue
+        for selector in prelude.split(','):
+            name = re.fullmatch(r'\s*\.fa-([a-z0-9-]+)::?before\s*', selector)
+            if name:
+                icons[name.group(1)] = match.group(1).lower()
+    return icons
+
+
+def subset_font(source, target, codepoints):
+    """Réduit une police aux glyphes utilisés (woff2) ; copie brute sans fontTools"""
+    try:
+        from fontTools import subset
+    except ImportError:
+        shutil.copyfile(source, target)
+        return
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']
+    options.ignore_missing_unicodes = True
+    font = subset.load_font(str(source), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    subset.save_font(font, str(target), options)
+
+
+def _selector_is_icon_utility(selector, used):
+    names = [re.sub(r'\\(.)', r'\1', name) for name in CSS_CLASS_RE.findall(selector)]
+    return bool(names) and all(
+        name.startswith('fa-') and name[len('fa-'):] in used and name[len('fa-'):] not in ICON_STYLES
+        for name in names
+    )
+
+
+def icon_utility_css(css, used):
+    """Règles utilitaires de Font Awesome (``fa-spin``, ``fa-fw``...) des classes ``used``, glyphes exclus"""
+    glyphs = set(parse_fontawesome(css))
+    return filter_css(css, lambda selector: _selector_is_icon_utility(selector, used - glyphs))
+
+
+def build_icons(used, source_dir=None, target_dir=None):
+    source_dir = Path(source_dir or NODE_MODULES / '@fortawesome' / 'fontawesome-free')
+    target_dir = Path(target_dir or VENDOR_DIR / 'fontawesome')
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    css = (source_dir / 'css' / 'all.css').read_text(encoding='utf-8')
+    icons = parse_fontawesome(css)
+    found = sorted(name for name in used if name in icons)
+    rules = ''.join(f'.fa-{name}:before{{content:"\\{icons[name]}"}}\n' for name in found)
+    (target_dir / 'icons.css').write_text(ICON_BASE_CSS + icon_utility_css(css, set(used)) + '\n' + rules, encoding='utf-8')
+
+    codepoints = sorted({int(icons[name], 16) for name in found})
+    for font in ('fa-solid-900.woff2', 'fa-brands-400.woff2'):
+        subset_font(source_dir / 'webfonts' / font, target_dir / font, codepoints)
+    return found
+
+
+# Polices et Swiper -----------------------------------------------------------
+
+def build_fonts(source_dir=None, target_dir=None):
+    source_dir = Path(source_dir or NODE_MODULES / '@fontsource' / 'poppins' / 'files')
+    target_dir = Path(target_dir or VENDOR_DIR / 'poppins')
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for weight in POPPINS_WEIGHTS:
+        name = f'poppins-latin-{weight}-normal.woff2'
+        shutil.copyfile(source_dir / name, target_dir / name)
+
+
+def build_swiper(source_dir=None, target_dir=None):
+    source_dir = Path(source_dir or NODE_MODULES / 'swiper')
+    target_dir = Path(target_dir or VENDOR_DIR / 'swiper')
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for name in ('swiper-bundle.min.css', 'swiper-bundle.min.js'):
+        shutil.copyfile(source_dir / name, target_dir / name)
+
+
+# CSS critique ----------------------------------------------------------------
+
+def _selector_is_critical(selector, classes):
+    names = [re.sub(r'\\(.)', r'\1', name) for name in CSS_CLASS_RE.findall(selector)]
+    return all(name in classes for name in names)
+
+
+def filter_css(css, keep):
+    """
+    Conserve les sélecteurs pour lesquels ``keep(sélecteur)`` est vrai, dans
+    ``@media`` et ``@supports`` compris ; les ``@keyframes`` ne sont gardés
+    que si une règle conservée les cite.
+    """
+    keyframes = {}
+
+    def walk(blocks):
+        out = []
+        for prelude, body in blocks:
+            if prelude.startswith(('@keyframes', '@-webkit-keyframes')):
+                keyframes[prelude] = (prelude.split()[1], f'{prelude}{{{body}}}')
+            elif prelude.startswith(('@media', '@supports')):
+                inner = walk(parse_css_blocks(body))
+                if inner:
+                    out.append(f"{prelude}{{{''.join(inner)}}}")
+            elif prelude.startswith('@'):
+                continue
+            else:
+                selectors = [s.strip() for s in prelude.split(',')]
+                selectors = [s for s in selectors if keep(s)]
+                if selectors:
+                    out.append(f"{','.join(selectors)}{{{body}}}")
+        return out
+
+    kept = walk(parse_css_blocks(css))
+    text = ''.join(kept)
+    used_keyframes = [rule for name, rule in keyframes.values() if re.search(rf'\b{re.escape(name)}\b', text)]
+    return ''.join(used_keyframes) + text
+
+
+def extract_critical_css(css, classes):
+    """
+    Conserve les règles dont tous les sélecteurs de classe sont critiques.
+
+    Les sélecteurs sans classe (préflight Tailwind, éléments, ``:root``) sont
+    conservés ; les ``@keyframes`` ne le sont que si une règle gardée les cite.
+    """
+    return filter_css(css, lambda selector: _selector_is_critical(selector, classes))
+
+
+def build_critical_css():
+    source = STATIC_DIR / settings.TAILWIND_CSS_PATH
+    css = extract_critical_css(source.read_text(encoding='utf-8'), collect_critical_classes())
+    target = STATIC_DIR / CRITICAL_CSS_PATH
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(css, encoding='utf-8')
+    return len(css.encode('utf-8')), source.stat().st_size
@@ -0,0 +1,34 @@
+# theme/management/commands/build_assets.py
+from django.core.management.base import BaseCommand, CommandError
+
+from theme import assets
+
+
+class Command(BaseCommand):
+    help = "Vendorise polices, icônes et Swiper, et extrait le CSS critique"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip-critical', action='store_true',
+            help="Ne pas extraire le CSS critique (feuille Tailwind non compilée)"
+        )
+
+    def handle(self, *args, **options):
+        if not assets.NODE_MODULES.exists():
+            raise CommandError(
+                "node_modules absent : lancez d'abord `python manage.py tailwind install`."
+            )
+
+        used = assets.collect_icon_classes()
+        found = assets.build_icons(used)
+        self.stdout.write(f"Icônes : {len(found)} conservées.")
+
+        assets.build_fonts()
+        assets.build_swiper()
+        self.stdout.write("Polices Poppins et Swiper copiés.")
+
+        if not options['skip_critical']:
+            critical, total = assets.build_critical_css()
+            self.stdout.write(f"CSS critique : {critical} octets inlinés sur {total}.")
+
+        self.stdout.write(self.style.SUCCESS(f"Ressources écrites dans {assets.VENDOR_DIR}."))
@@ -0,0 +1,5 @@
+module.exports = {
+  plugins: {
+    "postcss-import": {},
+  },
+}
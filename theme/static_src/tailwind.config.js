@@ -0,0 +1,27 @@
+/**
+ * Configuration Tailwind du portfolio.
+ *
+ * Remplace le compilateur du Play CDN (cdn.tailwindcss.com) qui s'exécutait
+ * dans le navigateur de chaque visiteur : seules les classes présentes dans
+ * les fichiers ci-dessous sont générées.
+ */
+
+module.exports = {
+    content: [
+        /* Templates du projet (BASE_DIR/templates) */
+        '../../templates/**/*.html',
+
+        /* Templates des applications Django */
+        '../../portfolio/templates/**/*.html',
+
+        /*
+         * Classes construites en Python : STATUS_COLORS, PLATEFORME_COLORS
+         * et PLATFORM_COLORS dans portfolio/models.py.
+         */
+        '../../portfolio/**/*.py',
+    ],
+    theme: {
+        extend: {},
+    },
+    plugins: [],
+}
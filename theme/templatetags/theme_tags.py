@@ -0,0 +1,85 @@
+# theme/templatetags/theme_tags.py
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from theme.assets import CRITICAL_CSS_PATH, POPPINS_WEIGHTS, VENDOR_FILES
+
+register = template.Library()
+
+
+def _find(path):
+    return finders.find(path)
+
+
+if not settings.DEBUG:
+    # Les ressources ne changent qu'au déploiement
+    _find = lru_cache(maxsize=None)(_find)
+
+
+@lru_cache(maxsize=None)
+def _read_cached(path):
+    with open(path, encoding='utf-8') as fh:
+        return fh.read()
+
+
+def _read(path):
+    return _read_cached(path) if not settings.DEBUG else open(path, encoding='utf-8').read()
+
+
+@register.simple_tag
+def vendor_url(name):
+    """URL de la ressource vendorisée, ou du CDN tant que build_assets n'a pas tourné"""
+    path, cdn_url = VENDOR_FILES[name]
+    return static(path) if _find(path) else cdn_url
+
+
+def _async_stylesheet(href):
+    return format_html(
+        '<link rel="preload" href="{0}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+        '<noscript><link rel="stylesheet" href="{0}"></noscript>',
+        href,
+    )
+
+
+@register.simple_tag
+def stylesheets():
+    """
+    Feuilles de style du site.
+
+    Avec le CSS critique compilé, les règles du haut de page et les
+    ``@font-face`` sont inlinées et tout le reste est chargé en asynchrone :
+    le premier rendu ne dépend d'aucune requête tierce.
+    """
+    tailwind_href = static(settings.TAILWIND_CSS_PATH)
+    secondary = [vendor_url('icons_css'), vendor_url('swiper_css')]
+    critical_path = _find(CRITICAL_CSS_PATH)
+
+    if _find(VENDOR_FILES['poppins'][0]):
+        font_faces = ''.join(
+            '@font-face{font-family:"Poppins";font-style:normal;font-weight:%d;font-display:swap;'
+            'src:url(%s) format("woff2")}' % (weight, static(f'vendor/poppins/poppins-latin-{weight}-normal.woff2'))
+            for weight in POPPINS_WEIGHTS
+        )
+        fonts = format_html('<style>{}</style>', mark_safe(font_faces))
+    else:
+        fonts = format_html('<link rel="stylesheet" href="{}">', VENDOR_FILES['poppins'][1])
+
+    if critical_path:
+        return format_html(
+            '{}<style>{}</style>{}',
+            fonts,
+            mark_safe(_read(critical_path)),
+            format_html_join('', '{}', ((_async_stylesheet(href),) for href in [tailwind_href, *secondary])),
+        )
+
+    return format_html(
+        '{}{}',
+        fonts,
+        format_html_join('', '<link rel="stylesheet" href="{}">', ((href,) for href in [tailwind_href, *secondary])),
+    )